@@ -0,0 +1,75 @@
+# backend/benchmarks/import_time.py
+
+"""
+Cold-start benchmark for the WSGI entry point.
+
+Each sample is a fresh interpreter that imports ``parc_platform.wsgi`` and
+``parc_platform.urls`` (which pulls in core.views and everything it imports),
+so it measures what a gunicorn worker or ``manage.py`` command pays on boot.
+The ``eager pandas`` variant imports pandas first, reproducing the old
+module-level ``import pandas`` in core.views for comparison.
+
+Usage (from backend/):
+    python benchmarks/import_time.py [--runs 15]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+{preload}
+import parc_platform.wsgi, parc_platform.urls
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'seconds': elapsed,
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'pandas_loaded': 'pandas' in sys.modules,
+    'modules': len(sys.modules),
+}}))
+"""
+
+VARIANTS = {
+    'current': '',
+    'eager pandas': 'import pandas',
+}
+
+
+def sample(preload):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'parc_platform.settings'))
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE.format(preload=preload)],
+        cwd=BACKEND_DIR, env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=15)
+    args = parser.parse_args()
+
+    results = {}
+    for name, preload in VARIANTS.items():
+        sample(preload) # Warm the OS file cache and .pyc files; not counted
+        results[name] = [sample(preload) for _ in range(args.runs)]
+
+    print(f"{'variant':<14} {'median ms':>10} {'min ms':>8} {'max RSS MB':>11} {'modules':>8}  pandas")
+    for name, runs in results.items():
+        seconds = [run['seconds'] for run in runs]
+        print(
+            f"{name:<14} {statistics.median(seconds) * 1000:>10.1f} {min(seconds) * 1000:>8.1f} "
+            f"{max(run['max_rss_kb'] for run in runs) / 1024:>11.1f} {runs[0]['modules']:>8}  "
+            f"{'loaded' if runs[0]['pandas_loaded'] else 'not loaded'}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+# backend/benchmarks/list_throughput.py
+
+"""
+Rows/sec for the hot list endpoints, before and after the fast JSON path.
+
+Builds a throwaway test database (same engine as the configured one), fills it
+with attempts and tasks, then times each viewset's list() end to end: query,
+serialization and JSON rendering. Three variants per endpoint:
+
+    model serializer + DRF JSONRenderer   the previous code path
+    model serializer + FastJSONRenderer   renderer swap only
+    values() fast path + FastJSONRenderer what the API does now
+
+Usage (from backend/):
+    python benchmarks/list_throughput.py [--rows 20000] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'parc_platform.settings')
+
+import django # noqa: E402
+django.setup()
+
+from django.db import connection # noqa: E402
+from rest_framework import viewsets # noqa: E402
+from rest_framework.renderers import JSONRenderer # noqa: E402
+from rest_framework.test import APIRequestFactory, force_authenticate # noqa: E402
+from core.models import User, Assessment, StudentAttempt, Task # noqa: E402
+from core.renderers import FastJSONRenderer # noqa: E402
+from core.views import StudentAttemptViewSet, TaskViewSet # noqa: E402
+
+
+def populate(rows):
+    admin = User.objects.create_user('bench-admin', 'bench-admin@example.com', 'x', role='ADMIN', is_staff=True)
+    students = User.objects.bulk_create([
+        User(username=f'student{i}@example.com', first_name='Student', last_name=str(i), role='STUDENT')
+        for i in range(200)
+    ])
+    employees = User.objects.bulk_create([
+        User(username=f'employee{i}@example.com', first_name='Employee', last_name=str(i), role='EMPLOYEE')
+        for i in range(50)
+    ])
+    assessments = [Assessment.objects.create(title=f'Assessment {i}', course='Python', type='TEST') for i in range(20)]
+    StudentAttempt.objects.bulk_create([
+        StudentAttempt(student=students[i % 200], assessment=assessments[i % 20], score=i % 101)
+        for i in range(rows)
+    ], batch_size=2000)
+    Task.objects.bulk_create([
+        Task(employee=employees[i % 50], title=f'Task {i}', description='Follow up with the college', status='TODO')
+        for i in range(rows)
+    ], batch_size=2000)
+    return admin
+
+
+def variants(viewset):
+    serializer_path = {'list': viewsets.ModelViewSet.list}
+    return {
+        'serializer + JSONRenderer': type('Before', (viewset,), {**serializer_path, 'renderer_classes': [JSONRenderer]}),
+        'serializer + FastJSONRenderer': type('RendererOnly', (viewset,), {**serializer_path, 'renderer_classes': [FastJSONRenderer]}),
+        'values() + FastJSONRenderer': type('After', (viewset,), {'renderer_classes': [FastJSONRenderer]}),
+    }
+
+
+def time_list(view_class, url, user, repeat):
+    view = view_class.as_view({'get': 'list'})
+    factory = APIRequestFactory()
+    timings, size = [], 0
+    for _ in range(repeat):
+        request = factory.get(url)
+        force_authenticate(request, user)
+        start = time.perf_counter()
+        response = view(request)
+        response.render()
+        timings.append(time.perf_counter() - start)
+        size = len(response.content)
+    return statistics.median(timings), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        admin = populate(args.rows)
+        print(f"{'endpoint':<16} {'variant':<32} {'median ms':>10} {'rows/sec':>10} {'KB':>8}")
+        for name, viewset, url in (
+            ('attempts', StudentAttemptViewSet, '/api/attempts/'),
+            ('tasks', TaskViewSet, '/api/tasks/'),
+        ):
+            for label, view_class in variants(viewset).items():
+                seconds, size = time_list(view_class, url, admin, args.repeat)
+                print(f"{name:<16} {label:<32} {seconds * 1000:>10.1f} {args.rows / seconds:>10.0f} {size / 1024:>8.0f}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
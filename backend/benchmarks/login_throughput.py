@@ -0,0 +1,114 @@
+# backend/benchmarks/login_throughput.py
+
+"""
+Logins/sec through the token endpoint (POST /api/token/), with and without
+the per-user JWT claims cache.
+
+Builds a throwaway test database (same engine as the configured one) with
+students enrolled in a few batches each, then logs every student in, in turn:
+
+    claims uncached   claims rebuilt on every login (the previous code path)
+    claims cached     claims served from the cache after the first login
+
+Password hashing is deliberately slow and dominates a real login, so
+``--fast-hasher`` swaps in a cheap hasher to show what is left: the queries and
+token assembly this cache removes.
+
+Usage (from backend/):
+    python benchmarks/login_throughput.py [--users 500] [--repeat 3] [--fast-hasher]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'parc_platform.settings')
+
+import django # noqa: E402
+django.setup()
+
+from django.contrib.auth.hashers import make_password # noqa: E402
+from django.core.cache import cache # noqa: E402
+from django.db import connection # noqa: E402
+from django.test.utils import CaptureQueriesContext, override_settings # noqa: E402
+from rest_framework.test import APIRequestFactory # noqa: E402
+from core.cache import claims_key # noqa: E402
+from core.models import User, Course, Batch # noqa: E402
+from core.serializers import MyTokenObtainPairSerializer # noqa: E402
+from core.views import MyTokenObtainPairView # noqa: E402
+
+PASSWORD = 'bench-password'
+
+
+class UncachedClaimsSerializer(MyTokenObtainPairSerializer):
+    @classmethod
+    def get_claims(cls, user):
+        cache.delete(claims_key(user.pk))
+        return super().get_claims(user)
+
+
+def populate(users):
+    courses = [Course.objects.create(name=f'Course {i}') for i in range(5)]
+    batches = [
+        Batch.objects.create(course=courses[i % 5], name=f'Batch {i}', start_date=date.today(), end_date=date.today())
+        for i in range(20)
+    ]
+    password = make_password(PASSWORD) # Hashed once; every student shares it
+    students = User.objects.bulk_create([
+        User(username=f'student{i}@example.com', email=f'student{i}@example.com', password=password, role='STUDENT')
+        for i in range(users)
+    ])
+    Membership = User.batches.through
+    Membership.objects.bulk_create([
+        Membership(user_id=student.id, batch_id=batches[(i + k) % 20].id)
+        for i, student in enumerate(students) for k in range(3)
+    ])
+    return [student.username for student in students]
+
+
+def time_logins(serializer_class, usernames, repeat):
+    view = MyTokenObtainPairView.as_view(serializer_class=serializer_class)
+    factory = APIRequestFactory()
+    timings, queries = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with CaptureQueriesContext(connection) as captured:
+            for username in usernames:
+                response = view(factory.post('/api/token/', {'username': username, 'password': PASSWORD}, format='json'))
+                assert response.status_code == 200, response.data
+        timings.append(time.perf_counter() - start)
+        queries = len(captured) / len(usernames)
+    return statistics.median(timings), queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--fast-hasher', action='store_true', help='use MD5 password hashing to isolate the rest of a login')
+    args = parser.parse_args()
+
+    hashers = ['django.contrib.auth.hashers.MD5PasswordHasher'] if args.fast_hasher else None
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        with override_settings(**({'PASSWORD_HASHERS': hashers} if hashers else {})):
+            usernames = populate(args.users)
+            cache.delete_many([claims_key(pk) for pk in User.objects.values_list('pk', flat=True)])
+            print(f"{'variant':<18} {'median ms/login':>16} {'logins/sec':>11} {'queries/login':>14}")
+            for label, serializer_class in (
+                ('claims uncached', UncachedClaimsSerializer),
+                ('claims cached', MyTokenObtainPairSerializer),
+            ):
+                seconds, queries = time_logins(serializer_class, usernames, args.repeat)
+                print(f"{label:<18} {seconds * 1000 / len(usernames):>16.2f} {len(usernames) / seconds:>11.0f} {queries:>14.1f}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
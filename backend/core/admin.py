@@ -5,7 +5,7 @@ from .models import (
     User, College, Material, Schedule, Module, Course, Batch,
     TrainerApplication, EmployeeApplication, Task,
     Bill, Expense, Assessment, StudentAttempt, EmployeeDocument, EducationEntry,
-    WorkExperienceEntry, Certification
+    WorkExperienceEntry, Certification, ImportJob, EmailOutbox, BatchMaterial
 )
 
 # Register your models here to make them appear in the admin site.
@@ -26,4 +26,14 @@ admin.site.register(StudentAttempt)
 admin.site.register(EmployeeDocument)
 admin.site.register(EducationEntry)
 admin.site.register(WorkExperienceEntry)
-admin.site.register(Certification)
\ No newline at end of file
+admin.site.register(Certification)
+admin.site.register(ImportJob)
+admin.site.register(BatchMaterial)
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    # The body is left out: until it is sent it may hold a temporary password
+    exclude = ('body',)
+    list_display = ('subject', 'status', 'attempts', 'created_at', 'sent_at')
+    list_filter = ('status',)
@@ -0,0 +1,68 @@
+# backend/core/authentication.py
+
+"""
+JWT authentication without a database query per request.
+
+The stock JWTAuthentication loads the whole User row on every request. Most
+views only look at ``id``, ``role`` and ``is_staff``, so CachedJWTAuthentication
+keeps a handful of columns per user in the cache (settings.AUTH_USER_CACHE_TIMEOUT,
+short) and builds the user from them with every other field deferred. A view
+that reads a deferred field (``user.phone``, ``user.resume``, ...) gets it
+loaded from the database on first access, as with ``.only()``.
+
+Signals drop a user's entry whenever the user is saved, so deactivation and
+access expiry changes apply to the next request; the TTL bounds staleness for
+processes a local-memory cache invalidation does not reach.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from .cache import auth_user_key
+from .models import User
+
+# Columns kept in the cache; everything else on the user is deferred
+AUTH_USER_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name', 'role',
+    'is_staff', 'is_superuser', 'is_active', 'must_change_password', 'access_expiry_date',
+)
+
+
+def cached_user_row(user_id):
+    key = auth_user_key(user_id)
+    row = cache.get(key)
+    if row is None:
+        row = User.objects.filter(pk=user_id).values(*AUTH_USER_FIELDS).first()
+        if row is None:
+            return None
+        cache.set(key, row, settings.AUTH_USER_CACHE_TIMEOUT)
+    return row
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN or api_settings.USER_ID_FIELD != 'id':
+            return super().get_user(validated_token) # Needs columns we do not cache
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        row = cached_user_row(user_id)
+        if row is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not row['is_active']:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        # Same rule as MyTokenObtainPairSerializer.validate, applied to live tokens too
+        if row['role'] == 'TRAINER' and row['access_expiry_date'] and row['access_expiry_date'] < timezone.now():
+            raise AuthenticationFailed(_("Your access period has expired."), code="user_inactive")
+
+        # from_db() wants the loaded values in model field order; the rest are deferred
+        names = [field.attname for field in User._meta.concrete_fields if field.attname in row]
+        return User.from_db(router.db_for_read(User), names, [row[name] for name in names])
@@ -0,0 +1,128 @@
+# backend/core/cache.py
+
+"""
+Versioned response caching.
+
+Each namespace (e.g. 'catalog') has a version counter in the cache. Cached
+responses are keyed by the version, so bumping it (from model signals, once the
+change is committed) makes every older entry unreachable at once; they simply
+age out. A bump is only seen by processes sharing the cache, so responses are
+only cached when settings.VERSIONED_CACHING says they all do (CACHE_URL set, or
+a single server process).
+"""
+
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+
+def _version_key(namespace):
+    return f'version:{namespace}'
+
+
+def _changed_at_key(namespace):
+    return f'version-changed-at:{namespace}'
+
+
+def get_version(namespace):
+    version = cache.get(_version_key(namespace))
+    if version is None:
+        # Seeded from the clock rather than 1, so a counter that was evicted never
+        # comes back at a value older entries were stored under
+        cache.add(_version_key(namespace), time.time_ns() // 1000, timeout=None)
+        version = cache.get(_version_key(namespace))
+    return version
+
+
+def bump_version(namespace):
+    try:
+        version = cache.incr(_version_key(namespace))
+    except ValueError: # Not set yet (or evicted)
+        version = time.time_ns() // 1000
+        cache.set(_version_key(namespace), version, timeout=None)
+    cache.set(_changed_at_key(namespace), time.time(), timeout=None)
+    return version
+
+
+def version_changed_at(namespace):
+    """Unix time of the namespace's last bump (Last-Modified for the data it covers)."""
+    changed_at = cache.get(_changed_at_key(namespace))
+    if changed_at is None:
+        # Unknown, e.g. after a restart or an eviction: assume it just changed
+        cache.add(_changed_at_key(namespace), time.time(), timeout=None)
+        changed_at = cache.get(_changed_at_key(namespace))
+    return changed_at
+
+
+def bump_after_commit(namespace):
+    # Bumped before commit, a concurrent read could cache the old rows under the
+    # new version; after commit, anything cached under the old one is unreachable
+    transaction.on_commit(lambda: bump_version(namespace))
+
+
+class VersionedCacheMixin:
+    """
+    Caches the data of successful list/retrieve responses under the view's
+    ``cache_namespace`` version. The key covers the full URL (host, path and
+    query string, so ?fields=, ?expand= and cursors are cached separately) and
+    the response format. Invalidation is by bumping the namespace version.
+    """
+    cache_namespace = None
+    cache_timeout = None # Defaults to settings.API_CACHE_TIMEOUT
+
+    def cache_key(self, request):
+        version = get_version(self.cache_namespace)
+        fmt = request.accepted_renderer.format if getattr(request, 'accepted_renderer', None) else ''
+        digest = hashlib.sha256(f'{fmt}|{request.build_absolute_uri()}'.encode()).hexdigest()
+        return f'response:{self.cache_namespace}:{version}:{digest}'
+
+    def cached_response(self, request, build):
+        if not settings.VERSIONED_CACHING:
+            return build()
+        key = self.cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = build()
+        if response.status_code == 200:
+            timeout = self.cache_timeout if self.cache_timeout is not None else settings.API_CACHE_TIMEOUT
+            cache.set(key, response.data, timeout)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, lambda: super(VersionedCacheMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, lambda: super(VersionedCacheMixin, self).retrieve(request, *args, **kwargs))
+
+
+# --- Per-user JWT claims ---
+# The login serializer caches each user's token claims (role, batches, course
+# names, ...) so a login costs no queries beyond authentication. Entries are
+# dropped from signals whenever the user, their batch membership or those
+# batches and courses change, and expire after settings.AUTH_USER_CACHE_TIMEOUT
+# for processes a local-memory invalidation does not reach.
+def claims_key(user_id):
+    return f'jwt-claims:{user_id}'
+
+
+def forget_claims(user_ids):
+    keys = [claims_key(user_id) for user_id in user_ids]
+    if keys:
+        # After commit, so a concurrent login cannot re-cache the old claims
+        # between the delete and the commit
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+# --- Per-user authentication rows (see core/authentication.py) ---
+def auth_user_key(user_id):
+    return f'auth-user:{user_id}'
+
+
+def forget_auth_users(user_ids):
+    keys = [auth_user_key(user_id) for user_id in user_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
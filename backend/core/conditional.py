@@ -0,0 +1,84 @@
+# backend/core/conditional.py
+
+import hashlib
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.response import Response
+from .cache import get_version, version_changed_at
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified validators for list and retrieve, so an unchanged
+    collection is answered with 304 Not Modified before anything is serialized.
+
+    Validators come from ``max(updated_at)`` and the row count of the (filtered)
+    queryset, one aggregate query, plus the version counters named in
+    ``etag_versions`` (see core/cache.py) for related data the response embeds,
+    such as course or trainer names. The aggregate runs on
+    ``get_validator_queryset()``, which views that annotate their list override
+    so validating does not pay for the annotation. Last-Modified is the latest
+    of ``max(updated_at)`` and the versions' last bumps. Views whose versions
+    already cover every change can set ``etag_aggregate = False`` and validate
+    without touching the database.
+
+    Version counters are only trustworthy when every process shares them, so
+    views with ``etag_versions`` send no validators at all unless
+    settings.VERSIONED_CACHING is on.
+    """
+    etag_versions = ()
+    etag_aggregate = True
+
+    def _etag(self, request, *parts):
+        versions = [get_version(namespace) for namespace in self.etag_versions]
+        fmt = request.accepted_renderer.format if getattr(request, 'accepted_renderer', None) else ''
+        raw = '|'.join(str(part) for part in (fmt, request.build_absolute_uri(), request.user.pk, versions, *parts))
+        return f'W/"{hashlib.sha256(raw.encode()).hexdigest()[:32]}"'
+
+    def get_validator_queryset(self):
+        # The rows the list renders; only updated_at and pk are read from them
+        return self.filter_queryset(self.get_queryset())
+
+    def _validated(self):
+        # Another process's bump would not change our ETag; better no 304 than a wrong one
+        return settings.VERSIONED_CACHING or not self.etag_versions
+
+    def _conditional(self, request, etag, last_modified, build):
+        # Related data embedded in the response changes with the versions, not updated_at
+        timestamps = [version_changed_at(namespace) for namespace in self.etag_versions]
+        if last_modified:
+            timestamps.append(last_modified.timestamp())
+        timestamp = int(max(timestamps)) if timestamps else None
+        not_modified = get_conditional_response(request._request, etag=etag, last_modified=timestamp)
+        response = not_modified if not_modified is not None else build()
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+            # Let browsers keep the body but revalidate on every use
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        build = lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        if not self._validated():
+            return build()
+        if not self.etag_aggregate:
+            return self._conditional(request, self._etag(request), None, build)
+
+        stats = self.get_validator_queryset().order_by().aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+        etag = self._etag(request, stats['count'], stats['last_modified'] and stats['last_modified'].isoformat())
+        return self._conditional(request, etag, stats['last_modified'], build)
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self._validated():
+            return super().retrieve(request, *args, **kwargs)
+        if not self.etag_aggregate:
+            build = lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs)
+            return self._conditional(request, self._etag(request), None, build)
+
+        instance = self.get_object()
+        etag = self._etag(request, instance.pk, instance.updated_at.isoformat())
+        return self._conditional(request, etag, instance.updated_at, lambda: Response(self.get_serializer(instance).data))
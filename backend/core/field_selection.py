@@ -0,0 +1,147 @@
+# backend/core/field_selection.py
+
+"""
+Sparse fieldsets and nested expansion for read requests.
+
+    ?fields=id,name,courses.name   render only these fields; dotted names reach into nested serializers
+    ?expand=courses.modules        render only these nested relations (Meta.expandable_fields);
+                                   the others are left out and never loaded
+
+Without either parameter every serializer renders exactly as before.
+"""
+
+from functools import lru_cache
+from rest_framework.permissions import SAFE_METHODS
+
+
+def _split(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class FieldSelection:
+    def __init__(self, fields=None, expand=None):
+        self.fields = fields # {parent path: {field names}}, or None for "all fields"
+        self.expand = expand # {expanded paths}, or None for "expand everything"
+
+    @classmethod
+    def from_request(cls, request):
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        params = request.query_params
+        if 'fields' not in params and 'expand' not in params:
+            return None
+
+        fields = None
+        if 'fields' in params:
+            fields = {}
+            for item in _split(params['fields']):
+                parts = item.split('.')
+                for depth, name in enumerate(parts):
+                    fields.setdefault('.'.join(parts[:depth]), set()).add(name)
+
+        expand = None
+        if 'expand' in params:
+            # Expanding a.b implies expanding a
+            expand = set()
+            for item in _split(params['expand']):
+                parts = item.split('.')
+                expand.update('.'.join(parts[:depth + 1]) for depth in range(len(parts)))
+        return cls(fields, expand)
+
+    def includes(self, path, expandable=False):
+        """Whether the field at ``path`` is rendered, given that its parent is."""
+        parent, _, name = path.rpartition('.')
+        if self.fields is not None and parent in self.fields and name not in self.fields[parent]:
+            return False
+        if expandable and self.expand is not None and path not in self.expand:
+            return False
+        return True
+
+    def renders(self, path, expandable_paths):
+        """Whether the field at ``path`` is rendered, checking every ancestor on the way."""
+        parts = path.split('.')
+        for depth in range(1, len(parts) + 1):
+            prefix = '.'.join(parts[:depth])
+            if not self.includes(prefix, expandable=prefix in expandable_paths):
+                return False
+        return True
+
+
+@lru_cache(maxsize=None)
+def expandable_paths(serializer_class, prefix=''):
+    """All dotted paths reachable through Meta.expandable_fields, recursively."""
+    paths = set()
+    meta = getattr(serializer_class, 'Meta', None)
+    for name in getattr(meta, 'expandable_fields', ()):
+        field = serializer_class._declared_fields[name]
+        field = getattr(field, 'child', field) # many=True wraps the serializer in a ListSerializer
+        path = f'{prefix}{name}'
+        paths.add(path)
+        paths |= expandable_paths(type(field), f'{path}.')
+    return frozenset(paths)
+
+
+class FieldSelectionSerializerMixin:
+    """
+    Drops fields the request's FieldSelection leaves out. Nested serializers named
+    in ``Meta.expandable_fields`` are only rendered when expanded (or when the
+    request has no ``?expand=`` at all).
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selection = self.context.get('field_selection')
+        if selection is None:
+            return fields
+
+        path = self._selection_path()
+        expandable = getattr(self.Meta, 'expandable_fields', ())
+        for name in list(fields):
+            field_path = f'{path}.{name}' if path else name
+            if not selection.includes(field_path, expandable=name in expandable):
+                del fields[name]
+        return fields
+
+    def _selection_path(self):
+        names, node = [], self
+        while node.parent is not None:
+            if node.field_name:
+                names.append(node.field_name)
+            node = node.parent
+        return '.'.join(reversed(names))
+
+
+class FieldSelectionViewMixin:
+    """
+    Puts the request's FieldSelection into the serializer context and loads only
+    the relations that will be rendered. ``selection_select_related`` and
+    ``selection_prefetch_related`` map a rendered field path to the lookup it needs.
+    """
+    selection_select_related = {}
+    selection_prefetch_related = {}
+
+    def get_field_selection(self):
+        if not hasattr(self, '_field_selection'):
+            self._field_selection = FieldSelection.from_request(getattr(self, 'request', None))
+        return self._field_selection
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['field_selection'] = self.get_field_selection()
+        return context
+
+    def renders_field(self, path):
+        selection = self.get_field_selection()
+        if selection is None:
+            return True
+        return selection.renders(path, expandable_paths(self.get_serializer_class()))
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        selects = [lookup for path, lookup in self.selection_select_related.items() if self.renders_field(path)]
+        prefetches = [lookup for path, lookup in self.selection_prefetch_related.items() if self.renders_field(path)]
+        if selects:
+            queryset = queryset.select_related(*selects)
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        return queryset
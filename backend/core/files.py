@@ -0,0 +1,247 @@
+# backend/core/files.py
+
+"""
+File delivery for the view_* actions, with HTTP range support (RFC 9110).
+
+    Range: bytes=0-1023            206 Partial Content, one Content-Range
+    Range: bytes=0-99,5000-5099    206 multipart/byteranges
+    Range past the end of file     416 Range Not Satisfiable
+    If-Range: <etag or date>       the range is only honoured if the file is unchanged
+
+Every response says ``Accept-Ranges: bytes`` and carries an ETag/Last-Modified
+derived from the stored file's size and mtime, so a video player can seek
+without re-downloading from byte 0. Files are read FILE_CHUNK_SIZE bytes at a
+time whatever the range, so memory per connection stays constant.
+
+With settings.FILE_DELIVERY_BACKEND set to 'x-accel-redirect' (nginx) or
+'x-sendfile' (Apache mod_xsendfile, lighttpd), the response is instead an empty
+one carrying an internal-redirect header, and the web server sends the file
+itself (ranges included). Files that are not on the local filesystem are
+always streamed by Django.
+
+``signed_file_url`` issues an HMAC-signed, expiring URL for a stored file.
+SignedFileView serves it after checking only the signature: no database, no
+authentication, and the response may be cached publicly until it expires.
+"""
+
+import mimetypes
+import os
+import re
+import secrets
+import time
+from urllib.parse import quote
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.http import content_disposition_header, http_date
+
+FILE_CHUNK_SIZE = 64 * 1024
+MAX_RANGES = 16 # More is almost always abuse; such requests get the whole file
+
+_RANGE_SPEC = re.compile(r'^(\d*)-(\d*)$')
+
+
+def parse_range_header(header, size):
+    """
+    The satisfiable (start, end) byte ranges of a ``Range`` header, inclusive,
+    sorted and with overlapping or adjacent ranges merged. Returns None when the
+    header should be ignored (malformed, not bytes, too many ranges) and [] when
+    none of the ranges can be satisfied.
+    """
+    unit, _, specs = header.partition('=')
+    if unit.strip().lower() != 'bytes' or not specs:
+        return None
+    ranges = []
+    for spec in specs.split(','):
+        match = _RANGE_SPEC.match(spec.strip())
+        if not match or match.groups() == ('', ''):
+            return None
+        first, last = match.groups()
+        if first == '': # Suffix range: the last N bytes
+            length = int(last)
+            if length == 0:
+                continue
+            start, end = max(size - length, 0), size - 1
+        else:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+            if last and int(last) < start:
+                return None
+            if start >= size:
+                continue
+        ranges.append((start, end))
+    if len(ranges) > MAX_RANGES:
+        return None
+
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class _FileParts:
+    """
+    Streams byte ranges of an open file, interleaved with literal byte strings
+    (multipart headers). Has close() so the response closes the file even if
+    the client goes away before the body is read.
+    """
+
+    def __init__(self, file, parts):
+        self.file = file
+        self.parts = parts # bytes, or (start, end) inclusive
+
+    def __iter__(self):
+        for part in self.parts:
+            if isinstance(part, bytes):
+                yield part
+                continue
+            start, end = part
+            self.file.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = self.file.read(min(FILE_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    def close(self):
+        self.file.close()
+
+    def __len__(self):
+        return sum(len(part) if isinstance(part, bytes) else part[1] - part[0] + 1 for part in self.parts)
+
+
+def _validators(storage, name, size):
+    try:
+        modified = storage.get_modified_time(name)
+    except (NotImplementedError, OSError):
+        return None, None
+    # Strong ETag: ranges from different versions of a file must never be mixed
+    mtime = int(modified.timestamp() * 1_000_000)
+    return f'"{mtime:x}-{size:x}"', http_date(modified.timestamp())
+
+
+def _range_allowed(request, etag, last_modified):
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    return if_range in (etag, last_modified) and not if_range.startswith('W/')
+
+
+def _offloaded(storage, name, content_type, filename, as_attachment):
+    """The internal-redirect response for the configured backend, or None to stream."""
+    backend = settings.FILE_DELIVERY_BACKEND
+    if backend == 'django':
+        return None
+    if backend not in ('x-accel-redirect', 'x-sendfile'):
+        raise ImproperlyConfigured(f"Unknown FILE_DELIVERY_BACKEND {backend!r}")
+    try:
+        path = storage.path(name)
+    except NotImplementedError: # Remote storage: nothing for the web server to open
+        return None
+    if not os.path.isfile(path):
+        raise FileNotFoundError(path)
+
+    response = HttpResponse(content_type=content_type)
+    if backend == 'x-accel-redirect':
+        relative = os.path.relpath(path, settings.MEDIA_ROOT)
+        if relative.startswith(os.pardir):
+            return None # Outside MEDIA_ROOT, so not under the internal location
+        internal = settings.FILE_DELIVERY_INTERNAL_URL.rstrip('/')
+        response['X-Accel-Redirect'] = f"{internal}/{quote(relative.replace(os.sep, '/'))}"
+    else:
+        if not path.isascii():
+            return None # Django would MIME-encode the header value; the server cannot decode it
+        response['X-Sendfile'] = path
+    response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+    return response
+
+
+def serve_file(request, file_field, filename=None, as_attachment=False):
+    """
+    Response for a stored FileField, full or partial as the request asks.
+    Raises FileNotFoundError if the file is missing from storage.
+    """
+    return serve_stored_file(request, file_field.storage, file_field.name, filename, as_attachment)
+
+
+def serve_stored_file(request, storage, name, filename=None, as_attachment=False):
+    filename = filename or os.path.basename(name)
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    response = _offloaded(storage, name, content_type, filename, as_attachment)
+    if response is not None:
+        return response
+
+    file = storage.open(name, 'rb')
+    size = storage.size(name)
+    etag, last_modified = _validators(storage, name, size)
+
+    ranges = None
+    header = request.META.get('HTTP_RANGE')
+    if header and _range_allowed(request, etag, last_modified):
+        ranges = parse_range_header(header, size)
+
+    if ranges is None: # No (usable) Range: the whole file
+        response = FileResponse(file, content_type=content_type, as_attachment=as_attachment, filename=filename)
+        response.block_size = FILE_CHUNK_SIZE
+    elif not ranges:
+        file.close()
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+    else:
+        if len(ranges) == 1:
+            (start, end), = ranges
+            body = _FileParts(file, ranges)
+            response = StreamingHttpResponse(body, status=206, content_type=content_type)
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        else:
+            boundary = secrets.token_hex(16)
+            parts = []
+            for start, end in ranges:
+                parts.append(f'\r\n--{boundary}\r\nContent-Type: {content_type}\r\nContent-Range: bytes {start}-{end}/{size}\r\n\r\n'.encode())
+                parts.append((start, end))
+            parts.append(f'\r\n--{boundary}--\r\n'.encode())
+            body = _FileParts(file, parts)
+            response = StreamingHttpResponse(body, status=206, content_type=f'multipart/byteranges; boundary={boundary}')
+        response['Content-Length'] = len(body)
+        response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+
+    response['Accept-Ranges'] = 'bytes'
+    if etag:
+        response['ETag'] = etag
+        response['Last-Modified'] = last_modified
+    return response
+
+
+# --- Signed URLs ---
+def _signature(expires, name):
+    return salted_hmac('core.files.signed_file_url', f'{expires}:{name}', algorithm='sha256').hexdigest()[:32]
+
+
+def signed_file_url(request, file_field):
+    """
+    Absolute URL that serves ``file_field`` to anyone holding it until it
+    expires. The expiry is rounded up to a whole number of
+    settings.SIGNED_FILE_URL_LIFETIME periods, so a file gets the same URL
+    throughout a period (caches can reuse it) and every URL stays valid for
+    between one and two lifetimes.
+    """
+    lifetime = settings.SIGNED_FILE_URL_LIFETIME
+    expires = (int(time.time()) // lifetime + 2) * lifetime
+    prefix = getattr(request, '_signed_file_url_prefix', None)
+    if prefix is None:
+        # Reversed once per request; everything after the prefix is formatted per file
+        url = reverse('signed-file', kwargs={'expires': 0, 'signature': '0', 'name': '0'})
+        prefix = request._signed_file_url_prefix = request.build_absolute_uri(url[:-len('0/0/0')])
+    return f'{prefix}{expires}/{_signature(expires, file_field.name)}/{quote(file_field.name)}'
+
+
+def verify_signed_file(expires, signature, name):
+    return expires >= time.time() and constant_time_compare(signature, _signature(expires, name))
@@ -0,0 +1,75 @@
+# backend/core/management/commands/process_import_jobs.py
+
+import logging
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from core.models import ImportJob
+from core.roster import run_import_job
+
+REQUEUE_INTERVAL = 60 # Seconds between scans for stale RUNNING jobs
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Process queued roster import jobs (run under a process supervisor, or with --once from cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Drain the queue and exit instead of polling.")
+        parser.add_argument('--poll-interval', type=float, default=2.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument(
+            '--stale-after', type=int, default=10,
+            help="Minutes without progress after which a RUNNING job is assumed orphaned and requeued."
+        )
+
+    def handle(self, *args, **options):
+        next_requeue = 0
+        while True:
+            # Also while running, so jobs orphaned by another worker are picked up
+            if time.monotonic() >= next_requeue:
+                self.requeue_stale(options['stale_after'])
+                next_requeue = time.monotonic() + REQUEUE_INTERVAL
+
+            job = self.claim_next()
+            if job is None:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+                continue
+
+            self.stdout.write(f"--- PROCESSING IMPORT JOB {job.id} (batch {job.batch_id}, from row {job.checkpoint}) ---")
+            try:
+                run_import_job(job)
+            except Exception: # e.g. the database went away; the job is requeued once stale
+                logger.exception("Import job %s could not be processed", job.id)
+                continue
+            self.stdout.write(
+                f"--- IMPORT JOB {job.id} {job.status}: {job.added_to_batch} added, "
+                f"{job.newly_created} created, {job.skipped} skipped ---"
+            )
+
+    def claim_next(self):
+        # skip_locked lets several workers share the queue without double-processing a job
+        with transaction.atomic():
+            job = (
+                ImportJob.objects.select_for_update(skip_locked=True)
+                .filter(status='PENDING')
+                .order_by('created_at')
+                .first()
+            )
+            if job is None:
+                return None
+            job.status = 'RUNNING'
+            if job.started_at is None:
+                job.started_at = timezone.now()
+            job.save(update_fields=['status', 'started_at', 'updated_at'])
+        return job
+
+    def requeue_stale(self, minutes):
+        cutoff = timezone.now() - timedelta(minutes=minutes)
+        requeued = ImportJob.objects.filter(status='RUNNING', updated_at__lt=cutoff).update(status='PENDING')
+        if requeued:
+            self.stdout.write(f"--- REQUEUED {requeued} STALE IMPORT JOB(S); THEY RESUME FROM THEIR CHECKPOINT ---")
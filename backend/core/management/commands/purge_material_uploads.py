@@ -0,0 +1,27 @@
+# backend/core/management/commands/purge_material_uploads.py
+
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from core.models import MaterialUpload
+from core.uploads import discard
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete chunked upload sessions with no activity for a while, along with "
+        "their partial files (run periodically, e.g. daily from cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, default=24, dest='hours', help="Hours without a chunk (default 24).")
+
+    def handle(self, *args, **options):
+        stale = MaterialUpload.objects.filter(updated_at__lt=timezone.now() - timedelta(hours=options['hours']))
+        purged = 0
+        for upload in stale.iterator():
+            if upload.status != 'COMPLETED': # OPEN, or FINALIZING in a process that died
+                discard(upload)
+            upload.delete()
+            purged += 1
+        self.stdout.write(f"--- MATERIAL UPLOADS PURGED: {purged} ---")
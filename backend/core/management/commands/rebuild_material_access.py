@@ -0,0 +1,24 @@
+# backend/core/management/commands/rebuild_material_access.py
+
+from django.core.management.base import BaseCommand
+from core.material_access import refresh_material_access, refresh_batch_access
+from core.models import User, Batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the material access index from schedules, batches and assignments "
+        "(after bulk edits that bypass signals, or to drop expired trainer entries)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='users', help="Only this user id (repeatable).")
+        parser.add_argument('--batch', type=int, action='append', dest='batches', help="Only this batch id (repeatable).")
+
+    def handle(self, *args, **options):
+        user_ids, batch_ids = options['users'] or [], options['batches'] or []
+        if not (user_ids or batch_ids):
+            user_ids = list(User.objects.order_by('id').values_list('id', flat=True))
+            batch_ids = list(Batch.objects.order_by('id').values_list('id', flat=True))
+        totals = [a + b for a, b in zip(refresh_material_access(user_ids), refresh_batch_access(batch_ids))]
+        self.stdout.write("--- MATERIAL ACCESS REBUILT: {} created, {} updated, {} deleted ---".format(*totals))
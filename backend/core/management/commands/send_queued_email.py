@@ -0,0 +1,119 @@
+# backend/core/management/commands/send_queued_email.py
+
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from core.models import EmailOutbox
+
+PURGE_INTERVAL = 3600 # Seconds between deletions of old sent/failed rows
+CLAIM_LEASE = 600 # Seconds a claimed batch is reserved; if the worker dies, the rest is retried after this
+
+
+class Command(BaseCommand):
+    help = "Deliver queued EmailOutbox messages, reusing one SMTP connection per batch."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Drain the outbox and exit instead of polling.")
+        parser.add_argument('--poll-interval', type=float, default=5.0, help="Seconds to sleep when nothing is due.")
+        parser.add_argument('--batch-size', type=int, default=settings.EMAIL_OUTBOX_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        next_purge = 0
+        while True:
+            if time.monotonic() >= next_purge:
+                self.purge_old()
+                next_purge = time.monotonic() + PURGE_INTERVAL
+
+            sent, failed = self.deliver_batch(options['batch_size'])
+            if sent or failed:
+                self.stdout.write(f"--- OUTBOX: SENT {sent}, FAILED {failed} ---")
+                continue
+            if options['once']:
+                return
+            time.sleep(options['poll_interval'])
+
+    def claim_batch(self, batch_size):
+        # A short transaction marks the rows SENDING under a lease, so parallel
+        # workers skip them and no transaction stays open while SMTP is slow.
+        # SENDING rows whose lease ran out belong to a worker that died; only the
+        # message it was sending at the time can go out twice.
+        now = timezone.now()
+        with transaction.atomic():
+            entries = list(
+                EmailOutbox.objects.select_for_update(skip_locked=True)
+                .filter(status__in=['PENDING', 'SENDING'], next_attempt_at__lte=now)
+                .order_by('id')[:batch_size]
+            )
+            EmailOutbox.objects.filter(pk__in=[entry.pk for entry in entries]).update(
+                status='SENDING', next_attempt_at=now + timedelta(seconds=CLAIM_LEASE)
+            )
+        return entries
+
+    def deliver_batch(self, batch_size):
+        entries = self.claim_batch(batch_size)
+        if not entries:
+            return 0, 0
+
+        sent = failed = 0
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as e:
+            for entry in entries:
+                self.record_failure(entry, e)
+            return 0, len(entries)
+
+        try:
+            # Each result is saved as soon as it is known, so a crash later in the
+            # batch never sends a recorded message again
+            for entry in entries:
+                message = EmailMessage(entry.subject, entry.body, entry.from_email or None, entry.to, connection=connection)
+                try:
+                    # One message per call keeps failures attributable; the connection stays open
+                    if not connection.send_messages([message]):
+                        raise RuntimeError("Message was not accepted by the mail backend.")
+                except Exception as e:
+                    self.record_failure(entry, e)
+                    failed += 1
+                    self.reconnect(connection)
+                    continue
+                entry.status = 'SENT'
+                entry.body = '' # May hold a temporary password; not needed once delivered
+                entry.attempts += 1
+                entry.sent_at = timezone.now()
+                entry.last_error = ''
+                entry.save(update_fields=['status', 'body', 'attempts', 'sent_at', 'last_error'])
+                sent += 1
+        finally:
+            connection.close()
+        return sent, failed
+
+    def reconnect(self, connection):
+        # The server may have dropped the session; give the rest of the batch a fresh one
+        connection.close()
+        try:
+            connection.open()
+        except Exception:
+            pass
+
+    def record_failure(self, entry, error):
+        entry.attempts += 1
+        entry.last_error = str(error)
+        if entry.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            entry.status = 'FAILED'
+            self.stderr.write(f"--- GIVING UP ON EMAIL {entry.id} TO {', '.join(entry.to)}: {error} ---")
+        else:
+            entry.status = 'PENDING'
+            delay = min(settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS * 2 ** (entry.attempts - 1), 3600)
+            entry.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+        entry.save(update_fields=['status', 'attempts', 'last_error', 'next_attempt_at'])
+
+    def purge_old(self):
+        cutoff = timezone.now() - timedelta(days=settings.EMAIL_OUTBOX_RETENTION_DAYS)
+        purged, _ = EmailOutbox.objects.filter(status__in=['SENT', 'FAILED'], created_at__lt=cutoff).delete()
+        if purged:
+            self.stdout.write(f"--- OUTBOX: PURGED {purged} OLD MESSAGE(S) ---")
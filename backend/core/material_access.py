@@ -0,0 +1,195 @@
+# backend/core/material_access.py
+
+"""
+Maintenance and lookups for the MaterialAccess index.
+
+    STUDENT  materials assigned to the student directly (User.assigned_materials),
+             to one of their batches (BatchMaterial), or in the course of one of
+             their batches
+    TRAINER  materials on the trainer's current or upcoming schedules, until the
+             last of those schedules ends
+
+Direct assignments and schedules are indexed per user. Batch assignments and
+course materials are indexed per batch, and a student picks those up through
+their enrollments at lookup time, so assigning a material to a batch or
+enrolling a student writes one row or none, not one per student.
+
+Admins and staff can open everything, and trainers can always open their own
+and public uploads; both are decided from the user and material rows alone, so
+they are not indexed.
+
+Writes never edit the index directly. Signals (core/signals.py) call
+``refresh_after_commit`` / ``refresh_batches_after_commit`` with the users or
+batches, and where known the materials, that a change can affect; those entries
+are recomputed from the sources once the transaction commits. QuerySet.update()
+/bulk_create() send no signals: call them by hand there, or run
+``manage.py rebuild_material_access``.
+"""
+
+from django.db import transaction
+from django.db.models import Exists, Max, OuterRef, Q
+from django.utils import timezone
+from .models import User, Material, Schedule, BatchMaterial, MaterialAccess
+
+REFRESH_CHUNK_SIZE = 2000 # users or batches recomputed per round trip
+
+
+def _restrict(queryset, field, material_ids):
+    return queryset if material_ids is None else queryset.filter(**{f'{field}__in': material_ids})
+
+
+def _wanted_user_access(user_ids, material_ids, now):
+    """{(user_id, material_id, role): expires_at} as the sources say it should be."""
+    wanted = {}
+    assigned = _restrict(
+        User.assigned_materials.through.objects.filter(user_id__in=user_ids), 'material_id', material_ids
+    ).values_list('user_id', 'material_id')
+    for user_id, material_id in assigned:
+        wanted[(user_id, material_id, 'STUDENT')] = None
+
+    scheduled = _restrict(
+        Schedule.materials.through.objects.filter(schedule__trainer_id__in=user_ids, schedule__end_date__gte=now),
+        'material_id', material_ids,
+    ).values('schedule__trainer_id', 'material_id').annotate(until=Max('schedule__end_date'))
+    for row in scheduled:
+        wanted[(row['schedule__trainer_id'], row['material_id'], 'TRAINER')] = row['until']
+    return wanted
+
+
+def _wanted_batch_access(batch_ids, material_ids, now):
+    """{(batch_id, material_id, 'STUDENT'): None} for batch assignments and course materials."""
+    wanted = {}
+    batch_sources = (
+        _restrict(BatchMaterial.objects.filter(batch_id__in=batch_ids), 'material_id', material_ids)
+            .values_list('batch_id', 'material_id'),
+        _restrict(Material.objects.filter(course__batches__in=batch_ids), 'id', material_ids)
+            .values_list('course__batches', 'id'),
+    )
+    for rows in batch_sources:
+        for batch_id, material_id in rows.distinct():
+            wanted[(batch_id, material_id, 'STUDENT')] = None
+    return wanted
+
+
+def _refresh(owner_field, owner_ids, material_ids, wanted_access):
+    owner_ids = list(dict.fromkeys(owner_ids))
+    material_ids = None if material_ids is None else list(set(material_ids))
+    if not owner_ids or material_ids == []:
+        return 0, 0, 0
+
+    now = timezone.now()
+    created = updated = deleted = 0
+    for start in range(0, len(owner_ids), REFRESH_CHUNK_SIZE):
+        chunk = owner_ids[start:start + REFRESH_CHUNK_SIZE]
+        wanted = wanted_access(chunk, material_ids, now)
+        existing = {
+            (owner_id, material_id, role): (pk, expires_at)
+            for pk, owner_id, material_id, role, expires_at in _restrict(
+                MaterialAccess.objects.filter(**{f'{owner_field}__in': chunk}), 'material_id', material_ids
+            ).values_list('pk', owner_field, 'material_id', 'role', 'expires_at')
+        }
+        stale = [pk for key, (pk, _) in existing.items() if key not in wanted]
+        changed = [
+            MaterialAccess(pk=pk, expires_at=wanted[key])
+            for key, (pk, expires_at) in existing.items() if key in wanted and wanted[key] != expires_at
+        ]
+        new = [
+            MaterialAccess(**{owner_field: owner_id}, material_id=material_id, role=role, expires_at=expires_at)
+            for (owner_id, material_id, role), expires_at in wanted.items() if (owner_id, material_id, role) not in existing
+        ]
+        with transaction.atomic():
+            for i in range(0, len(stale), REFRESH_CHUNK_SIZE):
+                deleted += MaterialAccess.objects.filter(pk__in=stale[i:i + REFRESH_CHUNK_SIZE]).delete()[0]
+            if changed:
+                updated += MaterialAccess.objects.bulk_update(changed, ['expires_at'], batch_size=REFRESH_CHUNK_SIZE)
+            # ignore_conflicts: a concurrent refresh of the same owner may have got there first
+            MaterialAccess.objects.bulk_create(new, batch_size=REFRESH_CHUNK_SIZE, ignore_conflicts=True)
+            created += len(new)
+    return created, updated, deleted
+
+
+def refresh_material_access(user_ids, material_ids=None):
+    """
+    Bring the per-user index entries of ``user_ids`` in line with the sources,
+    limited to ``material_ids`` when given. Returns (created, updated, deleted).
+    """
+    return _refresh('user_id', user_ids, material_ids, _wanted_user_access)
+
+
+def refresh_batch_access(batch_ids, material_ids=None):
+    """As refresh_material_access, for the per-batch entries of ``batch_ids``."""
+    return _refresh('batch_id', batch_ids, material_ids, _wanted_batch_access)
+
+
+def _after_commit(refresh, ids, material_ids):
+    # Ids are resolved now (the rows may be gone after a delete), the refresh
+    # runs once the change that triggered it is committed
+    ids = list(ids)
+    material_ids = None if material_ids is None else list(material_ids)
+    if ids:
+        transaction.on_commit(lambda: refresh(ids, material_ids))
+
+
+def refresh_after_commit(user_ids, material_ids=None):
+    _after_commit(refresh_material_access, user_ids, material_ids)
+
+
+def refresh_batches_after_commit(batch_ids, material_ids=None):
+    _after_commit(refresh_batch_access, batch_ids, material_ids)
+
+
+# --- Lookups ---
+def _live_grants(user):
+    # The user's own entries plus those of the batches they are enrolled in: one
+    # query, with the enrollments read as an indexed subquery
+    enrolled = User.batches.through.objects.filter(user_id=user.pk).values('batch_id')
+    return MaterialAccess.objects.filter(Q(user=user) | Q(batch__in=enrolled), role=user.role).filter(
+        Q(expires_at__isnull=True) | Q(expires_at__gte=timezone.now())
+    )
+
+
+def _decided_without_index(user, material):
+    # True/False when the user and material rows settle it, None to ask the index
+    if user.role == 'ADMIN' or user.is_staff:
+        return True
+    if user.role == 'TRAINER' and (material.uploader_id is None or material.uploader_id == user.id):
+        return True
+    if user.role not in ('TRAINER', 'STUDENT'):
+        return False
+    return None
+
+
+def can_open_material(user, material):
+    """The view_content rule: one indexed lookup unless the user/material rows decide it."""
+    decided = _decided_without_index(user, material)
+    if decided is not None:
+        return decided
+    return _live_grants(user).filter(material=material).exists()
+
+
+class OpenableMaterials:
+    """can_open_material for many materials at once: ``material in openable``, one index read in all."""
+
+    def __init__(self, user):
+        self.user = user
+        self._granted = None
+
+    def __contains__(self, material):
+        decided = _decided_without_index(self.user, material)
+        if decided is not None:
+            return decided
+        if self._granted is None:
+            self._granted = set(_live_grants(self.user).values_list('material_id', flat=True))
+        return material.id in self._granted
+
+
+def accessible_materials(user):
+    """Every material ``user`` may open, as a queryset."""
+    if user.role == 'ADMIN' or user.is_staff:
+        return Material.objects.all()
+    granted = Exists(_live_grants(user).filter(material=OuterRef('pk')))
+    if user.role == 'TRAINER':
+        return Material.objects.filter(granted | Q(uploader__isnull=True) | Q(uploader=user))
+    if user.role == 'STUDENT':
+        return Material.objects.filter(granted)
+    return Material.objects.none()
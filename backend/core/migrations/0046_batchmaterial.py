@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0045_emailoutbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BatchMaterial',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('assigned_at', models.DateTimeField(auto_now_add=True)),
+                ('assigned_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('batch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='material_assignments', to='core.batch')),
+                ('material', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='batch_assignments', to='core.material')),
+            ],
+            options={
+                'unique_together': {('batch', 'material')},
+            },
+        ),
+        migrations.AddField(
+            model_name='batch',
+            name='materials',
+            field=models.ManyToManyField(blank=True, related_name='assigned_batches', through='core.BatchMaterial', to='core.material'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0046_batchmaterial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bill',
+            index=models.Index(fields=['-date', 'id'], name='bill_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bill',
+            index=models.Index(fields=['trainer', '-date', 'id'], name='bill_trainer_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employeedocument',
+            index=models.Index(fields=['-uploaded_at', 'id'], name='empdoc_uploaded_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employeedocument',
+            index=models.Index(fields=['employee', '-uploaded_at', 'id'], name='empdoc_emp_uploaded_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentattempt',
+            index=models.Index(fields=['-timestamp', 'id'], name='attempt_timestamp_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['-updated_at', 'id'], name='task_updated_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['employee', '-updated_at', 'id'], name='task_emp_updated_id_idx'),
+        ),
+    ]
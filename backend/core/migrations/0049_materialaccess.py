@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max
+from django.utils import timezone
+
+
+def backfill_material_access(apps, schema_editor):
+    # Same rules as core/material_access.py, for every user and batch at once
+    User = apps.get_model('core', 'User')
+    Material = apps.get_model('core', 'Material')
+    Schedule = apps.get_model('core', 'Schedule')
+    BatchMaterial = apps.get_model('core', 'BatchMaterial')
+    MaterialAccess = apps.get_model('core', 'MaterialAccess')
+
+    wanted = {}
+    for user_id, material_id in User.assigned_materials.through.objects.values_list('user_id', 'material_id').iterator():
+        wanted[('user_id', user_id, material_id, 'STUDENT')] = None
+    scheduled = (
+        Schedule.materials.through.objects.filter(schedule__end_date__gte=timezone.now())
+        .values('schedule__trainer_id', 'material_id').annotate(until=Max('schedule__end_date'))
+    )
+    for row in scheduled.iterator():
+        wanted[('user_id', row['schedule__trainer_id'], row['material_id'], 'TRAINER')] = row['until']
+    batch_sources = (
+        BatchMaterial.objects.values_list('batch_id', 'material_id'),
+        Material.objects.filter(course__batches__isnull=False).values_list('course__batches', 'id'),
+    )
+    for rows in batch_sources:
+        for batch_id, material_id in rows.distinct().iterator():
+            wanted[('batch_id', batch_id, material_id, 'STUDENT')] = None
+
+    MaterialAccess.objects.bulk_create(
+        (MaterialAccess(**{owner_field: owner_id}, material_id=material_id, role=role, expires_at=expires_at)
+         for (owner_field, owner_id, material_id, role), expires_at in wanted.items()),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0048_updated_at_timestamps'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaterialAccess',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(max_length=10)),
+                ('expires_at', models.DateTimeField(blank=True, null=True)),
+                ('material', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='access_entries', to='core.material')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='material_access', to=settings.AUTH_USER_MODEL)),
+                ('batch', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='material_access', to='core.batch')),
+            ],
+            options={
+                'unique_together': {('user', 'material', 'role'), ('batch', 'material', 'role')},
+                'constraints': [models.CheckConstraint(condition=models.Q(models.Q(('batch__isnull', True), ('user__isnull', False)), models.Q(('batch__isnull', False), ('user__isnull', True)), _connector='OR'), name='materialaccess_user_xor_batch')],
+            },
+        ),
+        migrations.RunPython(backfill_material_access, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:54
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0049_materialaccess'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaterialUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255)),
+                ('size', models.PositiveBigIntegerField()),
+                ('chunk_size', models.PositiveIntegerField()),
+                ('title', models.CharField(max_length=100)),
+                ('type', models.CharField(choices=[('PDF', 'PDF'), ('PPT', 'PPT'), ('DOC', 'DOC'), ('VIDEO', 'VIDEO')], max_length=10)),
+                ('duration_in_minutes', models.PositiveIntegerField(default=0)),
+                ('status', models.CharField(choices=[('OPEN', 'Open'), ('FINALIZING', 'Finalizing'), ('COMPLETED', 'Completed')], default='OPEN', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.course')),
+                ('material', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.material')),
+                ('uploader', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='material_uploads', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MaterialUploadChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveIntegerField()),
+                ('sha256', models.CharField(max_length=64)),
+                ('received_at', models.DateTimeField(auto_now=True)),
+                ('upload', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='core.materialupload')),
+            ],
+            options={
+                'unique_together': {('upload', 'index')},
+            },
+        ),
+    ]
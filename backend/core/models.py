@@ -5,7 +5,9 @@ from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.conf import settings
 from django.core.exceptions import ValidationError
+import math
 import os
+import uuid
 
 class User(AbstractUser):
     ROLE_CHOICES = (
@@ -101,6 +103,7 @@ class Material(models.Model):
     content = models.FileField(upload_to='materials/')
     uploader = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='uploaded_materials')
     duration_in_minutes = models.PositiveIntegerField(default=0, help_text="Duration of the material in minutes.")
+    updated_at = models.DateTimeField(auto_now=True)
     def __str__(self):
         return self.title
 
@@ -110,6 +113,7 @@ class Schedule(models.Model):
     start_date = models.DateTimeField()
     end_date = models.DateTimeField()
     materials = models.ManyToManyField(Material, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         if self.batch:
@@ -156,6 +160,13 @@ class Bill(models.Model):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
     invoice_number = models.CharField(max_length=20, unique=True, blank=True)
 
+    class Meta:
+        # Keyset pagination orders by (-date, id); trainers only list their own bills
+        indexes = [
+            models.Index(fields=['-date', 'id'], name='bill_date_id_idx'),
+            models.Index(fields=['trainer', '-date', 'id'], name='bill_trainer_date_id_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.invoice_number:
             today = timezone.now().date()
@@ -195,6 +206,9 @@ class StudentAttempt(models.Model):
     score = models.IntegerField()
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['-timestamp', 'id'], name='attempt_timestamp_id_idx')]
+
     def __str__(self):
         student_name = self.student.username if self.student else "N/A"
         assessment_title = self.assessment.title if self.assessment else "N/A"
@@ -204,6 +218,7 @@ class Course(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True)
     cover_photo = models.ImageField(upload_to='course_covers/', null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -214,6 +229,8 @@ class Batch(models.Model):
     name = models.CharField(max_length=100)
     start_date = models.DateField()
     end_date = models.DateField()
+    materials = models.ManyToManyField(Material, through='BatchMaterial', blank=True, related_name='assigned_batches')
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ('course', 'name', 'college')
@@ -261,6 +278,13 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Admins page through every task, employees through their own
+        indexes = [
+            models.Index(fields=['-updated_at', 'id'], name='task_updated_id_idx'),
+            models.Index(fields=['employee', '-updated_at', 'id'], name='task_emp_updated_id_idx'),
+        ]
+
     def __str__(self):
         employee_name = self.employee.get_full_name if self.employee else "N/A"
         return f"Task: {self.title} ({employee_name}) - {self.status}"
@@ -280,6 +304,12 @@ class EmployeeDocument(models.Model):
     document = models.FileField(upload_to=employee_document_path) # Use dynamic path
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-uploaded_at', 'id'], name='empdoc_uploaded_id_idx'),
+            models.Index(fields=['employee', '-uploaded_at', 'id'], name='empdoc_emp_uploaded_id_idx'),
+        ]
+
     def __str__(self):
         employee_name = self.employee.get_full_name if self.employee else "N/A"
         # Return filename if title is empty, otherwise title
@@ -311,4 +341,144 @@ class Certification(models.Model):
         ordering = ['-start_date']
 
     def __str__(self):
-        return f"{self.title} from {self.institute} ({self.employee.username})"
\ No newline at end of file
+        return f"{self.title} from {self.institute} ({self.employee.username})"
+
+class ImportJob(models.Model):
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('COMPLETED', 'Completed'),
+        ('FAILED', 'Failed'),
+    )
+    batch = models.ForeignKey(Batch, on_delete=models.CASCADE, related_name='import_jobs')
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='import_jobs')
+    file = models.FileField(upload_to='import_jobs/')
+    filename = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    checkpoint = models.PositiveIntegerField(default=0, help_text="Data rows already committed; a restarted job resumes here")
+    added_to_batch = models.PositiveIntegerField(default=0)
+    newly_created = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list)
+    error_message = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True) # Doubles as the worker heartbeat
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Import into {self.batch_id}: {self.filename or self.file.name} ({self.status})"
+
+
+class EmailOutbox(models.Model):
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('SENDING', 'Sending'), # Claimed by a worker until next_attempt_at
+        ('SENT', 'Sent'),
+        ('FAILED', 'Failed'),
+    )
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254, blank=True)
+    to = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'next_attempt_at'])]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
+
+
+class BatchMaterial(models.Model):
+    # Materials assigned to a whole batch; one row per material, however many
+    # students the batch has. MaterialAccess is derived from these.
+    batch = models.ForeignKey(Batch, on_delete=models.CASCADE, related_name='material_assignments')
+    material = models.ForeignKey(Material, on_delete=models.CASCADE, related_name='batch_assignments')
+    assigned_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    assigned_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('batch', 'material')
+
+    def __str__(self):
+        return f"{self.material} -> {self.batch}"
+
+
+class MaterialAccess(models.Model):
+    # Derived index of who may open which material, so a download is one indexed
+    # lookup. The sources of truth are schedules, batch membership, batch/user
+    # material assignments and material courses; core/material_access.py keeps
+    # this in step with them. Rebuild with `manage.py rebuild_material_access`.
+    # Each row belongs to a user (direct assignments, schedules) or to a batch
+    # (batch assignments, course materials), never both.
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='material_access', null=True, blank=True)
+    batch = models.ForeignKey(Batch, on_delete=models.CASCADE, related_name='material_access', null=True, blank=True)
+    material = models.ForeignKey(Material, on_delete=models.CASCADE, related_name='access_entries')
+    role = models.CharField(max_length=10) # The role this access applies to (STUDENT or TRAINER)
+    expires_at = models.DateTimeField(null=True, blank=True) # Last schedule end for trainers; null = no expiry
+
+    class Meta:
+        unique_together = [('user', 'material', 'role'), ('batch', 'material', 'role')]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(user__isnull=False, batch__isnull=True) | models.Q(user__isnull=True, batch__isnull=False),
+                name='materialaccess_user_xor_batch',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user or self.batch} ({self.role}) -> {self.material}"
+
+
+class MaterialUpload(models.Model):
+    # A resumable, chunked upload of one material file (see core/uploads.py).
+    # Chunks are written straight into a preallocated file; finalize moves that
+    # file into materials/ and creates the Material from the fields below.
+    STATUS_CHOICES = (
+        ('OPEN', 'Open'),
+        ('FINALIZING', 'Finalizing'), # Verifying and moving the file; chunks are refused
+        ('COMPLETED', 'Completed'),
+    )
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False) # Unguessable; it names the partial file
+    uploader = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='material_uploads')
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    title = models.CharField(max_length=100)
+    course = models.ForeignKey('Course', on_delete=models.CASCADE, related_name='+', null=True)
+    type = models.CharField(max_length=10, choices=Material.MATERIAL_TYPE_CHOICES)
+    duration_in_minutes = models.PositiveIntegerField(default=0)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='OPEN')
+    material = models.OneToOneField(Material, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def chunk_count(self):
+        return max(math.ceil(self.size / self.chunk_size), 1)
+
+    def chunk_length(self, index):
+        return min(self.chunk_size, self.size - index * self.chunk_size)
+
+    def __str__(self):
+        return f"Upload {self.filename} ({self.status})"
+
+
+class MaterialUploadChunk(models.Model):
+    # One row per chunk received, so parallel PUTs never contend on a shared field
+    upload = models.ForeignKey(MaterialUpload, on_delete=models.CASCADE, related_name='chunks')
+    index = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64)
+    received_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('upload', 'index')
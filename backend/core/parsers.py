@@ -0,0 +1,34 @@
+# backend/core/parsers.py
+
+import io
+import re
+from rest_framework.parsers import JSONParser, get_encoding
+from .renderers import FastJSONRenderer, orjson
+
+
+# orjson turns integers beyond 64 bits into floats; json keeps them exact
+_LONG_NUMBER = re.compile(rb'\d{19}')
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser backed by orjson for UTF-8 bodies. Anything orjson would read
+    differently or refuses (other encodings, integers wider than 64 bits,
+    malformed input) is handed to the stock parser, so accepted input, values
+    and error messages stay the same.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        if orjson is None or get_encoding(parser_context).lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        if _LONG_NUMBER.search(body):
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+
@@ -0,0 +1,45 @@
+# backend/core/renderers.py
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError: # Optional speed-up; the stock renderer is used without it
+    orjson = None
+
+
+_encoder = JSONEncoder()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson, several times faster on large lists.
+
+    The output matches DRF's compact renderer byte for byte for strings,
+    integers, Decimals and model-field data. It uses the same separators and raw
+    UTF-8, and escapes U+2028 and U+2029 the same way. Datetimes, Decimals, lazy
+    strings and other non-JSON types go through DRF's own encoder. Pretty-printed
+    output (``; indent=N`` or the browsable API) and installs without orjson fall
+    back to the stock renderer.
+
+    Floats, which only reach it from JSONFields, can differ: orjson writes
+    exponents as ``1e-7``/``1e20`` where DRF writes ``1e-07``/``1e+20`` (the same
+    number to any JSON parser), and renders NaN/Infinity as ``null`` where DRF's
+    strict mode raises.
+    """
+    options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (orjson is None or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_encoder.default, option=self.options)
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits; let the stock renderer decide
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -0,0 +1,238 @@
+# backend/core/roster.py
+
+import logging
+import secrets
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from .models import User, EmailOutbox
+from .roster_parsing import ROSTER_CHUNK_SIZE, iter_roster_chunks, normalize_roster
+from .utils import student_credentials_email, student_onboarding_email, hash_passwords
+
+
+MAX_REPORTED_ERRORS = 1000 # Keeps the summary bounded on very large, very broken files
+
+logger = logging.getLogger(__name__)
+
+
+class RosterImportError(Exception):
+    """Raised when a streaming import fails part way; carries the partial summary."""
+    def __init__(self, message, summary):
+        super().__init__(message)
+        self.summary = summary
+
+
+def import_roster(batch, rows):
+    """
+    Enroll every student in a parsed roster chunk into ``batch`` with set-based queries:
+    one ``username__in`` lookup for existing users, one ``bulk_create`` for new
+    students and one bulk insert into the ``User.batches`` through-table.
+
+    Returns the ``import_summary`` dict reported by the batch endpoints.
+    """
+    valid, errors = normalize_roster(rows)
+
+    existing = {
+        username: (user_id, role)
+        for username, user_id, role in User.objects.filter(
+            username__in=[email for _, email, _, _ in valid]
+        ).values_list('username', 'id', 'role')
+    }
+
+    student_ids = []
+    new_users = []
+    for row, email, first_name, last_name in valid:
+        if email in existing:
+            user_id, role = existing[email]
+            if role != 'STUDENT':
+                errors.append((row, f"Row {row}: Email {email} exists but is not a student."))
+                continue
+            student_ids.append(user_id)
+            continue
+
+        new_users.append(User(
+            username=email, email=email,
+            first_name=first_name, last_name=last_name,
+            role='STUDENT', must_change_password=True
+        ))
+
+    send_links = settings.STUDENT_ONBOARDING_MODE == 'LINK'
+    if send_links:
+        # No hashing at all: students choose a password through a signed link
+        for user in new_users:
+            user.set_unusable_password()
+        passwords = []
+    else:
+        passwords = [secrets.token_urlsafe(8) for _ in new_users]
+        for user, encoded in zip(new_users, hash_passwords(passwords)):
+            user.password = encoded
+
+    with transaction.atomic():
+        User.objects.bulk_create(new_users)
+        student_ids.extend(user.id for user in new_users)
+        if student_ids:
+            batch.students.add(*student_ids)
+
+        # Queued in the same transaction, so a failed chunk emails nobody
+        if send_links:
+            emails = [student_onboarding_email(user) for user in new_users]
+        else:
+            emails = [student_credentials_email(user, password) for user, password in zip(new_users, passwords)]
+        EmailOutbox.objects.bulk_create(emails)
+
+    errors.sort(key=lambda error: error[0])
+    return {
+        'added_to_batch': len(student_ids),
+        'newly_created': len(new_users),
+        'skipped': len(errors),
+        'errors': [message for _, message in errors],
+    }
+
+
+def preview_roster_file(batch, file_obj, chunk_size=ROSTER_CHUNK_SIZE):
+    """
+    Work out what importing ``file_obj`` into ``batch`` would do, without
+    writing anything. Each chunk costs two set-based queries: existing users by
+    ``username__in`` and current members of the batch. ``batch`` may be None
+    when previewing a batch that has not been created yet.
+    """
+    preview = {'would_create': [], 'would_add': [], 'already_member': [], 'wrong_role': [], 'invalid': []}
+    seen = set()
+    for chunk in iter_roster_chunks(file_obj, chunk_size):
+        valid, errors = normalize_roster(chunk)
+        preview['invalid'].extend(message for _, message in errors)
+
+        emails = {email for _, email, _, _ in valid} - seen
+        seen |= emails
+        roles = dict(User.objects.filter(username__in=emails).values_list('username', 'role'))
+        members = set()
+        if batch is not None:
+            members = set(batch.students.filter(username__in=emails).values_list('username', flat=True))
+
+        students = {email for email, role in roles.items() if role == 'STUDENT'}
+        preview['would_create'].extend(sorted(emails - roles.keys()))
+        preview['wrong_role'].extend(sorted(roles.keys() - students))
+        preview['already_member'].extend(sorted(students & members))
+        preview['would_add'].extend(sorted(students - members))
+
+    preview['counts'] = {key: len(values) for key, values in preview.items()}
+    return preview
+
+
+def import_roster_file(batch, file_obj, start_row=0, on_checkpoint=None, chunk_size=ROSTER_CHUNK_SIZE):
+    """
+    Stream an uploaded roster into ``batch`` chunk by chunk. Each chunk is
+    committed on its own, and the summary's ``checkpoint`` is the number of data
+    rows handled so far; passing it back as ``start_row`` resumes an
+    interrupted import. ``on_checkpoint(summary)`` is called after every chunk.
+    """
+    summary = {'added_to_batch': 0, 'newly_created': 0, 'skipped': 0, 'errors': [], 'checkpoint': start_row}
+    try:
+        for chunk in iter_roster_chunks(file_obj, chunk_size, start_row):
+            chunk_summary = import_roster(batch, chunk)
+            summary['added_to_batch'] += chunk_summary['added_to_batch']
+            summary['newly_created'] += chunk_summary['newly_created']
+            summary['skipped'] += chunk_summary['skipped']
+            room = MAX_REPORTED_ERRORS - len(summary['errors'])
+            summary['errors'].extend(chunk_summary['errors'][:max(room, 0)])
+            summary['checkpoint'] = chunk[-1][0] + 1
+            if on_checkpoint:
+                on_checkpoint(summary)
+    except Exception as e:
+        raise RosterImportError(str(e), summary) from e
+
+    unreported = summary['skipped'] - len(summary['errors'])
+    if unreported > 0:
+        summary['errors'].append(f"... and {unreported} more skipped rows.")
+    return summary
+
+
+def run_import_job(job):
+    """
+    Process a claimed ImportJob, persisting progress counters after every
+    committed chunk so a restarted job resumes from its checkpoint.
+    """
+    base = {
+        'added_to_batch': job.added_to_batch,
+        'newly_created': job.newly_created,
+        'skipped': job.skipped,
+        'errors': list(job.errors),
+    }
+    progress_fields = ['checkpoint', 'added_to_batch', 'newly_created', 'skipped', 'errors', 'updated_at']
+
+    def record(summary):
+        job.checkpoint = summary['checkpoint']
+        job.added_to_batch = base['added_to_batch'] + summary['added_to_batch']
+        job.newly_created = base['newly_created'] + summary['newly_created']
+        job.skipped = base['skipped'] + summary['skipped']
+        job.errors = (base['errors'] + summary['errors'])[:MAX_REPORTED_ERRORS + 1]
+        job.save(update_fields=progress_fields)
+
+    try:
+        with job.file.open('rb') as f:
+            summary = import_roster_file(job.batch, f, start_row=job.checkpoint, on_checkpoint=record)
+    except Exception as e:
+        # Any failure (a bad file, a missing upload, a database error) fails this
+        # job only; the worker goes on with the queue
+        logger.exception("Roster import job %s failed", job.id)
+        job.status = 'FAILED'
+        job.error_message = str(e) or e.__class__.__name__
+    else:
+        record(summary)
+        job.status = 'COMPLETED'
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error_message', 'finished_at', 'updated_at'])
+
+    if job.status == 'COMPLETED':
+        # The roster holds personal data; it is not needed once imported
+        job.file.delete(save=True)
+    return job
+
+
+# --- Set-based batch membership changes ---
+MEMBERSHIP_CHUNK_SIZE = 5000 # ids per lookup/insert, well under every backend's parameter limit
+
+
+def _id_chunks(ids, chunk_size):
+    ids = list(dict.fromkeys(ids)) # De-duplicate, keep request order
+    for start in range(0, len(ids), chunk_size):
+        yield ids[start:start + chunk_size]
+
+
+def _member_ids(batch, user_ids):
+    Membership = User.batches.through
+    return set(
+        Membership.objects.filter(batch=batch, user_id__in=user_ids).values_list('user_id', flat=True)
+    )
+
+
+def add_students_to_batch(batch, student_ids, chunk_size=MEMBERSHIP_CHUNK_SIZE):
+    """
+    Enroll existing students by id. Ids that are not students are reported as
+    not found; ids already enrolled cost a lookup but no write.
+    """
+    summary = {'added': 0, 'already_present': 0, 'not_found': 0}
+    with transaction.atomic():
+        for chunk in _id_chunks(student_ids, chunk_size):
+            students = set(User.objects.filter(id__in=chunk, role='STUDENT').values_list('id', flat=True))
+            present = _member_ids(batch, students)
+            new_ids = students - present
+            if new_ids:
+                batch.students.add(*new_ids)
+            summary['added'] += len(new_ids)
+            summary['already_present'] += len(present)
+            summary['not_found'] += len(chunk) - len(students)
+    return summary
+
+
+def remove_students_from_batch(batch, student_ids, chunk_size=MEMBERSHIP_CHUNK_SIZE):
+    """Unenroll students by id; ids that are not enrolled are counted, never written."""
+    summary = {'removed': 0, 'not_member': 0}
+    with transaction.atomic():
+        for chunk in _id_chunks(student_ids, chunk_size):
+            members = _member_ids(batch, chunk)
+            if members:
+                batch.students.remove(*members)
+            summary['removed'] += len(members)
+            summary['not_member'] += len(chunk) - len(members)
+    return summary
@@ -0,0 +1,134 @@
+# backend/core/roster_parsing.py
+
+"""
+Streaming readers for student roster uploads.
+
+CSV is parsed with the stdlib ``csv`` module and XLSX through openpyxl's
+read-only row iterator, both one chunk at a time. openpyxl is imported on first
+use, and pandas only for legacy ``.xls`` files, so importing this module (and
+core.views) stays cheap for every worker and management command.
+"""
+
+import csv
+import io
+import math
+from itertools import islice
+
+ROSTER_CHUNK_SIZE = 2000 # Rows parsed, normalized and committed per transaction
+ROSTER_COLUMNS = ('name', 'email')
+
+
+def iter_roster_chunks(file_obj, chunk_size=ROSTER_CHUNK_SIZE, start_row=0):
+    """
+    Yield the roster as lists of at most ``chunk_size`` ``(index, name, email)``
+    tuples, where ``index`` is the 0-based data row across the whole file.
+    Rows before ``start_row`` (already imported by an earlier run) are skipped.
+    """
+    name = file_obj.name.lower()
+    if name.endswith('.xlsx'):
+        rows = _xlsx_rows(file_obj)
+    elif name.endswith('.xls'):
+        rows = _xls_rows(file_obj)
+    else:
+        rows = _csv_rows(file_obj)
+
+    if start_row:
+        rows = (row for row in rows if row[0] >= start_row)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def normalize_roster(rows):
+    """
+    Validate and normalize a chunk of raw ``(index, name, email)`` rows.
+
+    Returns ``(valid, errors)``. ``valid`` holds one ``(row, email, first_name,
+    last_name)`` tuple per distinct email (first occurrence wins) and ``errors``
+    is a list of ``(row, message)`` tuples. Row numbers match the spreadsheet:
+    the header is row 1.
+    """
+    valid, errors, seen = [], [], set()
+    for index, name, email in rows:
+        row = index + 2
+        email = email.strip().lower() if isinstance(email, str) else ''
+        name = '' if _is_blank(name) else str(name).strip()
+        if not email or not name:
+            errors.append((row, f"Row {row}: Missing name or invalid email."))
+            continue
+        if email in seen:
+            continue
+        seen.add(email)
+        first_name, _, last_name = name.partition(' ')
+        valid.append((row, email, first_name, last_name))
+    return valid, errors
+
+
+def _is_blank(value):
+    return value is None or value == '' or (isinstance(value, float) and math.isnan(value))
+
+
+def _column_positions(header):
+    positions = {column: None for column in ROSTER_COLUMNS}
+    for i, column in enumerate(header):
+        if column in positions and positions[column] is None:
+            positions[column] = i
+    return positions['name'], positions['email']
+
+
+def _pick(values, position):
+    if position is None or position >= len(values):
+        return None
+    return values[position]
+
+
+def _csv_rows(file_obj):
+    # Uploads are binary; decode as UTF-8, tolerating the BOM Excel writes
+    text = io.TextIOWrapper(file_obj, encoding='utf-8-sig', newline='')
+    try:
+        reader = csv.reader(text)
+        header = next(reader, None)
+        if header is None:
+            return
+        name_at, email_at = _column_positions(header)
+        index = 0
+        for values in reader:
+            if not values:
+                continue # Blank lines are not data rows
+            yield index, _pick(values, name_at), _pick(values, email_at)
+            index += 1
+    finally:
+        # Hand the upload back open; closing it is the caller's job
+        text.detach()
+
+
+def _xlsx_rows(file_obj):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_obj, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        name_at, email_at = _column_positions(header)
+        for index, values in enumerate(rows):
+            if all(value is None for value in values):
+                continue # Blank rows are ignored
+            yield index, _pick(values, name_at), _pick(values, email_at)
+    finally:
+        workbook.close()
+
+
+def _xls_rows(file_obj):
+    # The legacy binary format has no streaming reader; this is the one path
+    # that still needs pandas, so it is imported here rather than at startup
+    import pandas as pd
+
+    df = pd.read_excel(file_obj, usecols=lambda c: c in ROSTER_COLUMNS)
+    names = df['name'].tolist() if 'name' in df.columns else [None] * len(df)
+    emails = df['email'].tolist() if 'email' in df.columns else [None] * len(df)
+    for index, (name, email) in enumerate(zip(names, emails)):
+        yield index, name, email
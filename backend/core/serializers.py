@@ -6,35 +6,62 @@ from .models import (
     Batch, Module, StudentAttempt, User, College, Material, Schedule,
     TrainerApplication, EmployeeApplication, Task, # <-- Added EmployeeApplication, Task
     Expense, Bill, Assessment, Course, EmployeeDocument, EducationEntry, 
-    WorkExperienceEntry, Certification
+    WorkExperienceEntry, Certification, ImportJob, MaterialUpload
 )
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.db import IntegrityError, transaction
 from django.utils import timezone
-from .utils import send_student_credentials, send_employee_credentials # <-- Added send_employee_credentials
+from django.utils.text import get_valid_filename
+from .utils import send_student_credentials, send_employee_credentials, send_student_onboarding_link, detail_url
+from .field_selection import FieldSelectionSerializerMixin
+from .files import signed_file_url
+from .uploads import DEFAULT_CHUNK_SIZE, MIN_CHUNK_SIZE, MAX_CHUNK_SIZE
+from django.conf import settings
+from django.core.cache import cache
+from .cache import claims_key
 import secrets
 
+def can_sign_for(request, owner_id):
+    # Signed URLs skip the view's permission check, so only hand them to someone
+    # who passes it anyway: admins/staff and the owner
+    user = getattr(request, 'user', None)
+    return bool(user and user.is_authenticated and (user.role == 'ADMIN' or user.is_staff or user.id == owner_id))
+
+
 class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
     @classmethod
     def get_token(cls, user):
         token = super().get_token(user)
-        token['username'] = user.username
-        token['role'] = user.role
         token['user_id'] = user.id
-        token['name'] = user.get_full_name
-        token['must_change_password'] = user.must_change_password
-
-        # Add role-specific data if needed in the token payload
-        if user.role == 'STUDENT':
-            user_batches = user.batches.all().select_related('course')
-            token['batches'] = [b.id for b in user_batches]
-            token['courses'] = list(set([b.course.name for b in user_batches]))
-        # Add EMPLOYEE specific token data if necessary later
-        # elif user.role == 'EMPLOYEE':
-        #     token['department'] = user.department
-
+        for claim, value in cls.get_claims(user).items():
+            token[claim] = value
         return token
 
+    @classmethod
+    def get_claims(cls, user):
+        # Cached per user (see core/cache.py); signals drop the entry on change,
+        # and the short TTL bounds staleness in processes a local-memory
+        # invalidation does not reach
+        key = claims_key(user.pk)
+        claims = cache.get(key)
+        if claims is None:
+            claims = {
+                'username': user.username,
+                'role': user.role,
+                'name': user.get_full_name,
+                'must_change_password': user.must_change_password,
+            }
+            # Add role-specific data if needed in the token payload
+            if user.role == 'STUDENT':
+                user_batches = user.batches.all().select_related('course')
+                claims['batches'] = [b.id for b in user_batches]
+                claims['courses'] = list(set([b.course.name for b in user_batches]))
+            # Add EMPLOYEE specific token data if necessary later
+            # elif user.role == 'EMPLOYEE':
+            #     claims['department'] = user.department
+            cache.set(key, claims, settings.AUTH_USER_CACHE_TIMEOUT)
+        return claims
+
     def validate(self, attrs):
         data = super().validate(attrs)
         user = self.user
@@ -46,7 +73,7 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
         if user.role == 'TRAINER':
             if user.access_expiry_date and user.access_expiry_date < timezone.now():
                 user.is_active = False
-                user.save()
+                user.save(update_fields=['is_active'])
                 raise serializers.ValidationError("Your access period has expired. Please contact an administrator to be assigned to a new schedule.")
         # Add EMPLOYEE specific validation if needed later
 
@@ -55,6 +82,7 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
 class EducationEntrySerializer(serializers.ModelSerializer):
     # --- ADD THESE TWO LINES ---
     marksheet_url = serializers.SerializerMethodField()
+    marksheet_signed_url = serializers.SerializerMethodField()
     filename = serializers.SerializerMethodField()
 
     class Meta:
@@ -66,9 +94,10 @@ class EducationEntrySerializer(serializers.ModelSerializer):
             # --- ADD THESE THREE FIELDS ---
             'marksheet_file', 
             'marksheet_url',
+            'marksheet_signed_url',
             'filename'
         ]
-        read_only_fields = ['employee', 'marksheet_url', 'filename']
+        read_only_fields = ['employee', 'marksheet_url', 'marksheet_signed_url', 'filename']
         # --- ADD EXTRA_KWARGS ---
         extra_kwargs = {
             'marksheet_file': {'write_only': True, 'required': False} # File is optional
@@ -79,15 +108,19 @@ class EducationEntrySerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         if obj.marksheet_file and request:
             try:
-                from django.urls import reverse
-                # This 'view-marksheet' action needs to be created in the ViewSet
-                url = reverse('education-entry-view-marksheet', kwargs={'pk': obj.pk})
-                return request.build_absolute_uri(url)
+                # Served by EducationEntryViewSet.view_marksheet
+                return detail_url(request, 'education-entry-view-marksheet', obj.pk)
             except Exception:
                 if obj.marksheet_file.url:
                     return request.build_absolute_uri(obj.marksheet_file.url)
         return None
 
+    def get_marksheet_signed_url(self, obj):
+        request = self.context.get('request')
+        if obj.marksheet_file and can_sign_for(request, obj.employee_id):
+            return signed_file_url(request, obj.marksheet_file)
+        return None
+
     def get_filename(self, obj):
         if obj.marksheet_file:
             return os.path.basename(obj.marksheet_file.name)
@@ -104,6 +137,7 @@ class WorkExperienceEntrySerializer(serializers.ModelSerializer):
 
 class CertificationSerializer(serializers.ModelSerializer):
     certificate_url = serializers.SerializerMethodField()
+    certificate_signed_url = serializers.SerializerMethodField()
     filename = serializers.SerializerMethodField()
     
     class Meta:
@@ -111,9 +145,9 @@ class CertificationSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'employee', 'title', 'institute', 'location', 'website',
             'start_date', 'end_date', 'currently_ongoing', 'description',
-            'certificate_file', 'certificate_url', 'filename' # Added file fields
+            'certificate_file', 'certificate_url', 'certificate_signed_url', 'filename' # Added file fields
         ]
-        read_only_fields = ['employee', 'certificate_url', 'filename']
+        read_only_fields = ['employee', 'certificate_url', 'certificate_signed_url', 'filename']
         extra_kwargs = {
             'certificate_file': {'write_only': True, 'required': False} # File is optional
         }
@@ -122,21 +156,37 @@ class CertificationSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         if obj.certificate_file and request:
             try:
-                from django.urls import reverse
-                # We will create this view action in views.py
-                url = reverse('certification-view-certificate', kwargs={'pk': obj.pk})
-                return request.build_absolute_uri(url)
+                # Served by CertificationViewSet.view_certificate
+                return detail_url(request, 'certification-view-certificate', obj.pk)
             except Exception:
                 if obj.certificate_file.url:
                     return request.build_absolute_uri(obj.certificate_file.url)
         return None
 
+    def get_certificate_signed_url(self, obj):
+        request = self.context.get('request')
+        if obj.certificate_file and can_sign_for(request, obj.employee_id):
+            return signed_file_url(request, obj.certificate_file)
+        return None
+
     def get_filename(self, obj):
         if obj.certificate_file:
             return os.path.basename(obj.certificate_file.name)
         return None
 
-class UserSerializer(serializers.ModelSerializer):
+class UserDirectorySerializer(serializers.ModelSerializer):
+    """Slim, read-only user row for directory listings; no relations, so no extra queries."""
+    full_name = serializers.CharField(source='get_full_name', read_only=True)
+
+    class Meta:
+        model = User
+        fields = (
+            'id', 'username', 'email', 'role', 'full_name', 'phone', 'department',
+            'expertise', 'access_expiry_date', 'must_change_password'
+        )
+        read_only_fields = fields
+
+class UserSerializer(FieldSelectionSerializerMixin, serializers.ModelSerializer):
     name = serializers.CharField(write_only=True, required=True)
     full_name = serializers.CharField(source='get_full_name', read_only=True)
     username = serializers.CharField(read_only=True)
@@ -159,6 +209,7 @@ class UserSerializer(serializers.ModelSerializer):
             'department', 'bio', 'education_entries', 'work_experience_entries', 'certification_entries',
             'name', 'full_name', 'resume', 'must_change_password'
         )
+        expandable_fields = ('education_entries', 'work_experience_entries', 'certification_entries')
         extra_kwargs = {
             'email': {'required': True},
             # Make trainer/student fields not required by default if creating Employee/Admin
@@ -180,7 +231,10 @@ class UserSerializer(serializers.ModelSerializer):
         first_name = name_parts[0]
         last_name = name_parts[1] if len(name_parts) > 1 else ""
 
-        password = secrets.token_urlsafe(8)
+        # In LINK onboarding mode students get an unusable password (no hashing)
+        # and choose their own through a signed set-password link
+        send_link = role == 'STUDENT' and settings.STUDENT_ONBOARDING_MODE == 'LINK'
+        password = None if send_link else secrets.token_urlsafe(8)
 
         try:
             user = User.objects.create_user(
@@ -195,7 +249,10 @@ class UserSerializer(serializers.ModelSerializer):
         if role == 'STUDENT':
             user.must_change_password = True
             user.save(update_fields=['must_change_password'])
-            send_student_credentials(user, password)
+            if send_link:
+                send_student_onboarding_link(user)
+            else:
+                send_student_credentials(user, password)
         elif role == 'EMPLOYEE':
             user.must_change_password = True
             user.save(update_fields=['must_change_password'])
@@ -232,16 +289,17 @@ class EmployeeDocumentSerializer(serializers.ModelSerializer):
     employee_name = serializers.CharField(source='employee.get_full_name', read_only=True)
     # Provide the URL for the document field
     document_url = serializers.SerializerMethodField()
+    document_signed_url = serializers.SerializerMethodField()
     filename = serializers.SerializerMethodField()
 
     class Meta:
         model = EmployeeDocument
         fields = [
             'id', 'employee', 'employee_name', 'title',
-            'document', 'document_url', 'filename', # Include new fields
+            'document', 'document_url', 'document_signed_url', 'filename', # Include new fields
             'uploaded_at'
         ]
-        read_only_fields = ['employee', 'employee_name', 'uploaded_at', 'document_url', 'filename']
+        read_only_fields = ['employee', 'employee_name', 'uploaded_at', 'document_url', 'document_signed_url', 'filename']
         # Make document write-only for creation/update, URL read-only for retrieval
         extra_kwargs = {
             'document': {'write_only': True, 'required': True}
@@ -252,34 +310,54 @@ class EmployeeDocumentSerializer(serializers.ModelSerializer):
         if obj.document and request:
             # Use the custom view action URL
             try:
-                # Dynamically get the URL from the 'employee-document-view-document' route
-                from django.urls import reverse
-                url = reverse('employee-document-view-document', kwargs={'pk': obj.pk})
-                return request.build_absolute_uri(url)
+                # Resolved once per request, then formatted per document
+                return detail_url(request, 'employee-document-view-document', obj.pk)
             except Exception as e:
                 # Fallback to direct media URL (less secure, but works if view action fails)
                 if obj.document.url:
                     return request.build_absolute_uri(obj.document.url)
         return None
 
+    def get_document_signed_url(self, obj):
+        request = self.context.get('request')
+        if obj.document and can_sign_for(request, obj.employee_id):
+            return signed_file_url(request, obj.document)
+        return None
+
     def get_filename(self, obj):
         if obj.document:
             return os.path.basename(obj.document.name)
         return None
 
 
-class MaterialSerializer(serializers.ModelSerializer):
+class MaterialSerializer(FieldSelectionSerializerMixin, serializers.ModelSerializer):
     course_name = serializers.CharField(source='course.name', read_only=True)
     uploader = serializers.PrimaryKeyRelatedField(read_only=True)
+    content_signed_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Material
-        fields = ['id', 'title', 'course', 'course_name', 'type', 'content', 'uploader', 'duration_in_minutes']
+        fields = ['id', 'title', 'course', 'course_name', 'type', 'content', 'content_signed_url', 'uploader', 'duration_in_minutes']
         extra_kwargs = {
             'course': {'required': True, 'allow_null': True} # Allow null temporarily if needed? Check logic.
         }
 
-class ModuleSerializer(serializers.ModelSerializer):
+    def get_fields(self):
+        fields = super().get_fields()
+        # Only MaterialViewSet says who may open what (context['openable_materials']).
+        # Nested in courses/modules/schedules, responses are shared or cached across
+        # users, so no per-user signed URL there.
+        if 'openable_materials' not in self.context:
+            fields.pop('content_signed_url', None)
+        return fields
+
+    def get_content_signed_url(self, obj):
+        request = self.context.get('request')
+        if obj.content and request and obj in self.context['openable_materials']:
+            return signed_file_url(request, obj.content)
+        return None
+
+class ModuleSerializer(FieldSelectionSerializerMixin, serializers.ModelSerializer):
     materials = MaterialSerializer(many=True, read_only=True)
     material_ids = serializers.PrimaryKeyRelatedField(
         queryset=Material.objects.all(), many=True, write_only=True, source='materials', required=False
@@ -288,22 +366,25 @@ class ModuleSerializer(serializers.ModelSerializer):
     class Meta:
         model = Module
         fields = ['id', 'course', 'module_number', 'title', 'materials', 'material_ids']
+        expandable_fields = ('materials',)
 
-class CourseSerializer(serializers.ModelSerializer):
+class CourseSerializer(FieldSelectionSerializerMixin, serializers.ModelSerializer):
     modules = ModuleSerializer(many=True, read_only=True)
 
     class Meta:
         model = Course
         fields = ['id', 'name', 'description', 'modules', 'cover_photo']
+        expandable_fields = ('modules',)
 
-class CollegeSerializer(serializers.ModelSerializer):
+class CollegeSerializer(FieldSelectionSerializerMixin, serializers.ModelSerializer):
     courses = CourseSerializer(many=True, read_only=True)
 
     class Meta:
         model = College
         fields = '__all__'
+        expandable_fields = ('courses',)
 
-class ScheduleSerializer(serializers.ModelSerializer):
+class ScheduleSerializer(FieldSelectionSerializerMixin, serializers.ModelSerializer):
     trainer_name = serializers.CharField(source='trainer.get_full_name', read_only=True)
     batch_name = serializers.CharField(source='batch.name', read_only=True)
     course_name = serializers.CharField(source='batch.course.name', read_only=True)
@@ -323,6 +404,7 @@ class ScheduleSerializer(serializers.ModelSerializer):
             'id', 'trainer', 'trainer_name', 'batch', 'batch_name', 'course_name', 'college_name',
             'start_date', 'end_date', 'materials', 'material_ids'
         ]
+        expandable_fields = ('materials',)
 
 class TrainerApplicationSerializer(serializers.ModelSerializer):
     class Meta:
@@ -364,11 +446,61 @@ class StudentAttemptSerializer(serializers.ModelSerializer):
         model = StudentAttempt
         fields = ['id', 'student', 'student_name', 'assessment', 'assessment_title', 'course', 'score', 'timestamp']
 
-class BatchSerializer(serializers.ModelSerializer):
+class BatchSerializer(FieldSelectionSerializerMixin, serializers.ModelSerializer):
     course_name = serializers.CharField(source='course.name', read_only=True)
     college_name = serializers.CharField(source='college.name', read_only=True, allow_null=True)
-    student_count = serializers.IntegerField(source='students.count', read_only=True)
+    student_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Batch
-        fields = ['id', 'course', 'course_name', 'college', 'college_name', 'name', 'start_date', 'end_date', 'student_count']
\ No newline at end of file
+        fields = ['id', 'course', 'course_name', 'college', 'college_name', 'name', 'start_date', 'end_date', 'student_count']
+
+    def get_student_count(self, obj):
+        # BatchViewSet annotates the count in the list query; fall back to a COUNT(*) for lone instances
+        count = getattr(obj, 'student_count', None)
+        return obj.students.count() if count is None else count
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ImportJob
+        fields = [
+            'id', 'batch', 'filename', 'status', 'checkpoint',
+            'added_to_batch', 'newly_created', 'skipped', 'errors', 'error_message',
+            'created_at', 'started_at', 'finished_at'
+        ]
+        read_only_fields = fields
+
+
+class MaterialUploadSerializer(serializers.ModelSerializer):
+    chunk_size = serializers.IntegerField(
+        required=False, default=DEFAULT_CHUNK_SIZE, min_value=MIN_CHUNK_SIZE, max_value=MAX_CHUNK_SIZE
+    )
+    size = serializers.IntegerField(min_value=1)
+    chunk_count = serializers.IntegerField(read_only=True)
+    received_chunks = serializers.SerializerMethodField()
+
+    class Meta:
+        model = MaterialUpload
+        fields = [
+            'id', 'filename', 'size', 'chunk_size', 'chunk_count', 'received_chunks',
+            'title', 'course', 'type', 'duration_in_minutes', 'status', 'material', 'created_at'
+        ]
+        read_only_fields = ['id', 'status', 'material', 'created_at']
+        extra_kwargs = {
+            'course': {'required': True, 'allow_null': True} # Same as MaterialSerializer
+        }
+
+    def validate_size(self, value):
+        if value > settings.MATERIAL_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f"Files may be at most {settings.MATERIAL_UPLOAD_MAX_SIZE} bytes.")
+        return value
+
+    def validate_filename(self, value):
+        filename = get_valid_filename(os.path.basename(value))
+        if not filename:
+            raise serializers.ValidationError("Invalid filename.")
+        return filename
+
+    def get_received_chunks(self, obj):
+        # What a client resuming an upload can skip
+        return sorted(obj.chunks.values_list('index', flat=True))
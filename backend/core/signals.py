@@ -1,9 +1,11 @@
 # backend/core/signals.py
 
-from django.db.models.signals import post_save
+from django.db.models.signals import pre_save, post_save, post_delete, pre_delete, m2m_changed
 from django.dispatch import receiver
 # --- UPDATE IMPORTS ---
-from .models import Certification, EmployeeDocument, EducationEntry
+from .models import Certification, EmployeeDocument, EducationEntry, Course, Module, Material, User, College, Batch, Schedule, BatchMaterial
+from .cache import bump_after_commit, forget_claims, forget_auth_users
+from .material_access import refresh_after_commit, refresh_batches_after_commit
 
 @receiver(post_save, sender=Certification)
 def create_employee_document_from_certificate(sender, instance, created, **kwargs):
@@ -42,4 +44,161 @@ def create_employee_document_from_marksheet(sender, instance, **kwargs):
                 title=f"Marksheet: {instance.title} ({instance.institute})",
                 document=instance.marksheet_file
             )
-# --- END ADD ---
\ No newline at end of file
+# --- END ADD ---
+
+
+# --- Course catalog cache invalidation ---
+# CourseViewSet responses are cached per catalog version (see core/cache.py).
+# Note that QuerySet.update()/bulk_create() send no signals; bump by hand there.
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Module)
+@receiver(post_delete, sender=Module)
+@receiver(post_save, sender=Material)
+@receiver(post_delete, sender=Material)
+@receiver(m2m_changed, sender=Module.materials.through)
+def invalidate_course_catalog(sender, action=None, **kwargs):
+    # m2m_changed fires pre_* and post_* actions; bump once, after the change
+    if action is None or action.startswith('post_'):
+        bump_after_commit('catalog')
+
+
+# --- Versions for data embedded in other responses (ETag validators) ---
+# Names of users, colleges and batches appear in batch, schedule and task
+# responses; a rename must change those responses' ETags too.
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=College)
+@receiver(post_delete, sender=College)
+@receiver(post_save, sender=Batch)
+@receiver(post_delete, sender=Batch)
+def invalidate_directory(sender, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return # Every login saves last_login; that is not a visible change
+    bump_after_commit('directory')
+
+
+@receiver(m2m_changed, sender=User.batches.through)
+def invalidate_enrollment(sender, action=None, **kwargs):
+    # Batch student counts
+    if action.startswith('post_'):
+        bump_after_commit('enrollment')
+
+
+@receiver(m2m_changed, sender=Schedule.materials.through)
+def invalidate_schedule_materials(sender, action=None, **kwargs):
+    if action.startswith('post_'):
+        bump_after_commit('schedule-materials')
+
+
+# --- Cached JWT claims (see MyTokenObtainPairSerializer.get_claims) ---
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_user_claims(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    forget_claims([instance.pk])
+    # Cached authentication row: role, is_active, access_expiry_date, ...
+    forget_auth_users([instance.pk])
+
+
+@receiver(m2m_changed, sender=User.batches.through)
+def forget_enrollment_claims(sender, instance, action=None, reverse=False, pk_set=None, **kwargs):
+    # reverse: changed from the batch side (batch.students.add(...)), pk_set holds user ids
+    if action in ('post_add', 'post_remove'):
+        forget_claims(pk_set if reverse else [instance.pk])
+    elif action == 'pre_clear': # post_clear no longer knows who was enrolled
+        forget_claims(instance.students.values_list('id', flat=True) if reverse else [instance.pk])
+
+
+@receiver(pre_delete, sender=Batch)
+def forget_batch_claims(sender, instance, **kwargs):
+    forget_claims(instance.students.values_list('id', flat=True))
+
+
+@receiver(post_save, sender=Batch)
+def forget_batch_change_claims(sender, instance, created=False, **kwargs):
+    # A batch moved to another course changes its students' course names
+    if not created:
+        forget_claims(instance.students.values_list('id', flat=True))
+
+
+@receiver(post_save, sender=Course)
+def forget_course_claims(sender, instance, created=False, **kwargs):
+    # Students' tokens carry course names
+    if not created:
+        forget_claims(User.objects.filter(batches__course=instance).values_list('id', flat=True).distinct())
+
+
+# --- Material access index (see core/material_access.py) ---
+# Enrollment changes need no refresh: batch entries reach students through
+# User.batches when the index is read.
+@receiver(pre_save, sender=Schedule)
+@receiver(pre_save, sender=Batch)
+@receiver(pre_save, sender=Material)
+def remember_access_owner(sender, instance, **kwargs):
+    # The trainer or course a row belonged to before this save; access that
+    # came through it has to be taken away again
+    field = 'trainer_id' if sender is Schedule else 'course_id'
+    instance._previous_owner = (
+        sender.objects.filter(pk=instance.pk).values_list(field, flat=True).first() if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Schedule)
+@receiver(post_delete, sender=Schedule)
+def refresh_schedule_access(sender, instance, **kwargs):
+    # Trainer, end date or the schedule itself changed
+    refresh_after_commit({instance.trainer_id, getattr(instance, '_previous_owner', None)} - {None})
+
+
+@receiver(post_save, sender=Batch)
+def refresh_batch_course_access(sender, instance, created=False, **kwargs):
+    # A new batch starts with its course's materials; a deleted one takes its entries with it
+    if created or instance._previous_owner != instance.course_id:
+        refresh_batches_after_commit([instance.pk])
+
+
+@receiver(post_save, sender=Material)
+def refresh_material_course_access(sender, instance, created=False, **kwargs):
+    if created or instance._previous_owner != instance.course_id:
+        courses = {instance.course_id, instance._previous_owner} - {None}
+        refresh_batches_after_commit(Batch.objects.filter(course__in=courses).values_list('id', flat=True), [instance.pk])
+
+
+@receiver(post_save, sender=BatchMaterial)
+@receiver(post_delete, sender=BatchMaterial)
+def refresh_batch_assignment_access(sender, instance, **kwargs):
+    # Bulk assignment (bulk_create) sends no signal; BatchViewSet.assign_materials refreshes by hand
+    refresh_batches_after_commit([instance.batch_id], [instance.material_id])
+
+
+@receiver(m2m_changed, sender=User.assigned_materials.through)
+def refresh_assigned_material_access(sender, instance, action=None, reverse=False, pk_set=None, **kwargs):
+    # reverse: changed from the material side, pk_set holds user ids
+    if action in ('post_add', 'post_remove'):
+        if reverse:
+            refresh_after_commit(pk_set, [instance.pk])
+        else:
+            refresh_after_commit([instance.pk], pk_set)
+    elif action == 'pre_clear':
+        if reverse:
+            refresh_after_commit(instance.assigned_users.values_list('id', flat=True), [instance.pk])
+        else:
+            refresh_after_commit([instance.pk])
+
+
+@receiver(m2m_changed, sender=Schedule.materials.through)
+def refresh_schedule_material_access(sender, instance, action=None, reverse=False, pk_set=None, **kwargs):
+    # reverse: changed from the material side, pk_set holds schedule ids
+    if action in ('post_add', 'post_remove'):
+        if reverse:
+            trainers = Schedule.objects.filter(pk__in=pk_set).values_list('trainer_id', flat=True).distinct()
+            refresh_after_commit(trainers, [instance.pk])
+        else:
+            refresh_after_commit([instance.trainer_id], pk_set)
+    elif action == 'pre_clear':
+        if reverse:
+            refresh_after_commit(instance.schedule_set.values_list('trainer_id', flat=True).distinct(), [instance.pk])
+        else:
+            refresh_after_commit([instance.trainer_id])
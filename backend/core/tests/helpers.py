@@ -0,0 +1,28 @@
+# backend/core/tests/helpers.py
+
+import shutil
+import tempfile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+
+
+def roster_csv(rows, name='roster.csv'):
+    body = 'name,email\n' + ''.join(f'{n},{e}\n' for n, e in rows)
+    return SimpleUploadedFile(name, body.encode(), content_type='text/csv')
+
+
+class TempMediaMixin:
+    """Points MEDIA_ROOT at a throwaway directory for the test class."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls._media_root = tempfile.mkdtemp()
+        cls._media_override = override_settings(MEDIA_ROOT=cls._media_root)
+        cls._media_override.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls._media_override.disable()
+        shutil.rmtree(cls._media_root, ignore_errors=True)
@@ -0,0 +1,64 @@
+# backend/core/tests/test_auth.py
+
+from datetime import date
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from core.models import User, Course, Batch
+
+PASSWORD = 'a-long-password'
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class LoginClaimsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.course = Course.objects.create(name='Python')
+        self.batch = Batch.objects.create(course=self.course, name='Morning', start_date=date.today(), end_date=date.today())
+        self.student = User.objects.create_user('ann@example.com', 'ann@example.com', PASSWORD, role='STUDENT', must_change_password=True)
+        self.student.batches.add(self.batch)
+
+    def claims(self):
+        response = APIClient().post('/api/token/', {'username': 'ann@example.com', 'password': PASSWORD}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return AccessToken(response.data['access'])
+
+    def test_claims_follow_user_changes(self):
+        self.assertTrue(self.claims()['must_change_password'])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.must_change_password = False
+            self.student.save()
+        self.assertFalse(self.claims()['must_change_password'])
+
+    def test_claims_follow_batch_course_changes(self):
+        self.assertEqual(self.claims()['courses'], ['Python'])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.batch.course = Course.objects.create(name='Django')
+            self.batch.save()
+        self.assertEqual(self.claims()['courses'], ['Django'])
+
+    @override_settings(AUTH_USER_CACHE_TIMEOUT=0)
+    def test_claims_expire_with_the_auth_cache_timeout(self):
+        self.assertTrue(self.claims()['must_change_password'])
+        User.objects.filter(pk=self.student.pk).update(must_change_password=False) # No signal, e.g. another process
+        self.assertFalse(self.claims()['must_change_password'])
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class SetPasswordTests(TestCase):
+    def test_cached_request_user_does_not_revert_other_fields(self):
+        cache.clear()
+        user = User.objects.create_user('emp@example.com', 'emp@example.com', PASSWORD, role='EMPLOYEE', must_change_password=True)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+        self.assertEqual(client.get('/api/courses/').status_code, 200) # Caches the authentication row
+
+        User.objects.filter(pk=user.pk).update(email='new@example.com', role='TRAINER') # An admin's concurrent edit
+        response = client.post('/api/auth/set-password/', {'password': 'another-password'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        user.refresh_from_db()
+        self.assertTrue(user.check_password('another-password'))
+        self.assertFalse(user.must_change_password)
+        self.assertEqual((user.email, user.role), ('new@example.com', 'TRAINER'))
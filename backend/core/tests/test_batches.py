@@ -0,0 +1,36 @@
+# backend/core/tests/test_batches.py
+
+from datetime import date
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from core.models import User, Course, Batch
+
+
+@override_settings(VERSIONED_CACHING=False, API_PAGINATE_BY_DEFAULT=False)
+class BatchStudentCountTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('admin', 'admin@example.com', 'p', role='ADMIN', is_staff=True))
+        course = Course.objects.create(name='Python')
+        self.full = Batch.objects.create(course=course, name='Morning', start_date=date.today(), end_date=date.today())
+        Batch.objects.create(course=course, name='Evening', start_date=date.today(), end_date=date.today())
+        for i in range(3):
+            User.objects.create_user(f's{i}', f's{i}@example.com', 'p', role='STUDENT').batches.add(self.full)
+
+    def test_list_counts_students_in_one_query(self):
+        with self.assertNumQueries(1):
+            rows = self.client.get('/api/batches/').data
+        self.assertEqual({row['name']: row['student_count'] for row in rows}, {'Morning': 3, 'Evening': 0})
+        self.assertEqual(rows[0]['course_name'], 'Python')
+
+    def test_count_is_skipped_when_not_rendered(self):
+        with CaptureQueriesContext(connection) as queries:
+            rows = self.client.get('/api/batches/', {'fields': 'id,name'}).data
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('core_user_batches', queries[0]['sql'])
+        self.assertEqual(set(rows[0]), {'id', 'name'})
+
+    def test_retrieve_counts_students(self):
+        self.assertEqual(self.client.get(f'/api/batches/{self.full.id}/').data['student_count'], 3)
@@ -0,0 +1,92 @@
+# backend/core/tests/test_cache.py
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from core.cache import get_version
+from core.models import User, Course
+
+
+class CatalogCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('admin', 'admin@example.com', 'p', role='ADMIN', is_staff=True))
+        Course.objects.create(name='Python')
+
+    def course_names(self):
+        response = self.client.get('/api/courses/')
+        self.assertEqual(response.status_code, 200)
+        return sorted(course['name'] for course in response.data)
+
+
+@override_settings(VERSIONED_CACHING=True)
+class VersionedCacheTests(CatalogCacheTestCase):
+    def test_version_is_bumped_only_after_commit(self):
+        version = get_version('catalog')
+        with self.captureOnCommitCallbacks() as callbacks:
+            Course.objects.create(name='Django')
+            self.assertEqual(get_version('catalog'), version) # Still uncommitted
+        for callback in callbacks:
+            callback()
+        self.assertGreater(get_version('catalog'), version)
+
+    def test_cached_catalog_is_invalidated_on_change(self):
+        self.assertEqual(self.course_names(), ['Python'])
+        Course.objects.filter(name='Python').update(name='Renamed') # No signal: the cached copy is served
+        self.assertEqual(self.course_names(), ['Python'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Course.objects.create(name='Django')
+        self.assertEqual(self.course_names(), ['Django', 'Renamed'])
+
+
+@override_settings(VERSIONED_CACHING=False)
+class UnsharedCacheTests(CatalogCacheTestCase):
+    def test_responses_are_not_cached(self):
+        self.assertEqual(self.course_names(), ['Python'])
+        Course.objects.filter(name='Python').update(name='Renamed')
+        self.assertEqual(self.course_names(), ['Renamed'])
+
+
+@override_settings(VERSIONED_CACHING=True)
+class ConditionalGetTests(CatalogCacheTestCase):
+    def test_not_modified_until_the_catalog_changes(self):
+        first = self.client.get('/api/courses/')
+        self.assertTrue(first['ETag'])
+        self.assertTrue(first['Last-Modified'])
+        self.assertEqual(self.client.get('/api/courses/', HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Course.objects.create(name='Django')
+        changed = self.client.get('/api/courses/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], first['ETag'])
+
+    def test_embedded_names_change_the_etag(self):
+        course = Course.objects.get(name='Python')
+        course.batches.create(name='Morning', start_date='2026-01-01', end_date='2026-02-01')
+        first = self.client.get('/api/batches/')
+        self.assertEqual(self.client.get('/api/batches/', HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user('student', 'student@example.com', 'p', role='STUDENT').batches.add(course.batches.get())
+        self.assertEqual(self.client.get('/api/batches/', HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
+
+    def test_batch_validator_skips_the_student_count_join(self):
+        Course.objects.get(name='Python').batches.create(name='Morning', start_date='2026-01-01', end_date='2026-02-01')
+        etag = self.client.get('/api/batches/')['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get('/api/batches/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('core_user_batches', queries[0]['sql'])
+
+
+@override_settings(VERSIONED_CACHING=False)
+class UnsharedConditionalGetTests(CatalogCacheTestCase):
+    def test_versioned_views_send_no_validators(self):
+        response = self.client.get('/api/courses/')
+        self.assertFalse(response.has_header('ETag'))
+        self.assertFalse(response.has_header('Last-Modified'))
@@ -0,0 +1,69 @@
+# backend/core/tests/test_fast_paths.py
+
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from django.test import TestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from core.models import User, Assessment, StudentAttempt, Task
+from core.renderers import FastJSONRenderer
+from core.serializers import TaskSerializer, StudentAttemptSerializer
+
+
+@override_settings(VERSIONED_CACHING=False, API_PAGINATE_BY_DEFAULT=False)
+class ValuesRowTests(TestCase):
+    """The values() list paths must render exactly what the serializers do."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('admin', 'admin@example.com', 'p', role='ADMIN', is_staff=True))
+
+    def assertSameRows(self, listed, serialized):
+        self.assertEqual(JSONRenderer().render(listed), JSONRenderer().render(serialized)) # Keys in the same order too
+
+    def test_task_list_matches_serializer(self):
+        named = User.objects.create_user('eve', 'eve@example.com', 'p', role='EMPLOYEE', first_name='Eve', last_name='Ng')
+        unnamed = User.objects.create_user('bob', 'bob@example.com', 'p', role='EMPLOYEE')
+        Task.objects.create(employee=named, title='Write', description='Docs', due_date=date(2026, 3, 1))
+        Task.objects.create(employee=unnamed, title='Review', status='DONE')
+
+        listed = self.client.get('/api/tasks/').data
+        serialized = TaskSerializer(Task.objects.select_related('employee').order_by('-updated_at'), many=True).data
+        self.assertEqual(len(listed), 2)
+        self.assertSameRows(listed, serialized)
+
+    def test_attempt_list_matches_serializer(self):
+        student = User.objects.create_user('ann', 'ann@example.com', 'p', role='STUDENT', first_name='Ann')
+        for title, score in (('Quiz', 80), ('Final', 95)):
+            assessment = Assessment.objects.create(title=title, course='Python', type='TEST')
+            StudentAttempt.objects.create(student=student, assessment=assessment, score=score)
+
+        listed = sorted(self.client.get('/api/attempts/').data, key=lambda row: row['id'])
+        serialized = StudentAttemptSerializer(StudentAttempt.objects.order_by('id'), many=True).data
+        self.assertEqual(len(listed), 2)
+        self.assertSameRows(listed, serialized)
+
+
+class FastJSONRendererTests(TestCase):
+    def test_matches_stock_renderer(self):
+        data = {
+            'text': 'naïve – 日本語 \u2028 \u2029 "quoted" \\ </script>',
+            'lazy': gettext_lazy('Hello'),
+            'when': datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc),
+            'day': date(2026, 1, 2),
+            'amount': Decimal('12.50'),
+            'numbers': [0, -1, 2 ** 63 - 1, 0.1, 1.5, -2.25, 123456.789, 0.001],
+            'nested': [{'a': None, 'b': True, 'c': []}, {}],
+            1: 'integer key',
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_falls_back_when_orjson_cannot_encode(self):
+        data = {'big': 2 ** 70}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indented_output_uses_stock_renderer(self):
+        data = {'a': [1, 2]}
+        media_type = 'application/json; indent=2'
+        self.assertEqual(FastJSONRenderer().render(data, media_type), JSONRenderer().render(data, media_type))
@@ -0,0 +1,76 @@
+# backend/core/tests/test_field_selection.py
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.request import Request
+from core.field_selection import FieldSelection, expandable_paths
+from core.models import User, Course, Module, Material
+from core.serializers import CourseSerializer
+
+
+def selection(query):
+    return FieldSelection.from_request(Request(APIRequestFactory().get('/', query)))
+
+
+class FieldSelectionTests(SimpleTestCase):
+    def test_no_parameters_selects_everything(self):
+        self.assertIsNone(selection({}))
+
+    def test_expandable_paths_follow_nested_serializers(self):
+        self.assertEqual(expandable_paths(CourseSerializer), {'modules', 'modules.materials'})
+
+    def test_dotted_fields_reach_into_nested_serializers(self):
+        paths = expandable_paths(CourseSerializer)
+        chosen = selection({'fields': 'id,modules.title'})
+        self.assertTrue(chosen.renders('modules', paths))
+        self.assertTrue(chosen.renders('modules.title', paths))
+        self.assertFalse(chosen.renders('name', paths))
+        self.assertFalse(chosen.renders('modules.materials', paths))
+
+    def test_expanding_a_path_expands_its_parents(self):
+        paths = expandable_paths(CourseSerializer)
+        chosen = selection({'expand': 'modules.materials'})
+        self.assertTrue(chosen.renders('modules.materials.title', paths))
+        self.assertTrue(chosen.renders('name', paths)) # ?expand= alone keeps every plain field
+
+        chosen = selection({'expand': 'modules'})
+        self.assertTrue(chosen.renders('modules', paths))
+        self.assertFalse(chosen.renders('modules.materials', paths))
+
+
+@override_settings(VERSIONED_CACHING=False, API_PAGINATE_BY_DEFAULT=False)
+class FieldSelectionRequestTests(TestCase):
+    def setUp(self):
+        admin = User.objects.create_user('admin', 'admin@example.com', 'p', role='ADMIN', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+        for name in ('Python', 'Django'):
+            course = Course.objects.create(name=name)
+            module = Module.objects.create(course=course, module_number=1, title='Basics')
+            module.materials.add(Material.objects.create(
+                title='Slides', type='PDF', content='materials/slides.pdf', uploader=admin, course=course
+            ))
+
+    def test_full_course_list_prefetches_each_level_once(self):
+        with self.assertNumQueries(4): # Courses, modules, materials, material courses
+            rows = self.client.get('/api/courses/').data
+        self.assertEqual(rows[0]['modules'][0]['materials'][0]['course_name'], rows[0]['name'])
+
+    def test_plain_fields_are_one_query(self):
+        with self.assertNumQueries(1):
+            rows = self.client.get('/api/courses/', {'fields': 'id,name'}).data
+        self.assertEqual([set(row) for row in rows], [{'id', 'name'}] * 2)
+
+    def test_unexpanded_relations_are_not_loaded(self):
+        with self.assertNumQueries(2): # Courses and modules only
+            rows = self.client.get('/api/courses/', {'expand': 'modules'}).data
+        self.assertNotIn('materials', rows[0]['modules'][0])
+
+    def test_nested_fields_prune_the_prefetch(self):
+        with self.assertNumQueries(2):
+            rows = self.client.get('/api/courses/', {'fields': 'id,modules.title'}).data
+        self.assertEqual(rows[0]['modules'], [{'title': 'Basics'}])
+
+        with self.assertNumQueries(2): # Modules and materials, without the materials' courses
+            rows = self.client.get('/api/modules/', {'fields': 'id,materials.title'}).data
+        self.assertEqual(rows[0]['materials'], [{'title': 'Slides'}])
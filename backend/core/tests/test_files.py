@@ -0,0 +1,97 @@
+# backend/core/tests/test_files.py
+
+import os
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+from core.files import parse_range_header
+from core.models import User, Material
+from .helpers import TempMediaMixin
+
+CONTENT = bytes(range(256)) * 40 # 10240 bytes
+
+
+class ParseRangeHeaderTests(SimpleTestCase):
+    def test_ranges(self):
+        cases = {
+            'bytes=0-99': [(0, 99)],
+            'bytes=100-': [(100, 999)],
+            'bytes=-100': [(900, 999)],
+            'bytes=-5000': [(0, 999)],
+            'bytes=900-5000': [(900, 999)],
+            'bytes=0-9, 5-20, 22-30': [(0, 20), (22, 30)], # Overlapping and adjacent ranges merge
+            'bytes=500-599,0-9': [(0, 9), (500, 599)],
+        }
+        for header, expected in cases.items():
+            self.assertEqual(parse_range_header(header, 1000), expected, header)
+
+    def test_unsatisfiable(self):
+        self.assertEqual(parse_range_header('bytes=1000-', 1000), [])
+        self.assertEqual(parse_range_header('bytes=-0', 1000), [])
+
+    def test_ignored(self):
+        for header in ('items=0-9', 'bytes=', 'bytes=abc', 'bytes=9-0', 'bytes=-', ','.join(['bytes=0-0'] + ['1-1'] * 16)):
+            self.assertIsNone(parse_range_header(header, 1000), header)
+
+
+class RangeResponseTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'p', role='ADMIN', is_staff=True)
+        self.material = Material(title='Video', type='VIDEO', uploader=self.admin)
+        self.material.content.save('video.mp4', ContentFile(CONTENT))
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.url = f'/api/materials/{self.material.id}/view_content/'
+
+    def body(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_full_file(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(self.body(response), CONTENT)
+
+    def test_single_range(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(CONTENT)}')
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(self.body(response), CONTENT[100:200])
+
+    def test_multiple_ranges(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9,-10')
+        self.assertEqual(response.status_code, 206)
+        self.assertTrue(response['Content-Type'].startswith('multipart/byteranges; boundary='))
+        body = self.body(response)
+        self.assertEqual(int(response['Content-Length']), len(body))
+        self.assertIn(CONTENT[:10], body)
+        self.assertIn(f'Content-Range: bytes {len(CONTENT) - 10}-{len(CONTENT) - 1}/{len(CONTENT)}'.encode(), body)
+
+    def test_unsatisfiable_range(self):
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={len(CONTENT)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(CONTENT)}')
+
+    def test_if_range(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=etag).status_code, 206)
+        stale = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"0-0"')
+        self.assertEqual(stale.status_code, 200) # Changed since: the whole file instead
+        self.assertEqual(self.body(stale), CONTENT)
+        weak = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=f'W/{etag}')
+        self.assertEqual(weak.status_code, 200)
+
+    def test_etag_changes_with_the_file(self):
+        etag = self.client.get(self.url)['ETag']
+        path = self.material.content.path
+        with open(path, 'ab') as f:
+            f.write(b'more')
+        os.utime(path, (0, 0))
+        self.assertNotEqual(self.client.get(self.url)['ETag'], etag)
+
+    @override_settings(FILE_DELIVERY_BACKEND='x-accel-redirect', FILE_DELIVERY_INTERNAL_URL='/protected-media/')
+    def test_offloaded_to_the_web_server(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9')
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.material.content.name}')
+        self.assertEqual(response.content, b'') # nginx applies the range itself
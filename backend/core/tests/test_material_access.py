@@ -0,0 +1,115 @@
+# backend/core/tests/test_material_access.py
+
+from datetime import date, timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from core.material_access import accessible_materials, can_open_material
+from core.models import User, Course, Batch, Material, Schedule, BatchMaterial, MaterialAccess
+
+
+class MaterialAccessIndexTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'p', role='ADMIN', is_staff=True)
+        self.student = User.objects.create_user('ann', 'ann@example.com', 'p', role='STUDENT')
+        self.trainer = User.objects.create_user('tom', 'tom@example.com', 'p', role='TRAINER')
+        self.course = Course.objects.create(name='Python')
+        other = Course.objects.create(name='Other')
+        self.batch = Batch.objects.create(course=other, name='Morning', start_date=date.today(), end_date=date.today())
+        self.material = Material.objects.create(title='Slides', type='PDF', content='materials/slides.pdf', uploader=self.admin)
+
+    def committed(self):
+        return self.captureOnCommitCallbacks(execute=True)
+
+    def test_direct_assignment(self):
+        self.assertFalse(can_open_material(self.student, self.material))
+        with self.committed():
+            self.student.assigned_materials.add(self.material)
+        self.assertTrue(can_open_material(self.student, self.material))
+        with self.committed():
+            self.student.assigned_materials.remove(self.material)
+        self.assertFalse(can_open_material(self.student, self.material))
+
+    def test_batch_assignment_reaches_later_students(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        with self.committed():
+            response = client.post(f'/api/batches/{self.batch.id}/assign_materials/', {'material_ids': [self.material.id]}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        with self.committed():
+            self.batch.students.add(self.student)
+        self.assertTrue(can_open_material(self.student, self.material))
+        with self.committed():
+            self.batch.students.remove(self.student)
+        self.assertFalse(can_open_material(self.student, self.material))
+
+    def test_course_materials(self):
+        with self.committed():
+            self.batch.students.add(self.student)
+            self.material.course = self.course
+            self.material.save()
+        self.assertFalse(can_open_material(self.student, self.material)) # The batch is not on that course yet
+        with self.committed():
+            self.batch.course = self.course
+            self.batch.save()
+        self.assertTrue(can_open_material(self.student, self.material))
+        self.assertEqual(list(accessible_materials(self.student)), [self.material])
+
+    def test_trainer_access_ends_with_the_schedule(self):
+        now = timezone.now()
+        with self.committed():
+            schedule = Schedule.objects.create(trainer=self.trainer, batch=self.batch, start_date=now, end_date=now + timedelta(days=1))
+            schedule.materials.add(self.material)
+        self.assertTrue(can_open_material(self.trainer, self.material))
+        with self.committed():
+            schedule.end_date = now - timedelta(days=1)
+            schedule.save()
+        self.assertFalse(can_open_material(self.trainer, self.material))
+
+    def test_rebuild_after_bulk_writes(self):
+        BatchMaterial.objects.create(batch=self.batch, material=self.material) # Outside any on_commit capture
+        User.batches.through.objects.create(user=self.student, batch=self.batch) # No m2m signal
+        MaterialAccess.objects.all().delete()
+        call_command('rebuild_material_access', stdout=StringIO())
+        self.assertTrue(can_open_material(self.student, self.material))
+
+    def test_assign_materials_rejects_bad_ids(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        for material_ids in (['abc'], 'not-a-list', [999]):
+            response = client.post(f'/api/batches/{self.batch.id}/assign_materials/', {'material_ids': material_ids}, format='json')
+            self.assertEqual(response.status_code, 400, material_ids)
+        response = client.post(f'/api/batches/{self.batch.id}/unassign_materials/', {'material_ids': [None]}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_batch_grants_do_not_fan_out_to_students(self):
+        materials = [
+            Material.objects.create(title=f'Video {i}', type='VIDEO', content=f'materials/{i}.mp4', uploader=self.admin)
+            for i in range(3)
+        ]
+        students = [User.objects.create_user(f's{i}', f's{i}@example.com', 'p', role='STUDENT') for i in range(20)]
+        with self.committed():
+            self.batch.students.add(*students)
+        self.assertEqual(MaterialAccess.objects.count(), 0) # Enrolling writes no entries
+
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        with self.committed():
+            client.post(f'/api/batches/{self.batch.id}/assign_materials/', {'material_ids': [m.id for m in materials]}, format='json')
+        self.assertEqual(MaterialAccess.objects.filter(batch=self.batch).count(), 3) # One per material, not per student
+        self.assertFalse(MaterialAccess.objects.filter(user__isnull=False).exists())
+
+        with self.assertNumQueries(1):
+            self.assertTrue(can_open_material(students[-1], materials[0]))
+
+    def test_new_batch_picks_up_course_materials(self):
+        self.material.course = self.course
+        with self.committed():
+            self.material.save()
+            batch = Batch.objects.create(course=self.course, name='Evening', start_date=date.today(), end_date=date.today())
+            batch.students.add(self.student)
+        self.assertTrue(can_open_material(self.student, self.material))
+        self.assertEqual(MaterialAccess.objects.get().batch, batch)
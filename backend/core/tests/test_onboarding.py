@@ -0,0 +1,55 @@
+# backend/core/tests/test_onboarding.py
+
+from urllib.parse import parse_qs, urlparse
+from django.contrib.auth.hashers import check_password
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from core import utils
+from core.models import User
+
+
+@override_settings(FRONTEND_URL='https://portal.example.com/')
+class SetPasswordLinkTests(TestCase):
+    def setUp(self):
+        self.student = User.objects.create_user('ann@example.com', 'ann@example.com', role='STUDENT', must_change_password=True)
+        self.student.set_unusable_password()
+        self.student.save()
+
+    def link_params(self):
+        link = urlparse(utils.build_set_password_link(self.student))
+        self.assertEqual(f'{link.scheme}://{link.netloc}{link.path}', 'https://portal.example.com/set-password')
+        params = parse_qs(link.query)
+        return {'uid': params['uid'][0], 'token': params['token'][0]}
+
+    def test_link_sets_password_once(self):
+        params = self.link_params()
+        response = APIClient().post('/api/auth/set-password/', {**params, 'password': 'a-new-password'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.student.refresh_from_db()
+        self.assertTrue(self.student.check_password('a-new-password'))
+        self.assertFalse(self.student.must_change_password)
+
+        again = APIClient().post('/api/auth/set-password/', {**params, 'password': 'another-password'}, format='json')
+        self.assertEqual(again.status_code, 400) # The token is bound to the old password hash
+
+    def test_bad_token(self):
+        params = {**self.link_params(), 'token': 'nope'}
+        response = APIClient().post('/api/auth/set-password/', {**params, 'password': 'a-new-password'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(PASSWORD_HASH_WORKERS=2, PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class HashPasswordsTests(TestCase):
+    def test_pool_is_reused_across_calls(self):
+        passwords = [f'password-{i}' for i in range(utils.PARALLEL_HASH_THRESHOLD)]
+        first = utils.hash_passwords(passwords)
+        pool = utils._hash_pool
+        second = utils.hash_passwords(passwords)
+        self.assertIsNotNone(pool)
+        self.assertIs(utils._hash_pool, pool)
+        self.assertTrue(all(check_password(p, h) for p, h in zip(passwords, first)))
+        self.assertTrue(check_password(passwords[-1], second[-1]))
+
+    def test_small_batches_hash_inline(self):
+        encoded = utils.hash_passwords(['one', 'two'])
+        self.assertTrue(check_password('two', encoded[1]))
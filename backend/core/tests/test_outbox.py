@@ -0,0 +1,99 @@
+# backend/core/tests/test_outbox.py
+
+from datetime import timedelta
+from io import StringIO
+from django.contrib import admin
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from core.models import EmailOutbox, User
+from core.utils import queue_mail, student_credentials_email
+
+
+class Crash(BaseException):
+    """Stands in for the worker being killed (not an Exception, so nothing catches it)."""
+
+
+class FlakyBackend(EmailBackend):
+    # Rejects mail to bad@..., and dies outright on mail to crash@...
+    def send_messages(self, messages):
+        for message in messages:
+            if 'crash@example.com' in message.to:
+                raise Crash()
+            if 'bad@example.com' in message.to:
+                raise OSError('Mailbox unavailable')
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', EMAIL_OUTBOX_RETENTION_DAYS=7)
+class SendQueuedEmailTests(TestCase):
+    def test_sent_body_is_blanked(self):
+        user = User(first_name='Ann', email='ann@example.com')
+        entry = student_credentials_email(user, 'temp-password')
+        entry.save()
+        call_command('send_queued_email', '--once', stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('temp-password', mail.outbox[0].body)
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, 'SENT')
+        self.assertEqual(entry.body, '')
+
+    def test_old_sent_and_failed_rows_are_purged(self):
+        old = timezone.now() - timedelta(days=8)
+        for status in ('SENT', 'FAILED', 'PENDING'):
+            entry = queue_mail('Subject', 'Body', None, ['a@example.com'])
+            EmailOutbox.objects.filter(pk=entry.pk).update(status=status, created_at=old, next_attempt_at=timezone.now() + timedelta(hours=1))
+        recent = queue_mail('Subject', 'Body', None, ['b@example.com'])
+        EmailOutbox.objects.filter(pk=recent.pk).update(status='SENT')
+
+        call_command('send_queued_email', '--once', stdout=StringIO())
+        self.assertEqual(
+            sorted(EmailOutbox.objects.values_list('status', flat=True)), ['PENDING', 'SENT'] # Pending mail is never dropped
+        )
+
+    def test_admin_hides_body(self):
+        model_admin = admin.site._registry[EmailOutbox]
+        self.assertNotIn('body', model_admin.get_fields(None))
+
+
+@override_settings(
+    EMAIL_BACKEND='core.tests.test_outbox.FlakyBackend', EMAIL_OUTBOX_MAX_ATTEMPTS=2, EMAIL_OUTBOX_RETRY_BASE_SECONDS=60
+)
+class DeliveryFailureTests(TestCase):
+    def deliver(self):
+        call_command('send_queued_email', '--once', stdout=StringIO(), stderr=StringIO())
+
+    def test_failure_backs_off_then_gives_up(self):
+        entry = queue_mail('Subject', 'Body', None, ['bad@example.com'])
+        self.deliver()
+        entry.refresh_from_db()
+        self.assertEqual((entry.status, entry.attempts), ('PENDING', 1))
+        self.assertIn('Mailbox unavailable', entry.last_error)
+        self.assertGreater(entry.next_attempt_at, timezone.now() + timedelta(seconds=50))
+
+        EmailOutbox.objects.filter(pk=entry.pk).update(next_attempt_at=timezone.now())
+        self.deliver()
+        entry.refresh_from_db()
+        self.assertEqual((entry.status, entry.attempts), ('FAILED', 2))
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_crash_mid_batch_only_retries_unrecorded_messages(self):
+        first = queue_mail('Subject', 'Body', None, ['a@example.com'])
+        crash = queue_mail('Subject', 'Body', None, ['crash@example.com'])
+        last = queue_mail('Subject', 'Body', None, ['c@example.com'])
+        with self.assertRaises(Crash):
+            self.deliver()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(EmailOutbox.objects.get(pk=first.pk).status, 'SENT')
+        self.assertEqual(set(EmailOutbox.objects.filter(pk__in=[crash.pk, last.pk]).values_list('status', flat=True)), {'SENDING'})
+
+        self.deliver() # Still leased to the dead worker
+        self.assertEqual(len(mail.outbox), 1)
+
+        EmailOutbox.objects.filter(pk=crash.pk).update(to=['b@example.com'])
+        EmailOutbox.objects.filter(status='SENDING').update(next_attempt_at=timezone.now()) # Lease expired
+        self.deliver()
+        self.assertEqual([m.to for m in mail.outbox], [['a@example.com'], ['b@example.com'], ['c@example.com']])
@@ -0,0 +1,84 @@
+# backend/core/tests/test_pagination.py
+
+import base64
+import json
+from datetime import datetime, timezone as dt_timezone
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from core.models import User, Assessment, StudentAttempt, Task
+
+
+def cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+@override_settings(API_PAGINATE_BY_DEFAULT=False)
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        admin = User.objects.create_user('admin', 'admin@example.com', 'p', role='ADMIN', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+        self.student = User.objects.create_user('ann', 'ann@example.com', 'p', role='STUDENT')
+        self.assessment = Assessment.objects.create(title='Quiz', course='Python', type='TEST')
+
+    def make_attempts(self, count):
+        attempts = [StudentAttempt.objects.create(student=self.student, assessment=self.assessment, score=i) for i in range(count)]
+        return [a.id for a in attempts]
+
+    def walk(self, url):
+        ids, pages = [], 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [row['id'] for row in response.data['results']]
+            url = response.data['next']
+            pages += 1
+        return ids, pages
+
+    def test_walks_every_row_once_via_next(self):
+        ids = self.make_attempts(7)
+        seen, pages = self.walk('/api/attempts/?page_size=3')
+        self.assertEqual(pages, 3)
+        self.assertEqual(seen, list(reversed(ids))) # Newest first
+
+    def test_ties_on_timestamp_break_on_id(self):
+        ids = self.make_attempts(5)
+        StudentAttempt.objects.update(timestamp=datetime(2025, 1, 1, tzinfo=dt_timezone.utc))
+        seen, _ = self.walk('/api/attempts/?page_size=2')
+        self.assertEqual(seen, ids)
+
+    def test_ties_on_updated_at_break_on_id(self):
+        employee = User.objects.create_user('eve', 'eve@example.com', 'p', role='EMPLOYEE')
+        ids = [Task.objects.create(employee=employee, title=f'Task {i}').id for i in range(5)]
+        Task.objects.update(updated_at=datetime(2025, 1, 1, tzinfo=dt_timezone.utc))
+        seen, _ = self.walk('/api/tasks/?page_size=2')
+        self.assertEqual(seen, ids)
+
+    def test_unpaginated_without_cursor_or_page_size(self):
+        self.make_attempts(3)
+        response = self.client.get('/api/attempts/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 3)
+
+    @override_settings(API_PAGINATE_BY_DEFAULT=True)
+    def test_paginated_by_default_when_enabled(self):
+        self.make_attempts(3)
+        response = self.client.get('/api/attempts/')
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertIsNone(response.data['next'])
+
+    def test_malformed_cursor_is_404(self):
+        self.make_attempts(2)
+        for url, value in [
+            ('/api/attempts/', ['abc', 1]),
+            ('/api/attempts/', ['2025-01-01T00:00:00Z', 'x']),
+            ('/api/attempts/', [{'a': 1}, 1]),
+            ('/api/attempts/', [None, 1]),
+            ('/api/attempts/', ['2025-01-01T00:00:00Z', 10 ** 30]),
+            ('/api/attempts/', ['2025-01-01T00:00:00Z']),
+            ('/api/users/', ['x']),
+        ]:
+            with self.subTest(url=url, cursor=value):
+                self.assertEqual(self.client.get(url, {'cursor': cursor(value)}).status_code, 404)
+        self.assertEqual(self.client.get('/api/attempts/', {'cursor': '!!not-base64'}).status_code, 404)
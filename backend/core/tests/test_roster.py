@@ -0,0 +1,113 @@
+# backend/core/tests/test_roster.py
+
+from datetime import date, timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from core.models import User, Course, Batch, EmailOutbox, ImportJob
+from core.roster import import_roster_file, run_import_job
+from .helpers import TempMediaMixin, roster_csv
+
+
+@override_settings(STUDENT_ONBOARDING_MODE='PASSWORD', PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class RosterImportTests(TestCase):
+    def setUp(self):
+        course = Course.objects.create(name='Course')
+        self.batch = Batch.objects.create(course=course, name='Batch', start_date=date.today(), end_date=date.today())
+
+    def test_import_creates_and_enrolls_students(self):
+        User.objects.create_user('old@example.com', 'old@example.com', 'p', role='STUDENT')
+        User.objects.create_user('trainer@example.com', 'trainer@example.com', 'p', role='TRAINER')
+        summary = import_roster_file(self.batch, roster_csv([
+            ('Ann Lee', 'ann@example.com'), ('Old Student', 'OLD@example.com'),
+            ('A Trainer', 'trainer@example.com'), ('', 'blank@example.com'),
+        ]))
+        self.assertEqual(summary['newly_created'], 1)
+        self.assertEqual(summary['added_to_batch'], 2)
+        self.assertEqual(summary['skipped'], 2)
+        self.assertEqual(summary['checkpoint'], 4)
+        self.assertEqual(
+            set(self.batch.students.values_list('username', flat=True)), {'ann@example.com', 'old@example.com'}
+        )
+        self.assertEqual(EmailOutbox.objects.count(), 1) # Credentials for the new student only
+
+    def test_checkpoints_per_chunk_and_resume(self):
+        rows = [(f'Student {i}', f's{i}@example.com') for i in range(5)]
+        checkpoints = []
+        import_roster_file(
+            self.batch, roster_csv(rows[:3]), chunk_size=2,
+            on_checkpoint=lambda summary: checkpoints.append(summary['checkpoint'])
+        )
+        self.assertEqual(checkpoints, [2, 3])
+
+        summary = import_roster_file(self.batch, roster_csv(rows), start_row=3, chunk_size=2)
+        self.assertEqual(summary['newly_created'], 2) # Rows before the checkpoint are skipped
+        self.assertEqual(self.batch.students.count(), 5)
+
+    def test_reimport_is_idempotent(self):
+        rows = [('Ann Lee', 'ann@example.com')]
+        import_roster_file(self.batch, roster_csv(rows))
+        summary = import_roster_file(self.batch, roster_csv(rows))
+        self.assertEqual(summary['newly_created'], 0)
+        self.assertEqual(self.batch.students.count(), 1)
+
+
+@override_settings(ROSTER_IMPORT_IN_BACKGROUND=False)
+class AddStudentsFromFileTests(TestCase):
+    def setUp(self):
+        admin = User.objects.create_user('admin', 'admin@example.com', 'p', role='ADMIN', is_staff=True)
+        course = Course.objects.create(name='Course')
+        self.batch = Batch.objects.create(course=course, name='Batch', start_date=date.today(), end_date=date.today())
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+        self.url = f'/api/batches/{self.batch.id}/add_students_from_file/'
+
+    def test_rejects_bad_resume_from(self):
+        for value in ('-1', 'abc'):
+            response = self.client.post(self.url, {'file': roster_csv([('Ann Lee', 'ann@example.com')]), 'resume_from': value})
+            self.assertEqual(response.status_code, 400, value)
+        self.assertEqual(self.batch.students.count(), 0)
+
+    def test_resume_from_skips_imported_rows(self):
+        rows = [('Ann Lee', 'ann@example.com'), ('Bob Ray', 'bob@example.com')]
+        response = self.client.post(self.url, {'file': roster_csv(rows), 'resume_from': '1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(self.batch.students.values_list('username', flat=True)), ['bob@example.com'])
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ImportJobTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        course = Course.objects.create(name='Course')
+        self.batch = Batch.objects.create(course=course, name='Batch', start_date=date.today(), end_date=date.today())
+
+    def test_job_completes_and_drops_its_file(self):
+        job = ImportJob.objects.create(batch=self.batch, file=roster_csv([('Ann Lee', 'ann@example.com')]), status='RUNNING')
+        run_import_job(job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'COMPLETED')
+        self.assertEqual(job.newly_created, 1)
+        self.assertFalse(job.file)
+
+    def test_missing_file_fails_the_job(self):
+        job = ImportJob.objects.create(batch=self.batch, file=roster_csv([('Ann Lee', 'ann@example.com')]), status='RUNNING')
+        job.file.storage.delete(job.file.name)
+        with self.assertLogs('core.roster', 'ERROR'):
+            run_import_job(job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'FAILED')
+        self.assertTrue(job.error_message)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_worker_requeues_stale_jobs_and_keeps_going(self):
+        stale = ImportJob.objects.create(batch=self.batch, file=roster_csv([('Ann Lee', 'ann@example.com')]), status='RUNNING')
+        ImportJob.objects.filter(pk=stale.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        broken = ImportJob.objects.create(batch=self.batch, file=roster_csv([('Bob Ray', 'bob@example.com')]))
+        broken.file.storage.delete(broken.file.name)
+
+        with self.assertLogs('core.roster', 'ERROR'):
+            call_command('process_import_jobs', '--once', stdout=StringIO())
+        self.assertEqual(ImportJob.objects.get(pk=stale.pk).status, 'COMPLETED')
+        self.assertEqual(ImportJob.objects.get(pk=broken.pk).status, 'FAILED')
@@ -0,0 +1,68 @@
+# backend/core/tests/test_signed_urls.py
+
+import time
+from unittest import mock
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from core.files import verify_signed_file
+from core.models import User, Material
+from .helpers import TempMediaMixin
+
+
+@override_settings(SIGNED_FILE_URL_LIFETIME=3600)
+class SignedFileUrlTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        admin = User.objects.create_user('admin', 'admin@example.com', 'p', role='ADMIN', is_staff=True)
+        self.student = User.objects.create_user('ann', 'ann@example.com', 'p', role='STUDENT')
+        self.assigned = self.material('assigned.pdf', admin)
+        self.other = self.material('other.pdf', admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.assigned_materials.add(self.assigned)
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def material(self, filename, uploader):
+        material = Material(title=filename, type='PDF', uploader=uploader)
+        material.content.save(filename, ContentFile(filename.encode() * 10))
+        return material
+
+    def signed_urls(self):
+        return {item['title']: item['content_signed_url'] for item in self.client.get('/api/materials/').data}
+
+    def parts(self, url):
+        expires, signature, name = url.split('/api/files/')[1].split('/', 2)
+        return int(expires), signature, name
+
+    def test_only_openable_materials_are_signed(self):
+        urls = self.signed_urls()
+        self.assertTrue(urls['assigned.pdf'])
+        self.assertIsNone(urls['other.pdf'])
+
+    def test_signed_url_serves_without_authentication_or_queries(self):
+        url = self.signed_urls()['assigned.pdf']
+        anonymous = APIClient()
+        with self.assertNumQueries(0):
+            response = anonymous.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'assigned.pdf' * 10)
+        self.assertTrue(response['Cache-Control'].startswith('public, max-age='))
+        self.assertEqual(anonymous.get(url, HTTP_RANGE='bytes=0-7').status_code, 206)
+
+    def test_expiry_is_bucketed(self):
+        url = self.signed_urls()['assigned.pdf']
+        expires, _, _ = self.parts(url)
+        self.assertEqual(expires % 3600, 0)
+        self.assertTrue(3600 <= expires - time.time() <= 7200)
+        self.assertEqual(self.signed_urls()['assigned.pdf'], url) # Same URL throughout the period
+
+    def test_tampered_and_expired_urls_are_refused(self):
+        url = self.signed_urls()['assigned.pdf']
+        expires, signature, name = self.parts(url)
+        self.assertTrue(verify_signed_file(expires, signature, name))
+        anonymous = APIClient()
+        self.assertEqual(anonymous.get(url.replace('assigned', 'other')).status_code, 403)
+        self.assertEqual(anonymous.get(url.replace(f'/{expires}/', f'/{expires + 3600}/')).status_code, 403)
+        self.assertEqual(anonymous.get(url.replace(signature, '0' * len(signature))).status_code, 403)
+        with mock.patch('core.files.time.time', return_value=expires + 1):
+            self.assertFalse(verify_signed_file(expires, signature, name))
@@ -0,0 +1,148 @@
+# backend/core/tests/test_uploads.py
+
+import fcntl
+import hashlib
+import os
+from unittest import mock
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from core import uploads
+from core.models import User, Material, MaterialUpload
+from .helpers import TempMediaMixin
+
+CHUNK = uploads.MIN_CHUNK_SIZE
+
+
+class MaterialUploadTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        self.trainer = User.objects.create_user('tom', 'tom@example.com', 'p', role='TRAINER')
+        self.client = APIClient()
+        self.client.force_authenticate(self.trainer)
+        self.data = os.urandom(CHUNK * 2 + 100)
+        response = self.client.post('/api/material-uploads/', {
+            'filename': 'lecture.mp4', 'size': len(self.data), 'chunk_size': CHUNK,
+            'title': 'Lecture', 'course': None, 'type': 'VIDEO',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.upload = MaterialUpload.objects.get(pk=response.data['id'])
+        self.url = f'/api/material-uploads/{self.upload.pk}/'
+
+    def chunk(self, index):
+        return self.data[index * CHUNK:(index + 1) * CHUNK]
+
+    def put(self, index, body=None, sha256=None):
+        body = self.chunk(index) if body is None else body
+        return self.client.put(
+            f'{self.url}chunks/{index}/', body, content_type='application/octet-stream',
+            HTTP_X_CHUNK_SHA256=sha256 or hashlib.sha256(body).hexdigest(),
+        )
+
+    def finalize(self, **data):
+        return self.client.post(f'{self.url}finalize/', data, format='json')
+
+    def received(self):
+        return self.client.get(self.url).data['received_chunks']
+
+    def test_out_of_order_upload_and_finalize(self):
+        for index in (2, 0, 1):
+            self.assertEqual(self.put(index).status_code, 200)
+        self.assertEqual(self.received(), [0, 1, 2])
+
+        response = self.finalize(sha256=hashlib.sha256(self.data).hexdigest())
+        self.assertEqual(response.status_code, 201)
+        material = Material.objects.get(pk=response.data['id'])
+        self.assertEqual(material.uploader, self.trainer)
+        with material.content.open('rb') as f:
+            self.assertEqual(f.read(), self.data)
+        self.assertFalse(os.path.exists(uploads.partial_path(self.upload)))
+
+        self.assertEqual(self.finalize().data['id'], material.id) # Retried finalize
+        self.assertEqual(self.put(0).status_code, 409)
+
+    def test_failed_retry_withdraws_the_chunk(self):
+        self.assertEqual(self.put(0).status_code, 200)
+        bad = b'B' * 1000
+        self.assertEqual(self.put(0, body=bad).status_code, 400) # Short body, written before it was checked
+        self.assertEqual(self.received(), [])
+        self.assertEqual(self.put(0, sha256='0' * 64).status_code, 400)
+        self.assertEqual(self.received(), [])
+
+        self.put(1), self.put(2)
+        self.assertEqual(self.finalize().data['missing_chunks'], [0])
+        self.put(0)
+        self.assertEqual(self.finalize().status_code, 201)
+
+    def test_finalize_rechecks_chunk_hashes(self):
+        for index in range(3):
+            self.put(index)
+        with open(uploads.partial_path(self.upload), 'r+b') as f: # Damaged on disk after it was received
+            f.seek(CHUNK + 5)
+            f.write(b'!')
+
+        response = self.finalize()
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['missing_chunks'], [1])
+        self.upload.refresh_from_db()
+        self.assertEqual(self.upload.status, 'OPEN')
+        self.put(1)
+        self.assertEqual(self.finalize().status_code, 201)
+
+    def test_whole_file_checksum(self):
+        for index in range(3):
+            self.put(index)
+        self.assertEqual(self.finalize(sha256='0' * 64).status_code, 400)
+        self.upload.refresh_from_db()
+        self.assertEqual(self.upload.status, 'OPEN')
+
+    def test_chunks_are_refused_while_finalizing(self):
+        MaterialUpload.objects.filter(pk=self.upload.pk).update(status='FINALIZING')
+        self.assertEqual(self.put(0).status_code, 409)
+        self.assertEqual(self.finalize().status_code, 409)
+        self.assertEqual(self.client.delete(self.url).status_code, 400)
+
+    def test_failed_material_creation_keeps_the_session(self):
+        for index in range(3):
+            self.put(index)
+        with mock.patch.object(Material.objects, 'create', side_effect=RuntimeError('database down')):
+            with self.assertRaises(RuntimeError):
+                self.finalize()
+        self.upload.refresh_from_db()
+        self.assertEqual(self.upload.status, 'OPEN')
+        self.assertTrue(os.path.exists(uploads.partial_path(self.upload)))
+        self.assertFalse(os.listdir(os.path.join(self._media_root, 'materials')))
+        self.assertEqual(self.finalize().status_code, 201)
+
+    def test_finalize_lock_excludes_chunk_writers(self):
+        with uploads.chunk_writer(self.upload):
+            fd = os.open(uploads.partial_path(self.upload), os.O_RDONLY)
+            try:
+                with self.assertRaises(BlockingIOError):
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            finally:
+                os.close(fd)
+        with uploads.exclusive(self.upload):
+            pass # Free again once the writer is done
+
+    def test_abandon(self):
+        self.put(0)
+        self.assertEqual(self.client.delete(self.url).status_code, 204)
+        self.assertFalse(MaterialUpload.objects.filter(pk=self.upload.pk).exists())
+        self.assertFalse(os.path.exists(uploads.partial_path(self.upload)))
+
+    @override_settings(MATERIAL_UPLOAD_MAX_SIZE=1024 ** 2)
+    def test_size_is_capped(self):
+        response = self.client.post('/api/material-uploads/', {
+            'filename': 'huge.mp4', 'size': 1024 ** 2 + 1, 'title': 'Huge', 'course': None, 'type': 'VIDEO',
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('size', response.data)
+        self.assertEqual(MaterialUpload.objects.count(), 1)
+
+    def test_students_cannot_upload(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('ann', 'ann@example.com', 'p', role='STUDENT'))
+        response = client.post('/api/material-uploads/', {
+            'filename': 'x.pdf', 'size': 10, 'title': 'X', 'course': None, 'type': 'PDF',
+        }, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(client.get(self.url).status_code, 404) # Sessions are private to their uploader
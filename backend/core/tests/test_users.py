@@ -0,0 +1,59 @@
+# backend/core/tests/test_users.py
+
+from datetime import date
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from core.models import User, Course, Batch, Material, Assessment, EducationEntry, WorkExperienceEntry, Certification
+
+
+@override_settings(API_PAGINATE_BY_DEFAULT=False)
+class UserListQueryTests(TestCase):
+    # The users, then one prefetch per profile relation: batches, assigned
+    # materials and assessments, education, work experience and certifications
+    LIST_QUERIES = 7
+
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'p', role='ADMIN', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        course = Course.objects.create(name='Python')
+        self.batch = Batch.objects.create(course=course, name='Morning', start_date=date.today(), end_date=date.today())
+        self.material = Material.objects.create(title='Slides', type='PDF', content='materials/slides.pdf', uploader=self.admin)
+        self.assessment = Assessment.objects.create(title='Quiz', course='Python', type='TEST')
+
+    def add_users(self, count):
+        start = User.objects.filter(role='STUDENT').count()
+        for i in range(start, start + count):
+            student = User.objects.create_user(f'student{i}', f'student{i}@example.com', 'p', role='STUDENT')
+            student.batches.add(self.batch)
+            student.assigned_materials.add(self.material)
+            student.assigned_assessments.add(self.assessment)
+
+            employee = User.objects.create_user(f'employee{i}', f'employee{i}@example.com', 'p', role='EMPLOYEE')
+            entry = {'employee': employee, 'title': 'Entry', 'institute': 'Somewhere', 'start_date': date(2020, 1, 1)}
+            EducationEntry.objects.create(**entry)
+            WorkExperienceEntry.objects.create(**entry)
+            Certification.objects.create(**entry)
+
+    def test_list_query_count_does_not_grow_with_users(self):
+        self.add_users(2)
+        with self.assertNumQueries(self.LIST_QUERIES):
+            self.assertEqual(len(self.client.get('/api/users/').data), 5)
+
+        self.add_users(10)
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = self.client.get('/api/users/')
+        self.assertEqual(len(response.data), 25)
+        student = next(row for row in response.data if row['username'] == 'student0')
+        self.assertEqual(len(student['batches']), 1)
+
+    def test_role_filter_skips_other_roles_relations(self):
+        self.add_users(3)
+        with self.assertNumQueries(4): # Users plus the three student relations
+            self.assertEqual(len(self.client.get('/api/users/', {'role': 'STUDENT'}).data), 3)
+
+    def test_slim_list_is_one_query(self):
+        self.add_users(3)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/users/', {'slim': '1'})
+        self.assertEqual(len(response.data), 7)
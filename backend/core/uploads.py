@@ -0,0 +1,167 @@
+# backend/core/uploads.py
+
+"""
+Resumable chunked uploads of large material files.
+
+    POST   /api/material-uploads/                    start: filename, size, title, course, type, ...
+    PUT    /api/material-uploads/<id>/chunks/<n>/    raw chunk body, X-Chunk-SHA256: <hex digest>
+    GET    /api/material-uploads/<id>/               which chunks have arrived (to resume)
+    POST   /api/material-uploads/<id>/finalize/      move the file into materials/, create the Material
+    DELETE /api/material-uploads/<id>/               abandon
+
+Starting a session preallocates a file of the final size under
+MEDIA_ROOT/upload_sessions/. Each chunk is streamed from the request straight
+to its offset with pwrite(), hashed on the way, so chunks can arrive in any
+order, in parallel, and be retried; memory per request stays at one
+UPLOAD_READ_SIZE block. A chunk only counts as received once it has been
+written and checked, and finalize re-hashes every chunk against its recorded
+SHA-256 before renaming the file into place (same filesystem, no copy).
+
+Chunk writers hold a shared flock() on the partial file and finalize an
+exclusive one, so finalize waits for writes already in flight, and writers that
+get the lock after it see the session is no longer OPEN. Needs a storage with
+local paths, as FileSystemStorage, on a POSIX system.
+"""
+
+import fcntl
+import hashlib
+import os
+from contextlib import contextmanager
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+UPLOAD_READ_SIZE = 1024 * 1024
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+MIN_CHUNK_SIZE = 256 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+class UploadError(Exception):
+    """A chunk or finalize request that cannot be applied; the message is for the client."""
+    def __init__(self, message, chunks=None):
+        super().__init__(message)
+        self.chunks = chunks or [] # Indexes the client must send (again)
+
+
+def partial_path(upload):
+    return os.path.join(settings.MEDIA_ROOT, 'upload_sessions', f'{upload.id}.part')
+
+
+def preallocate(upload):
+    path = partial_path(upload)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.truncate(upload.size) # Sparse where the filesystem allows; chunks fill it in
+    return path
+
+
+@contextmanager
+def _locked(upload, flags, operation):
+    fd = os.open(partial_path(upload), flags)
+    try:
+        fcntl.flock(fd, operation)
+        yield fd
+    finally:
+        os.close(fd) # Also releases the lock
+
+
+def chunk_writer(upload):
+    """The partial file, open for write_chunk(), shared-locked against finalize."""
+    return _locked(upload, os.O_WRONLY, fcntl.LOCK_SH)
+
+
+def exclusive(upload):
+    """Waits for chunk writes in flight, then keeps new ones out until released."""
+    return _locked(upload, os.O_RDONLY, fcntl.LOCK_EX)
+
+
+def write_chunk(upload, fd, index, stream, expected_sha256):
+    """
+    Stream one chunk from ``stream`` to its place in the partial file ``fd``
+    and return its SHA-256. Raises UploadError on a bad index, a short or long
+    body, or a checksum mismatch (the client should simply resend the chunk).
+    """
+    if not 0 <= index < upload.chunk_count:
+        raise UploadError(f'Chunk index must be between 0 and {upload.chunk_count - 1}.')
+    expected_length = upload.chunk_length(index)
+    offset = index * upload.chunk_size
+    digest = hashlib.sha256()
+    written = 0
+
+    while True:
+        block = stream.read(min(UPLOAD_READ_SIZE, expected_length - written + 1))
+        if not block:
+            break
+        if written + len(block) > expected_length:
+            raise UploadError(f'Chunk {index} must be exactly {expected_length} bytes.')
+        view = memoryview(block)
+        while view: # pwrite may write less than asked
+            count = os.pwrite(fd, view, offset + written)
+            view = view[count:]
+            written += count
+        digest.update(block)
+
+    if written != expected_length:
+        raise UploadError(f'Chunk {index} must be exactly {expected_length} bytes, got {written}.')
+    if expected_sha256 and digest.hexdigest() != expected_sha256.strip().lower():
+        raise UploadError(f'Checksum mismatch for chunk {index}; send it again.')
+    return digest.hexdigest()
+
+
+def verify(upload, chunk_hashes):
+    """
+    Re-hash the partial file chunk by chunk in one pass. Returns the indexes
+    whose bytes do not match ``chunk_hashes`` ({index: sha256}, as recorded when
+    each chunk was received) and the SHA-256 of the whole file.
+    """
+    whole = hashlib.sha256()
+    mismatched = []
+    with open(partial_path(upload), 'rb') as f:
+        for index in range(upload.chunk_count):
+            digest = hashlib.sha256()
+            remaining = upload.chunk_length(index)
+            while remaining:
+                block = f.read(min(UPLOAD_READ_SIZE, remaining))
+                if not block:
+                    break
+                digest.update(block)
+                whole.update(block)
+                remaining -= len(block)
+            if digest.hexdigest() != chunk_hashes.get(index):
+                mismatched.append(index)
+    return mismatched, whole.hexdigest()
+
+
+def move_into_storage(upload, upload_to='materials/'):
+    """Rename the finished file to a free name under ``upload_to``; returns the storage name."""
+    while True:
+        name = default_storage.get_available_name(default_storage.generate_filename(upload_to + upload.filename))
+        target = default_storage.path(name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            # Claim the name first, so a concurrent finalize cannot pick it too
+            os.close(os.open(target, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+        except FileExistsError:
+            continue
+        os.replace(partial_path(upload), target)
+        return name
+
+
+def restore(upload, name):
+    """Undo move_into_storage() when the material could not be created."""
+    os.replace(default_storage.path(name), partial_path(upload))
+
+
+def supports_local_files():
+    try:
+        default_storage.path('')
+    except NotImplementedError:
+        return False
+    return True
+
+
+def discard(upload):
+    try:
+        os.remove(partial_path(upload))
+    except FileNotFoundError:
+        pass
@@ -7,13 +7,14 @@ from .views import (
     TrainerApplicationViewSet, BillViewSet, AssessmentViewSet, StudentAttemptViewSet, ReportingDashboardView,
     CourseViewSet, BatchViewSet, SetPasswordView, ModuleViewSet,
     EmployeeApplicationViewSet, TaskViewSet, EmployeeDocumentViewSet, EducationEntryViewSet, 
-    WorkExperienceEntryViewSet, CertificationViewSet
+    WorkExperienceEntryViewSet, CertificationViewSet, SignedFileView, MaterialUploadViewSet
 )
 
 router = DefaultRouter()
 router.register(r'users', UserViewSet, basename='user')
 router.register(r'colleges', CollegeViewSet, basename='college')
 router.register(r'materials', MaterialViewSet, basename='material')
+router.register(r'material-uploads', MaterialUploadViewSet, basename='material-upload')
 router.register(r'schedules', ScheduleViewSet, basename='schedule')
 router.register(r'trainer-applications', TrainerApplicationViewSet, basename='trainer-application') # Renamed for clarity
 router.register(r'employee-applications', EmployeeApplicationViewSet, basename='employee-application') # <-- Added
@@ -33,4 +34,5 @@ urlpatterns = [
     path('', include(router.urls)),
     path('reporting/', ReportingDashboardView.as_view(), name='reporting-dashboard'),
     path('auth/set-password/', SetPasswordView.as_view(), name='set-password'),
+    path('files/<int:expires>/<str:signature>/<path:name>', SignedFileView.as_view(), name='signed-file'),
 ]
\ No newline at end of file
@@ -1,10 +1,33 @@
 # backend/core/utils.py
 
-from django.core.mail import send_mail
+import atexit
+import os
+import threading
 from django.conf import settings # <-- Import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.tokens import default_token_generator
+from django.urls import NoReverseMatch, reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from .models import EmailOutbox
+
+# --- Transactional email outbox ---
+# Mail is written to EmailOutbox in the caller's transaction (so a rolled-back
+# import sends nothing) and delivered by `manage.py send_queued_email`, which
+# reuses one SMTP connection per batch.
+def outbox_email(subject, message, from_email, recipient_list):
+    """Build an unsaved EmailOutbox row; use bulk_create for many at once."""
+    return EmailOutbox(subject=subject, body=message, from_email=from_email or '', to=list(recipient_list))
+
+def queue_mail(subject, message, from_email, recipient_list):
+    """Drop-in replacement for send_mail() that queues instead of sending."""
+    email = outbox_email(subject, message, from_email, recipient_list)
+    email.save()
+    return email
+
 
 # Existing function for students
-def send_student_credentials(user, password):
+def student_credentials_email(user, password):
     subject = 'Your Parc Platform Account Credentials'
     message = (
         f'Hi {user.first_name},\n\n'
@@ -16,17 +39,15 @@ def send_student_credentials(user, password):
         'Best regards,\nThe Parc Platform Team'
     )
     from_email = settings.EMAIL_HOST_USER # Use configured sender
-    recipient_list = [user.email]
+    return outbox_email(subject, message, from_email, [user.email])
 
-    try:
-        send_mail(subject, message, from_email, recipient_list, fail_silently=False)
-        print(f"--- SENT CREDENTIALS TO NEW STUDENT: {user.email} ---")
-    except Exception as e:
-        print(f"--- FAILED TO SEND CREDENTIALS TO STUDENT {user.email}: {e} ---")
+def send_student_credentials(user, password):
+    student_credentials_email(user, password).save()
+    print(f"--- QUEUED CREDENTIALS FOR NEW STUDENT: {user.email} ---")
 
 
 # --- NEW function for employees ---
-def send_employee_credentials(user, password):
+def employee_credentials_email(user, password):
     subject = 'Your Parc Platform Employee Account Credentials'
     message = (
         f'Hi {user.first_name},\n\n'
@@ -38,11 +59,114 @@ def send_employee_credentials(user, password):
         'Best regards,\nThe Parc Platform Team'
     )
     from_email = settings.EMAIL_HOST_USER # Use configured sender
-    recipient_list = [user.email]
+    return outbox_email(subject, message, from_email, [user.email])
+
+def send_employee_credentials(user, password):
+    employee_credentials_email(user, password).save()
+    print(f"--- QUEUED CREDENTIALS FOR NEW EMPLOYEE: {user.email} ---")
+# --- END NEW function ---
+
+
+# --- Student onboarding without a temporary password ---
+def build_set_password_link(user):
+    # Signed with SECRET_KEY and the user's current password hash, so the link
+    # stops working once used and expires after settings.PASSWORD_RESET_TIMEOUT
+    uid = urlsafe_base64_encode(force_bytes(user.pk))
+    token = default_token_generator.make_token(user)
+    return f"{settings.FRONTEND_URL.rstrip('/')}/set-password?uid={uid}&token={token}"
+
+
+def student_onboarding_email(user):
+    subject = 'Set Up Your Parc Platform Account'
+    valid_days = max(settings.PASSWORD_RESET_TIMEOUT // 86400, 1)
+    message = (
+        f'Hi {user.first_name},\n\n'
+        'An account has been created for you on the Parc Platform. Please use the link below to choose your password. '
+        f'The link can be used once and expires in {valid_days} day(s).\n\n'
+        f'Username: {user.email}\n'
+        f'Set your password: {build_set_password_link(user)}\n\n'
+        'Best regards,\nThe Parc Platform Team'
+    )
+    from_email = settings.EMAIL_HOST_USER
+    return outbox_email(subject, message, from_email, [user.email])
+
+def send_student_onboarding_link(user):
+    student_onboarding_email(user).save()
+    print(f"--- QUEUED ONBOARDING LINK FOR NEW STUDENT: {user.email} ---")
+
+
+# --- Per-request URL templates ---
+_PK_PLACEHOLDER = '__pk__'
+
+def detail_url(request, viewname, pk):
+    """
+    Absolute URL of a detail route such as 'employee-document-view-document'.
+    Equivalent to request.build_absolute_uri(reverse(viewname, kwargs={'pk': pk})),
+    but the route is reversed once per request and only formatted per object.
+    """
+    templates = getattr(request, '_detail_url_templates', None)
+    if templates is None:
+        templates = request._detail_url_templates = {}
+
+    if viewname not in templates:
+        try:
+            url = request.build_absolute_uri(reverse(viewname, kwargs={'pk': _PK_PLACEHOLDER}))
+            prefix, _, suffix = url.partition(_PK_PLACEHOLDER)
+            templates[viewname] = (prefix, suffix)
+        except NoReverseMatch:
+            templates[viewname] = None # The route rejects the placeholder; reverse per object below
+
+    template = templates[viewname]
+    if template is None:
+        return request.build_absolute_uri(reverse(viewname, kwargs={'pk': pk}))
+    return f'{template[0]}{pk}{template[1]}'
+
+
+# --- Temporary password hashing ---
+PARALLEL_HASH_THRESHOLD = 32 # Below this, handing work to the pool costs more than it saves
+
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+
+def _init_hash_worker():
+    # Spawned (non-forked) workers start without configured settings
+    import django
+    django.setup()
+
+def _get_hash_pool(workers):
+    # One pool per process, started on first use and reused by every import,
+    # so workers (and their django.setup()) are not paid for on each chunk
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            from concurrent.futures import ProcessPoolExecutor # Pulls in multiprocessing; only needed here
+            _hash_pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_hash_worker)
+            atexit.register(_hash_pool.shutdown)
+        return _hash_pool
+
+def _discard_hash_pool(pool):
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is pool:
+            _hash_pool = None
+    pool.shutdown(wait=False)
+
+def hash_passwords(passwords):
+    """
+    Hash many temporary passwords at once. Each hash is a full PBKDF2 run, so
+    large batches are spread over a process pool sized by
+    settings.PASSWORD_HASH_WORKERS (default: one per CPU).
+    """
+    passwords = list(passwords)
+    workers = settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+    if len(passwords) < PARALLEL_HASH_THRESHOLD or workers < 2:
+        return [make_password(password) for password in passwords]
 
+    from concurrent.futures.process import BrokenProcessPool
+    pool = _get_hash_pool(workers)
+    chunksize = max(len(passwords) // (workers * 4), 1)
     try:
-        send_mail(subject, message, from_email, recipient_list, fail_silently=False)
-        print(f"--- SENT CREDENTIALS TO NEW EMPLOYEE: {user.email} ---")
-    except Exception as e:
-        print(f"--- FAILED TO SEND CREDENTIALS TO EMPLOYEE {user.email}: {e} ---")
-# --- END NEW function ---
\ No newline at end of file
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+    except BrokenProcessPool:
+        _discard_hash_pool(pool) # A worker died (e.g. killed for memory); start afresh next time
+        return [make_password(password) for password in passwords]
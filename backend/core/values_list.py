@@ -0,0 +1,46 @@
+# backend/core/values_list.py
+
+"""
+Read-only fast path for hot list endpoints.
+
+``list()`` fetches plain dicts with ``QuerySet.values()`` and shapes each one with
+the view's ``values_row``. This skips model instantiation, related-object
+caching and the per-field serializer machinery. Rows must come out identical to
+what the view's serializer renders. Retrieve and every write still go through
+the serializer.
+"""
+
+from rest_framework import serializers
+from rest_framework.response import Response
+
+_datetime_field = serializers.DateTimeField()
+_date_field = serializers.DateField()
+
+
+def format_datetime(value):
+    """The string DateTimeField renders: current timezone, ISO 8601, 'Z' for UTC."""
+    return None if value is None else _datetime_field.to_representation(value)
+
+
+def format_date(value):
+    return None if value is None else _date_field.to_representation(value)
+
+
+def full_name(first_name, last_name):
+    # Same as AbstractUser.get_full_name()
+    return f'{first_name} {last_name}'.strip()
+
+
+class ValuesListMixin:
+    values_fields = () # ORM lookups fetched for each row
+
+    def values_row(self, row):
+        return row
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset()).values(*self.values_fields)
+        page = self.paginate_queryset(queryset)
+        data = [self.values_row(row) for row in (queryset if page is None else page)]
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
@@ -1,10 +1,9 @@
 # backend/core/views.py
 
-from django.http import FileResponse, HttpResponse, Http404
-from django.core.mail import send_mail
+from django.http import Http404
 from django.utils import timezone
-from django.db.models import Sum, Q
-from rest_framework import viewsets, status, permissions # <-- Added permissions
+from django.db.models import Sum, Q, Prefetch, Count
+from rest_framework import viewsets, mixins, serializers, status, permissions # <-- Added permissions
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, AllowAny
@@ -16,38 +15,109 @@ from .models import (
     User, College, Material, Schedule, TrainerApplication, Bill,
     Assessment, StudentAttempt, Course, Batch, Module,
     EmployeeApplication, Task, EmployeeDocument, EducationEntry, 
-    WorkExperienceEntry, Certification
+    WorkExperienceEntry, Certification, ImportJob, BatchMaterial, MaterialUpload, MaterialUploadChunk
 )
 from .serializers import (
     UserSerializer, CollegeSerializer, MaterialSerializer,
     ScheduleSerializer, MyTokenObtainPairSerializer, TrainerApplicationSerializer,
     BillSerializer, AssessmentSerializer, StudentAttemptSerializer, CourseSerializer, BatchSerializer, ModuleSerializer,
     EmployeeApplicationSerializer, TaskSerializer, EmployeeDocumentSerializer, EducationEntrySerializer, 
-    WorkExperienceEntrySerializer, CertificationSerializer
+    WorkExperienceEntrySerializer, CertificationSerializer, ImportJobSerializer, UserDirectorySerializer,
+    MaterialUploadSerializer
 )
-import secrets, os
+import secrets, time
 from rest_framework_simplejwt.views import TokenObtainPairView
-import pandas as pd
 from django.db import IntegrityError, transaction
-from .utils import send_student_credentials, send_employee_credentials
-import mimetypes
+from .utils import send_employee_credentials, queue_mail
+from .cache import VersionedCacheMixin
+from .conditional import ConditionalGetMixin
+from .material_access import OpenableMaterials, accessible_materials, can_open_material, refresh_batches_after_commit
+from .files import serve_file, serve_stored_file, verify_signed_file
+from . import uploads
+from .field_selection import FieldSelectionViewMixin
+from .values_list import ValuesListMixin, format_date, format_datetime, full_name
+from .roster import (
+    import_roster_file, preview_roster_file, RosterImportError,
+    add_students_to_batch, remove_students_from_batch
+)
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.contrib.auth.tokens import default_token_generator
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode
+
+def request_flag(request, name, default=False):
+    # Boolean option sent either as a query parameter or a form field
+    flag = request.query_params.get(name, request.data.get(name))
+    if flag is None:
+        return default
+    return str(flag).lower() in ('1', 'true', 'yes')
+
+
+# --- Student material access ---
+def student_materials(student):
+    """
+    Materials a student may open: legacy per-user assignments plus everything
+    assigned to any of their batches, resolved at read time.
+    """
+    return Material.objects.filter(
+        Q(assigned_users=student) | Q(batch_assignments__batch__students=student)
+    ).distinct()
+
 
 # --- Token and Password Views (Unchanged) ---
 class MyTokenObtainPairView(TokenObtainPairView):
     serializer_class = MyTokenObtainPairSerializer
 
+class SignedFileView(APIView):
+    # Downloads through URLs issued by files.signed_file_url. The signature is
+    # the permission check, so this never authenticates or touches the database.
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request, expires, signature, name):
+        if not verify_signed_file(expires, signature, name):
+            return Response({'detail': 'This link is invalid or has expired.'}, status=status.HTTP_403_FORBIDDEN)
+        try:
+            response = serve_stored_file(request, default_storage, name)
+        except FileNotFoundError:
+            return Response({'detail': 'File not found on server.'}, status=status.HTTP_404_NOT_FOUND)
+        # Anyone holding the URL may have the file until it expires, so shared caches can keep it that long
+        response['Cache-Control'] = f'public, max-age={max(expires - int(time.time()), 0)}'
+        return response
+
 class SetPasswordView(APIView):
-    permission_classes = [IsAuthenticated]
+    # Logged-in users change their own password; new students onboarded in
+    # LINK mode authenticate with the signed uid/token from their email instead
+    def get_permissions(self):
+        if 'token' in self.request.data:
+            return [AllowAny()]
+        return [IsAuthenticated()]
+
+    def _user_from_link(self, uidb64, token):
+        try:
+            user = User.objects.get(pk=force_str(urlsafe_base64_decode(uidb64)))
+        except (TypeError, ValueError, OverflowError, User.DoesNotExist):
+            return None
+        if not default_token_generator.check_token(user, token):
+            return None
+        return user
 
     def post(self, request, *args, **kwargs):
         user = request.user
+        if 'token' in request.data:
+            user = self._user_from_link(request.data.get('uid', ''), request.data.get('token', ''))
+            if user is None:
+                return Response({"error": "This link is invalid or has expired."}, status=status.HTTP_400_BAD_REQUEST)
+
         password = request.data.get("password")
         if not password or len(password) < 8:
             return Response({"error": "Password must be at least 8 characters long."}, status=status.HTTP_400_BAD_REQUEST)
 
         user.set_password(password)
         user.must_change_password = False
-        user.save()
+        # request.user comes from the auth cache; saving every field could revert newer changes
+        user.save(update_fields=['password', 'must_change_password'])
         return Response({"status": "Password set successfully. Please log in again."}, status=status.HTTP_200_OK)
 
 # --- Trainer Application ViewSet (Unchanged, but ensure email content is appropriate) ---
@@ -91,14 +161,13 @@ class TrainerApplicationViewSet(viewsets.ModelViewSet):
 
         # No automatic credential email here - it's sent upon first schedule assignment for trainers
 
-        send_mail(
+        queue_mail(
             'Your Trainer Application has been Approved!',
             f'Hi {user.first_name},\n\nCongratulations! Your application to become a trainer at Parc Platform has been approved. '
             'You will receive another email with your login credentials once you have been assigned to your first schedule.\n\n'
             'Best regards,\nThe Parc Platform Team',
             'admin@parcplatform.com', # Use settings.EMAIL_HOST_USER
             [user.email],
-            fail_silently=False,
         )
 
         return Response(UserSerializer(user).data, status=status.HTTP_201_CREATED)
@@ -106,7 +175,7 @@ class TrainerApplicationViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def decline(self, request, pk=None):
         application = self.get_object()
-        send_mail(
+        queue_mail(
             'Update on Your Parc Platform Trainer Application',
             f'Hi {application.name},\n\nThank you for your interest in becoming a trainer. '
             'After careful consideration, we have decided not to move forward with your application at this time.\n\n'
@@ -114,7 +183,6 @@ class TrainerApplicationViewSet(viewsets.ModelViewSet):
             'Best regards,\nThe Parc Platform Team',
             'admin@parcplatform.com', # Use settings.EMAIL_HOST_USER
             [application.email],
-            fail_silently=False,
         )
         application.delete()
         return Response({'status': 'Trainer application declined and deleted'}, status=status.HTTP_200_OK)
@@ -128,11 +196,7 @@ class TrainerApplicationViewSet(viewsets.ModelViewSet):
                 if request.user.role != 'ADMIN' and not request.user.is_staff:
                     raise PermissionDenied("You do not have permission to view this resume.")
 
-                with application.resume.open('rb') as f:
-                    resume_data = f.read()
-                content_type, _ = mimetypes.guess_type(application.resume.name)
-                content_type = content_type or 'application/octet-stream'
-                return HttpResponse(resume_data, content_type=content_type)
+                return serve_file(request, application.resume)
             except FileNotFoundError:
                 return Response({'error': 'Resume file not found on server.'}, status=status.HTTP_404_NOT_FOUND)
         else:
@@ -186,14 +250,13 @@ class EmployeeApplicationViewSet(viewsets.ModelViewSet):
         application.save()
 
         # Send separate approval confirmation email (optional)
-        send_mail(
+        queue_mail(
             'Your Employee Application has been Approved!',
             f'Hi {user.first_name},\n\nCongratulations! Your application to become an employee at Parc Platform has been approved. '
             'You should receive another email shortly with your temporary login credentials.\n\n'
             'Best regards,\nThe Parc Platform Team',
             'admin@parcplatform.com', # Use settings.EMAIL_HOST_USER
             [user.email],
-            fail_silently=False,
         )
 
         return Response(UserSerializer(user).data, status=status.HTTP_201_CREATED)
@@ -205,7 +268,7 @@ class EmployeeApplicationViewSet(viewsets.ModelViewSet):
              raise PermissionDenied("Only Admins can decline employee applications.")
 
         application = self.get_object()
-        send_mail(
+        queue_mail(
             'Update on Your Parc Platform Employee Application',
             f'Hi {application.name},\n\nThank you for your interest in joining Parc Platform. '
             'After careful consideration, we have decided not to move forward with your application at this time.\n\n'
@@ -213,7 +276,6 @@ class EmployeeApplicationViewSet(viewsets.ModelViewSet):
             'Best regards,\nThe Parc Platform Team',
             'admin@parcplatform.com', # Use settings.EMAIL_HOST_USER
             [application.email],
-            fail_silently=False,
         )
         application.delete()
         return Response({'status': 'Employee application declined and deleted'}, status=status.HTTP_200_OK)
@@ -227,21 +289,63 @@ class EmployeeApplicationViewSet(viewsets.ModelViewSet):
         application = self.get_object()
         if hasattr(application, 'resume') and application.resume:
             try:
-                with application.resume.open('rb') as f:
-                    resume_data = f.read()
-                content_type, _ = mimetypes.guess_type(application.resume.name)
-                content_type = content_type or 'application/octet-stream'
-                return HttpResponse(resume_data, content_type=content_type)
+                return serve_file(request, application.resume)
             except FileNotFoundError:
                 return Response({'error': 'Resume file not found on server.'}, status=status.HTTP_404_NOT_FOUND)
         else:
             return Response({'error': 'Resume not found for this application.'}, status=status.HTTP_404_NOT_FOUND)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(FieldSelectionViewMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated] # Base permission
     queryset = User.objects.all()
     serializer_class = UserSerializer
+
+    # Relations UserSerializer reads, by the role that actually has them. Listing
+    # prefetches exactly these, so the query count is the same for 10 or 10k users.
+    PROFILE_RELATIONS = {
+        'STUDENT': {
+            'batches': Batch, 'assigned_materials': Material, 'assigned_assessments': Assessment,
+        },
+        'EMPLOYEE': {
+            'education_entries': EducationEntry, 'work_experience_entries': WorkExperienceEntry,
+            'certification_entries': Certification,
+        },
+    }
+
+    def _requested_roles(self):
+        roles = self.request.query_params.get('role')
+        if not roles:
+            return set()
+        return {role.strip().upper() for role in roles.split(',') if role.strip()}
+
+    def _slim_list(self):
+        return self.action == 'list' and request_flag(self.request, 'slim')
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        roles = self._requested_roles()
+        if roles:
+            queryset = queryset.filter(role__in=roles)
+        if self._slim_list():
+            return queryset
+
+        prefetches = []
+        for role, relations in self.PROFILE_RELATIONS.items():
+            for name, model in relations.items():
+                if not self.renders_field(name):
+                    continue # Left out by ?fields= / ?expand=, so never read
+                if not roles or role in roles:
+                    prefetches.append(name)
+                else:
+                    # The role filter rules these rows out; resolve them as empty without a query
+                    prefetches.append(Prefetch(name, queryset=model.objects.none()))
+        return queryset.prefetch_related(*prefetches)
+
+    def get_serializer_class(self):
+        if self._slim_list():
+            return UserDirectorySerializer
+        return super().get_serializer_class()
       
     def get_serializer_context(self):
         # Pass request to serializer context (useful for UserSerializer if it needs it)
@@ -278,11 +382,7 @@ class UserViewSet(viewsets.ModelViewSet):
 
         if hasattr(user_obj, 'resume') and user_obj.resume:
             try:
-                with user_obj.resume.open('rb') as f:
-                    resume_data = f.read()
-                content_type, _ = mimetypes.guess_type(user_obj.resume.name)
-                content_type = content_type or 'application/octet-stream'
-                return HttpResponse(resume_data, content_type=content_type)
+                return serve_file(request, user_obj.resume)
             except FileNotFoundError:
                 return Response({'error': 'Resume file not found on server.'}, status=status.HTTP_404_NOT_FOUND)
         else:
@@ -303,9 +403,29 @@ class UserViewSet(viewsets.ModelViewSet):
         # No need for user.save() when using set() on ManyToManyField
         return Response(UserSerializer(user).data, status=status.HTTP_200_OK)
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(ConditionalGetMixin, ValuesListMixin, viewsets.ModelViewSet):
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ('-updated_at', 'id')
+    etag_versions = ('directory',) # Employee names
+    values_fields = (
+        'id', 'employee', 'employee__first_name', 'employee__last_name', 'title', 'description',
+        'status', 'due_date', 'created_at', 'updated_at'
+    )
+
+    def values_row(self, row):
+        # Mirrors TaskSerializer field for field
+        return {
+            'id': row['id'],
+            'employee': row['employee'],
+            'employee_name': full_name(row['employee__first_name'], row['employee__last_name']),
+            'title': row['title'],
+            'description': row['description'],
+            'status': row['status'],
+            'due_date': format_date(row['due_date']),
+            'created_at': format_datetime(row['created_at']),
+            'updated_at': format_datetime(row['updated_at']),
+        }
 
     def get_queryset(self):
         user = self.request.user
@@ -362,6 +482,7 @@ class EmployeeDocumentViewSet(viewsets.ModelViewSet):
     serializer_class = EmployeeDocumentSerializer
     permission_classes = [IsAuthenticated]
     parser_classes = (MultiPartParser, FormParser) # For file upload
+    cursor_ordering = ('-uploaded_at', 'id')
 
     def get_queryset(self):
         user = self.request.user
@@ -420,13 +541,8 @@ class EmployeeDocumentViewSet(viewsets.ModelViewSet):
              return Response({'detail': 'No file found for this document.'}, status=status.HTTP_404_NOT_FOUND)
         
         try:
-            f = file_field.open('rb')
-            content_type, _ = mimetypes.guess_type(file_field.name)
-            content_type = content_type or 'application/octet-stream'
-            # Use 'inline' to try opening in browser, 'attachment' to force download
-            response = FileResponse(f, content_type=content_type)
-            response['Content-Disposition'] = f'inline; filename="{os.path.basename(file_field.name)}"'
-            return response
+            # Inline so the browser opens it; honours Range requests
+            return serve_file(request, file_field)
         except FileNotFoundError:
              return Response({'detail': 'File not found on server.'}, status=status.HTTP_404_NOT_FOUND)
         
@@ -491,12 +607,7 @@ class EducationEntryViewSet(viewsets.ModelViewSet):
              return Response({'detail': 'No marksheet file found for this entry.'}, status=status.HTTP_404_NOT_FOUND)
         
         try:
-            f = file_field.open('rb')
-            content_type, _ = mimetypes.guess_type(file_field.name)
-            content_type = content_type or 'application/octet-stream'
-            response = FileResponse(f, content_type=content_type)
-            response['Content-Disposition'] = f'inline; filename="{os.path.basename(file_field.name)}"'
-            return response
+            return serve_file(request, file_field)
         except FileNotFoundError:
              return Response({'detail': 'File not found on server.'}, status=status.HTTP_404_NOT_FOUND)
     # --- END ADD ---
@@ -591,16 +702,20 @@ class CertificationViewSet(viewsets.ModelViewSet):
              return Response({'detail': 'No file found for this certificate.'}, status=status.HTTP_404_NOT_FOUND)
         
         try:
-            response = FileResponse(file_field.open('rb'), as_attachment=False)
-            response['Content-Disposition'] = f'inline; filename="{os.path.basename(file_field.name)}"'
-            return response
+            return serve_file(request, file_field)
         except FileNotFoundError:
              return Response({'detail': 'File not found on server.'}, status=status.HTTP_404_NOT_FOUND)
 
-class CollegeViewSet(viewsets.ModelViewSet):
+class CollegeViewSet(FieldSelectionViewMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     queryset = College.objects.all()
     serializer_class = CollegeSerializer
+    selection_prefetch_related = {
+        'courses': 'courses',
+        'courses.modules': 'courses__modules',
+        'courses.modules.materials': 'courses__modules__materials',
+        'courses.modules.materials.course_name': 'courses__modules__materials__course',
+    }
 
     @action(detail=True, methods=['post'])
     def manage_courses(self, request, pk=None):
@@ -611,44 +726,51 @@ class CollegeViewSet(viewsets.ModelViewSet):
         college.courses.set(courses_to_set)
         return Response(self.get_serializer(college).data, status=status.HTTP_200_OK)
 
-class MaterialViewSet(viewsets.ModelViewSet):
+class MaterialViewSet(FieldSelectionViewMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = MaterialSerializer
     parser_classes = (MultiPartParser, FormParser)
     queryset = Material.objects.all()
+    selection_select_related = {'course_name': 'course'}
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        # Lets MaterialSerializer sign content URLs for what the caller may open
+        if self.request is not None and self.request.user.is_authenticated:
+            context['openable_materials'] = OpenableMaterials(self.request.user)
+        return context
+
+    @action(detail=False, methods=['get'])
+    def assigned(self, request):
+        # A student's own materials; admins can look up any student with ?student=<id>
+        student = request.user
+        if request.user.role == 'ADMIN' or request.user.is_staff:
+            student_id = request.query_params.get('student')
+            if student_id:
+                student = User.objects.filter(id=student_id, role='STUDENT').first()
+                if student is None:
+                    return Response({'error': 'Student not found.'}, status=status.HTTP_404_NOT_FOUND)
+        elif request.user.role != 'STUDENT':
+            return Response({'error': 'Only students have assigned materials.'}, status=status.HTTP_400_BAD_REQUEST)
+        materials = student_materials(student).select_related('course')
+        return Response(self.get_serializer(materials, many=True).data)
+
+    @action(detail=False, methods=['get'])
+    def accessible(self, request):
+        # Everything the caller may open (what view_content would allow), from the access index
+        materials = self.filter_queryset(accessible_materials(request.user)).select_related('course')
+        page = self.paginate_queryset(materials)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(materials, many=True).data)
 
     @action(detail=True, methods=['get'])
     def view_content(self, request, pk=None):
         material = self.get_object()
-        user = request.user
-        allowed = False
-        role = getattr(user, 'role', None)
-
-        # Admin/Staff access
-        if role == 'ADMIN' or user.is_staff:
-            allowed = True
-        # Trainer access
-        elif role == 'TRAINER':
-            # Own uploads or public materials
-            if material.uploader_id == user.id or material.uploader_id is None:
-                allowed = True
-            # Materials linked via current/future schedules
-            else:
-                allowed = Schedule.objects.filter(
-                    trainer=user,
-                    materials__id=material.id,
-                    end_date__gte=timezone.now() # Check if schedule is active/upcoming
-                ).exists()
-        # Student access
-        elif role == 'STUDENT':
-             # Directly assigned materials
-            if user.assigned_materials.filter(id=material.id).exists():
-                 allowed = True
-             # Materials linked via Modules in their enrolled Courses (check batches)
-            elif material.course_id is not None:
-                 allowed = user.batches.filter(course_id=material.course_id).exists()
-
-        if not allowed:
+        # Admins/staff, trainers' own and public uploads, or an entry in the
+        # access index (schedules for trainers; direct, batch and course
+        # assignments for students)
+        if not can_open_material(request.user, material):
             return Response({'detail': 'You do not have permission to view this material.'}, status=status.HTTP_403_FORBIDDEN)
 
         file_field = material.content
@@ -656,13 +778,8 @@ class MaterialViewSet(viewsets.ModelViewSet):
             return Response({'detail': 'No content found for this material.'}, status=status.HTTP_404_NOT_FOUND)
 
         try:
-            f = file_field.open('rb')
-            content_type, _ = mimetypes.guess_type(file_field.name)
-            content_type = content_type or 'application/octet-stream'
-            response = FileResponse(f, content_type=content_type)
-             # Use inline for browser viewing, attachment for download prompt
-            response['Content-Disposition'] = f'inline; filename="{file_field.name.rsplit("/", 1)[-1]}"'
-            return response
+            # Videos are seekable: the player fetches only the byte ranges it needs
+            return serve_file(request, file_field)
         except FileNotFoundError:
              return Response({'detail': 'File not found on server.'}, status=status.HTTP_404_NOT_FOUND)
 
@@ -697,21 +814,187 @@ class MaterialViewSet(viewsets.ModelViewSet):
         else:
             raise PermissionDenied("You do not have permission to delete this material.")
 
-class CourseViewSet(viewsets.ModelViewSet):
+class MaterialUploadViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, mixins.DestroyModelMixin, viewsets.GenericViewSet):
+    # Resumable chunked uploads for material files too large for one request
+    # (see core/uploads.py). Users only ever see their own sessions.
+    permission_classes = [IsAuthenticated]
+    serializer_class = MaterialUploadSerializer
+
+    def get_queryset(self):
+        return MaterialUpload.objects.filter(uploader=self.request.user)
+
+    def perform_create(self, serializer):
+        # Same rule as MaterialViewSet.perform_create
+        user = self.request.user
+        if not (user.role in ('ADMIN', 'TRAINER') or user.is_staff):
+            raise PermissionDenied("Only Admins or Trainers can upload materials.")
+        if not uploads.supports_local_files():
+            raise serializers.ValidationError({'detail': 'Chunked uploads need local file storage; upload the file directly.'})
+        upload = serializer.save(uploader=user)
+        try:
+            uploads.preallocate(upload)
+        except OSError:
+            upload.delete()
+            raise serializers.ValidationError({'detail': 'Not enough space to store this file.'})
+
+    @action(detail=True, methods=['put'], url_path=r'chunks/(?P<index>[0-9]+)')
+    def chunk(self, request, pk=None, index=None):
+        upload = self.get_object()
+        if upload.status != 'OPEN':
+            return Response({'detail': 'This upload is no longer open.'}, status=status.HTTP_409_CONFLICT)
+        index = int(index)
+        # The body is read straight from the request stream (never request.data),
+        # so a chunk is not held in memory nor capped by DATA_UPLOAD_MAX_MEMORY_SIZE
+        stream = request.stream
+        if stream is None:
+            return Response({'detail': 'Empty chunk.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            with uploads.chunk_writer(upload) as fd:
+                # Checked again under the lock: finalize may have started meanwhile
+                if not MaterialUpload.objects.filter(pk=upload.pk, status='OPEN').exists():
+                    return Response({'detail': 'This upload is no longer open.'}, status=status.HTTP_409_CONFLICT)
+                # Not received until rewritten and checked, so a failed retry
+                # cannot leave bad bytes behind a chunk finalize would accept
+                upload.chunks.filter(index=index).delete()
+                digest = uploads.write_chunk(upload, fd, index, stream, request.headers.get('X-Chunk-SHA256'))
+                with transaction.atomic():
+                    MaterialUploadChunk.objects.create(upload=upload, index=index, sha256=digest)
+        except uploads.UploadError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except FileNotFoundError: # Abandoned or finalized before this chunk arrived
+            return Response({'detail': 'This upload is no longer open.'}, status=status.HTTP_409_CONFLICT)
+        except IntegrityError: # The same chunk sent twice at once; the other copy was recorded
+            pass
+
+        MaterialUpload.objects.filter(pk=upload.pk).update(updated_at=timezone.now()) # Keeps it from being purged
+        return Response({'index': index, 'sha256': digest}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['post'])
+    def finalize(self, request, pk=None):
+        upload = self.get_object()
+        with transaction.atomic():
+            upload = MaterialUpload.objects.select_for_update().get(pk=upload.pk)
+            if upload.status == 'COMPLETED': # A retried finalize gets the same answer
+                if upload.material is None:
+                    return Response({'detail': 'The material of this upload was deleted.'}, status=status.HTTP_410_GONE)
+                return Response(MaterialSerializer(upload.material, context=self.get_serializer_context()).data, status=status.HTTP_200_OK)
+            if upload.status == 'FINALIZING':
+                return Response({'detail': 'This upload is already being finalized.'}, status=status.HTTP_409_CONFLICT)
+            missing = self._missing_chunks(upload)
+            if missing:
+                return Response({'detail': 'Some chunks have not been received.', 'missing_chunks': missing[:100]}, status=status.HTTP_400_BAD_REQUEST)
+            # Committed before the file is touched, so new chunk writes are refused
+            upload.status = 'FINALIZING'
+            upload.save(update_fields=['status', 'updated_at'])
+
+        try:
+            material = self._publish(request, upload)
+        except uploads.UploadError as e:
+            self._reopen(upload)
+            return Response({'detail': str(e), 'missing_chunks': e.chunks[:100]}, status=status.HTTP_400_BAD_REQUEST)
+        except FileNotFoundError: # Abandoned just before finalize got the file
+            return Response({'detail': 'This upload is no longer open.'}, status=status.HTTP_409_CONFLICT)
+        except Exception:
+            self._reopen(upload)
+            raise
+        return Response(MaterialSerializer(material, context=self.get_serializer_context()).data, status=status.HTTP_201_CREATED)
+
+    def _missing_chunks(self, upload):
+        received = set(upload.chunks.values_list('index', flat=True))
+        return [i for i in range(upload.chunk_count) if i not in received]
+
+    def _publish(self, request, upload):
+        # Hashing a large file takes a while, so it runs outside any transaction;
+        # the exclusive lock waits for chunk writes that were already in flight
+        with uploads.exclusive(upload):
+            missing = self._missing_chunks(upload) # An in-flight retry may have withdrawn one
+            if missing:
+                raise uploads.UploadError('Some chunks have not been received.', missing)
+            mismatched, whole_sha256 = uploads.verify(upload, dict(upload.chunks.values_list('index', 'sha256')))
+            if mismatched:
+                upload.chunks.filter(index__in=mismatched).delete()
+                raise uploads.UploadError('Some chunks are damaged; send them again.', mismatched)
+            expected_sha256 = request.data.get('sha256')
+            if expected_sha256 and whole_sha256 != str(expected_sha256).strip().lower():
+                raise uploads.UploadError('Checksum mismatch for the assembled file.')
+
+            user = request.user
+            name = uploads.move_into_storage(upload)
+            try:
+                with transaction.atomic():
+                    material = Material.objects.create(
+                        title=upload.title, course=upload.course, type=upload.type,
+                        duration_in_minutes=upload.duration_in_minutes, content=name,
+                        uploader=user if user.role == 'TRAINER' else None, # Admin uploads are public, as in MaterialViewSet
+                    )
+                    upload.status = 'COMPLETED'
+                    upload.material = material
+                    upload.save(update_fields=['status', 'material', 'updated_at'])
+                    upload.chunks.all().delete()
+            except Exception:
+                uploads.restore(upload, name) # The session stays resumable
+                raise
+        return material
+
+    def _reopen(self, upload):
+        MaterialUpload.objects.filter(pk=upload.pk, status='FINALIZING').update(status='OPEN', updated_at=timezone.now())
+
+    def perform_destroy(self, instance):
+        try:
+            with uploads.exclusive(instance): # Lets chunk writes in flight finish first
+                self._delete_unless_finalizing(instance)
+                uploads.discard(instance)
+        except FileNotFoundError: # Completed, or already discarded
+            self._delete_unless_finalizing(instance)
+
+    def _delete_unless_finalizing(self, upload):
+        deleted, _ = MaterialUpload.objects.filter(pk=upload.pk).exclude(status='FINALIZING').delete()
+        if not deleted:
+            raise serializers.ValidationError({'detail': 'This upload is being finalized.'})
+
+class CourseViewSet(ConditionalGetMixin, VersionedCacheMixin, FieldSelectionViewMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated] # Or IsAdminUser if only admins manage courses
-    queryset = Course.objects.all().prefetch_related('modules__materials')
+    queryset = Course.objects.all()
     serializer_class = CourseSerializer
     parser_classes = (MultiPartParser, FormParser) # For cover_photo upload
-
-class ModuleViewSet(viewsets.ModelViewSet):
+    # The catalog changes rarely; reads are served from cache until a Course,
+    # Module or Material changes (see invalidate_course_catalog in signals.py)
+    cache_namespace = 'catalog'
+    etag_versions = ('catalog',)
+    etag_aggregate = False # The catalog version already covers every change
+    selection_prefetch_related = {
+        'modules': 'modules',
+        'modules.materials': 'modules__materials',
+        'modules.materials.course_name': 'modules__materials__course',
+    }
+
+class ModuleViewSet(FieldSelectionViewMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated] # Or IsAdminUser
     queryset = Module.objects.all()
     serializer_class = ModuleSerializer
+    selection_prefetch_related = {
+        'materials': 'materials',
+        'materials.course_name': 'materials__course',
+    }
 
-class BatchViewSet(viewsets.ModelViewSet):
+class BatchViewSet(ConditionalGetMixin, FieldSelectionViewMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated] # Or IsAdminUser
-    queryset = Batch.objects.select_related('course', 'college').prefetch_related('students').all() # Optimize queries
+    queryset = Batch.objects.all()
     serializer_class = BatchSerializer
+    etag_versions = ('catalog', 'directory', 'enrollment') # Course/college names, student counts
+    selection_select_related = {'course_name': 'course', 'college_name': 'college'}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.renders_field('student_count'):
+            # One COUNT per batch in the same query, instead of loading every enrolled student
+            queryset = queryset.annotate(student_count=Count('students'))
+        return queryset
+
+    def get_validator_queryset(self):
+        # Same batches without the student_count join, so a 304 check never scans enrollments
+        return self.filter_queryset(super().get_queryset())
 
     def destroy(self, request, *args, **kwargs):
         # Existing logic is fine
@@ -722,6 +1005,17 @@ class BatchViewSet(viewsets.ModelViewSet):
             return Response({"error": e.messages}, status=status.HTTP_400_BAD_REQUEST)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    def _import_in_background(self, request):
+        # Per-request 'async' flag, falling back to the deployment-wide default
+        return request_flag(request, 'async', default=settings.ROSTER_IMPORT_IN_BACKGROUND)
+
+    def _queue_import(self, request, batch, file_obj, start_row=0):
+        # The upload is stored with the job; process_import_jobs picks it up
+        return ImportJob.objects.create(
+            batch=batch, created_by=request.user,
+            file=file_obj, filename=file_obj.name, checkpoint=start_row
+        )
+
     # create_with_students - existing logic seems fine, assumes Admin creates
     @action(detail=False, methods=['post'], parser_classes=[MultiPartParser, FormParser])
     def create_with_students(self, request, *args, **kwargs):
@@ -732,6 +1026,7 @@ class BatchViewSet(viewsets.ModelViewSet):
         batch_name = request.data.get('name')
         start_date = request.data.get('start_date')
         end_date = request.data.get('end_date')
+        dry_run = request_flag(request, 'dry_run')
 
         if not all([file_obj, course_id, batch_name, start_date, end_date]): # college_id removed from check
             return Response({'error': 'Missing required fields (file, course, name, start_date, end_date).'}, status=status.HTTP_400_BAD_REQUEST)
@@ -742,74 +1037,50 @@ class BatchViewSet(viewsets.ModelViewSet):
             if college_id: # Handle optional college
                  college = College.objects.get(id=int(college_id))
 
-            batch = Batch.objects.create(
-                course=course, college=college, name=batch_name,
-                start_date=start_date, end_date=end_date
-            )
+            if not dry_run:
+                batch = Batch.objects.create(
+                    course=course, college=college, name=batch_name,
+                    start_date=start_date, end_date=end_date
+                )
         except (Course.DoesNotExist, College.DoesNotExist, IntegrityError) as e:
              # Handle unique_together constraint error specifically if needed
             return Response({'error': f'Failed to create batch: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Student processing remains the same
+        if dry_run:
+            # Preview only: the batch is not created and nothing is written
+            try:
+                preview = preview_roster_file(None, file_obj)
+            except Exception as e:
+                return Response({'error': f'File processing error: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({'dry_run': True, 'preview': preview}, status=status.HTTP_200_OK)
+
+        if self._import_in_background(request):
+            job = self._queue_import(request, batch, file_obj)
+            response_data = self.get_serializer(batch).data
+            response_data['import_job'] = ImportJobSerializer(job).data
+            return Response(response_data, status=status.HTTP_202_ACCEPTED)
+
+        # Students are streamed in through the shared set-based import engine
         try:
-            df = pd.read_excel(file_obj) if file_obj.name.endswith(('.xls', '.xlsx')) else pd.read_csv(file_obj)
-            users_to_add = []
-            created_count = 0
-            skipped_count = 0
-            errors = []
-
-            with transaction.atomic(): # Process students within a transaction
-                for index, row in df.iterrows():
-                    name, email = row.get('name'), row.get('email')
-                    if not name or not email or not isinstance(email, str):
-                        errors.append(f"Row {index+2}: Missing name or invalid email.")
-                        skipped_count += 1
-                        continue
-
-                    email = email.strip().lower()
-                    name = str(name).strip()
-
-                    user, created = User.objects.get_or_create(
-                        username=email,
-                        defaults={
-                            'email': email,
-                            'first_name': name.split(" ", 1)[0],
-                            'last_name': name.split(" ", 1)[1] if len(name.split(" ", 1)) > 1 else "",
-                            'role': 'STUDENT',
-                            'must_change_password': True
-                        }
-                    )
-                    if created:
-                        created_count += 1
-                        password = secrets.token_urlsafe(8)
-                        user.set_password(password)
-                        user.save()
-                        send_student_credentials(user, password) # Send credentials only for newly created users
-                    elif user.role != 'STUDENT':
-                         errors.append(f"Row {index+2}: Email {email} exists but is not a student.")
-                         skipped_count += 1
-                         continue # Don't add non-students
-
-                    users_to_add.append(user)
-
-                batch.students.add(*users_to_add)
-
+            summary = import_roster_file(batch, file_obj)
             serializer = self.get_serializer(batch)
             response_data = serializer.data
-            response_data['import_summary'] = {
-                 'added_to_batch': len(users_to_add),
-                 'newly_created': created_count,
-                 'skipped': skipped_count,
-                 'errors': errors
-            }
+            response_data['import_summary'] = summary
             return Response(response_data, status=status.HTTP_201_CREATED)
 
-        except Exception as e:
-            # Clean up the created batch if student processing fails
-            batch.delete()
-            return Response({'error': f'File processing error: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
-
-    # add_students_from_file - existing logic seems fine
+        except RosterImportError as e:
+            if e.summary['checkpoint'] == 0:
+                # Clean up the created batch if nothing was imported
+                batch.delete()
+                return Response({'error': f'File processing error: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
+            # Committed chunks are kept; the import can be resumed with add_students_from_file
+            return Response({
+                'error': f'File processing error: {str(e)}',
+                'batch': batch.id,
+                'import_summary': e.summary
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+    # add_students_from_file - uses the same import engine as create_with_students
     @action(detail=True, methods=['post'], parser_classes=[MultiPartParser, FormParser])
     def add_students_from_file(self, request, pk=None):
          # Add Admin check if needed
@@ -819,115 +1090,134 @@ class BatchViewSet(viewsets.ModelViewSet):
         if not file_obj:
             return Response({'error': 'No file uploaded.'}, status=status.HTTP_400_BAD_REQUEST)
 
+        # 'resume_from' is the checkpoint reported by an earlier, interrupted import
         try:
-            df = pd.read_excel(file_obj) if file_obj.name.endswith(('.xls', '.xlsx')) else pd.read_csv(file_obj)
-            users_to_add = []
-            created_count = 0
-            skipped_count = 0
-            errors = []
-
-            with transaction.atomic():
-                for index, row in df.iterrows():
-                    name, email = row.get('name'), row.get('email')
-                    if not name or not email or not isinstance(email, str):
-                        errors.append(f"Row {index+2}: Missing name or invalid email.")
-                        skipped_count += 1
-                        continue
-
-                    email = email.strip().lower()
-                    name = str(name).strip()
-
-                    user, created = User.objects.get_or_create(
-                        username=email,
-                        defaults={
-                            'email': email,
-                            'first_name': name.split(" ", 1)[0],
-                            'last_name': name.split(" ", 1)[1] if len(name.split(" ", 1)) > 1 else "",
-                            'role': 'STUDENT',
-                            'must_change_password': True
-                        }
-                    )
-                    if created:
-                        created_count += 1
-                        password = secrets.token_urlsafe(8)
-                        user.set_password(password)
-                        user.save()
-                        send_student_credentials(user, password)
-                    elif user.role != 'STUDENT':
-                         errors.append(f"Row {index+2}: Email {email} exists but is not a student.")
-                         skipped_count += 1
-                         continue
+            start_row = int(request.data.get('resume_from') or 0)
+        except (TypeError, ValueError):
+            start_row = -1
+        if start_row < 0:
+            return Response({'error': 'resume_from must be a row number.'}, status=status.HTTP_400_BAD_REQUEST)
 
-                    users_to_add.append(user)
+        if request_flag(request, 'dry_run'):
+            try:
+                preview = preview_roster_file(batch, file_obj)
+            except Exception as e:
+                return Response({'error': f'An error occurred during file processing: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({'dry_run': True, 'preview': preview}, status=status.HTTP_200_OK)
 
-                batch.students.add(*users_to_add)
+        if self._import_in_background(request):
+            job = self._queue_import(request, batch, file_obj, start_row=start_row)
+            return Response({'import_job': ImportJobSerializer(job).data}, status=status.HTTP_202_ACCEPTED)
 
+        try:
+            summary = import_roster_file(batch, file_obj, start_row=start_row)
             serializer = self.get_serializer(batch)
             response_data = serializer.data
-            response_data['import_summary'] = {
-                 'added_to_batch': len(users_to_add),
-                 'newly_created': created_count,
-                 'skipped': skipped_count,
-                 'errors': errors
-            }
+            response_data['import_summary'] = summary
             return Response(response_data, status=status.HTTP_200_OK)
 
-        except Exception as e:
-            return Response({'error': f'An error occurred during file processing: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
+        except RosterImportError as e:
+            return Response({
+                'error': f'An error occurred during file processing: {str(e)}',
+                'import_summary': e.summary
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+    # Poll background roster imports for this batch
+    @action(detail=True, methods=['get'], url_path='import-jobs')
+    def import_jobs(self, request, pk=None):
+        batch = self.get_object()
+        jobs = batch.import_jobs.all()
+        return Response(ImportJobSerializer(jobs, many=True).data, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['get'], url_path=r'import-jobs/(?P<job_id>[0-9]+)')
+    def import_job(self, request, pk=None, job_id=None):
+        batch = self.get_object()
+        try:
+            job = batch.import_jobs.get(id=job_id)
+        except ImportJob.DoesNotExist:
+            return Response({'error': 'Import job not found for this batch.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(ImportJobSerializer(job).data, status=status.HTTP_200_OK)
 
-    # add_students - existing logic seems fine
     @action(detail=True, methods=['post'])
     def add_students(self, request, pk=None):
         # Add Admin check if needed
         batch = self.get_object()
-        student_ids = request.data.get('student_ids', [])
-
-        students_to_add = User.objects.filter(id__in=student_ids, role='STUDENT')
-        batch.students.add(*students_to_add)
+        student_ids = self._ids(request, 'student_ids')
+        if student_ids is None:
+            return Response({'error': 'student_ids must be a list of user IDs.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        return Response(self.get_serializer(batch).data, status=status.HTTP_200_OK)
+        summary = add_students_to_batch(batch, student_ids)
+        summary['student_count'] = batch.students.count()
+        return Response(summary, status=status.HTTP_200_OK)
 
-    # remove_students - existing logic seems fine
     @action(detail=True, methods=['post'])
     def remove_students(self, request, pk=None):
          # Add Admin check if needed
         batch = self.get_object()
-        student_ids = request.data.get('student_ids', [])
-
-        students_to_remove = User.objects.filter(id__in=student_ids)
-        batch.students.remove(*students_to_remove)
-
-        return Response(self.get_serializer(batch).data, status=status.HTTP_200_OK)
+        student_ids = self._ids(request, 'student_ids')
+        if student_ids is None:
+            return Response({'error': 'student_ids must be a list of user IDs.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        summary = remove_students_from_batch(batch, student_ids)
+        summary['student_count'] = batch.students.count()
+        return Response(summary, status=status.HTTP_200_OK)
+
+    def _ids(self, request, field):
+        ids = request.data.get(field, [])
+        if not isinstance(ids, list):
+            return None
+        try:
+            return [int(value) for value in ids]
+        except (TypeError, ValueError):
+            return None
 
-    # assign_materials - existing logic seems fine
     @action(detail=True, methods=['post'])
     def assign_materials(self, request, pk=None):
          # Add Admin or Trainer check if needed
         batch = self.get_object()
-        material_ids = request.data.get('material_ids', [])
-
-        try:
-            materials_to_assign = Material.objects.filter(id__in=material_ids)
-            if len(materials_to_assign) != len(material_ids):
-                valid_ids = set(materials_to_assign.values_list('id', flat=True))
-                invalid_ids = [mid for mid in material_ids if mid not in valid_ids]
-                return Response({'error': f'Invalid material IDs provided: {invalid_ids}'}, status=status.HTTP_400_BAD_REQUEST)
-
-            students_in_batch = batch.students.all()
-
-            with transaction.atomic():
-                for student in students_in_batch:
-                    student.assigned_materials.add(*materials_to_assign)
-
-            return Response({'status': f'Materials assigned to {students_in_batch.count()} students in batch {batch.name}.'}, status=status.HTTP_200_OK)
+        material_ids = self._ids(request, 'material_ids')
+        if material_ids is None:
+            return Response({'error': 'material_ids must be a list of material IDs.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        materials_to_assign = Material.objects.filter(id__in=material_ids)
+        valid_ids = set(materials_to_assign.values_list('id', flat=True))
+        if len(valid_ids) != len(set(material_ids)):
+            invalid_ids = [mid for mid in material_ids if mid not in valid_ids]
+            return Response({'error': f'Invalid material IDs provided: {invalid_ids}'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # One row per material on the batch; students pick these up through their batches,
+        # including anyone who joins later. Re-assigning is a no-op.
+        BatchMaterial.objects.bulk_create(
+            [BatchMaterial(batch=batch, material_id=mid, assigned_by=request.user) for mid in valid_ids],
+            ignore_conflicts=True
+        )
+        refresh_batches_after_commit([batch.id], valid_ids) # bulk_create sends no signals
+        return Response({'status': f'{len(valid_ids)} materials assigned to batch {batch.name}.'}, status=status.HTTP_200_OK)
 
-        except Exception as e:
-            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    @action(detail=True, methods=['post'])
+    def unassign_materials(self, request, pk=None):
+        batch = self.get_object()
+        material_ids = self._ids(request, 'material_ids')
+        if material_ids is None:
+            return Response({'error': 'material_ids must be a list of material IDs.'}, status=status.HTTP_400_BAD_REQUEST)
+        removed, _ = BatchMaterial.objects.filter(batch=batch, material_id__in=material_ids).delete()
+        return Response({'status': f'{removed} materials removed from batch {batch.name}.'}, status=status.HTTP_200_OK)
 
-class ScheduleViewSet(viewsets.ModelViewSet):
+class ScheduleViewSet(ConditionalGetMixin, FieldSelectionViewMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated] # Or IsAdminUser
-    queryset = Schedule.objects.select_related('trainer', 'batch__course', 'batch__college').prefetch_related('materials').all() # Optimize
+    queryset = Schedule.objects.all()
     serializer_class = ScheduleSerializer
+    etag_versions = ('catalog', 'directory', 'schedule-materials') # Embedded names and materials
+    selection_select_related = {
+        'trainer_name': 'trainer',
+        'batch_name': 'batch',
+        'course_name': 'batch__course',
+        'college_name': 'batch__college',
+    }
+    selection_prefetch_related = {
+        'materials': 'materials',
+        'materials.course_name': 'materials__course',
+    }
 
     # _update_trainer_expiry_and_send_credentials - existing logic is fine
     def _update_trainer_expiry_and_send_credentials(self, trainer):
@@ -959,7 +1249,7 @@ class ScheduleViewSet(viewsets.ModelViewSet):
 
             if password_changed:
                 # Send email with credentials only if the password was actually reset
-                send_mail(
+                queue_mail(
                     'Your Parc Platform Login Credentials & Schedule Update',
                     f'Hi {trainer.first_name},\n\nYou have been assigned to a new schedule or your access needed reactivation. '
                     'Please use the following temporary credentials to log in. You may change your password after logging in if you wish.\n\n'
@@ -970,9 +1260,8 @@ class ScheduleViewSet(viewsets.ModelViewSet):
                     'Best regards,\nThe Parc Platform Team',
                     'admin@parcplatform.com', # Use settings.EMAIL_HOST_USER
                     [trainer.email],
-                    fail_silently=False,
                 )
-                print(f"--- SENT/RESET CREDENTIALS TO TRAINER: {trainer.email} | TEMP PASSWORD: {temp_password} ---")
+                print(f"--- QUEUED/RESET CREDENTIALS FOR TRAINER: {trainer.email} ---")
         else:
             # If no upcoming schedules, deactivate and clear expiry, unless already inactive
             if trainer.is_active or trainer.access_expiry_date is not None:
@@ -997,6 +1286,7 @@ class ScheduleViewSet(viewsets.ModelViewSet):
 class BillViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     queryset = Bill.objects.select_related('trainer').prefetch_related('expenses').all().order_by('-date') # Optimize
+    cursor_ordering = ('-date', 'id')
     serializer_class = BillSerializer
 
     # Add permission checks if needed (e.g., Trainer can only CRUD own bills, Admin can CRUD all)
@@ -1038,10 +1328,28 @@ class AssessmentViewSet(viewsets.ModelViewSet):
     queryset = Assessment.objects.all()
     serializer_class = AssessmentSerializer
 
-class StudentAttemptViewSet(viewsets.ModelViewSet):
+class StudentAttemptViewSet(ValuesListMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     queryset = StudentAttempt.objects.select_related('student', 'assessment').all() # Optimize
     serializer_class = StudentAttemptSerializer
+    cursor_ordering = ('-timestamp', 'id')
+    values_fields = (
+        'id', 'student', 'student__first_name', 'student__last_name',
+        'assessment', 'assessment__title', 'assessment__course', 'score', 'timestamp'
+    )
+
+    def values_row(self, row):
+        # Mirrors StudentAttemptSerializer field for field
+        return {
+            'id': row['id'],
+            'student': row['student'],
+            'student_name': full_name(row['student__first_name'], row['student__last_name']),
+            'assessment': row['assessment'],
+            'assessment_title': row['assessment__title'],
+            'course': row['assessment__course'],
+            'score': row['score'],
+            'timestamp': format_datetime(row['timestamp']),
+        }
     # Add permission checks (Student can CRUD own, Admin/Trainer can List/Retrieve?)
 
 class ReportingDashboardView(APIView):
@@ -132,10 +132,57 @@ AUTH_USER_MODEL = 'core.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+        # JWTAuthentication that caches the user's core columns instead of
+        # loading the user row on every request
+        'core.authentication.CachedJWTAuthentication',
+    ),
+    # orjson-backed drop-ins for DRF's JSON renderer/parser; same output, less CPU
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
 }
 
+# List endpoints paginate only when the client sends ?cursor= or ?page_size=,
+# until every client has moved over; then flip this on to paginate by default
+API_PAGINATE_BY_DEFAULT = os.getenv('API_PAGINATE_BY_DEFAULT', 'False').lower() in ('true', '1', 't')
+
+# --- CACHE ---
+# Local memory is per process, which is only safe with a single server process
+# (e.g. runserver). With several workers or nodes, point all of them at one
+# shared cache (CACHE_URL=redis://host:6379/1, needs `pip install redis`) so the
+# version bumps behind cached responses and ETags reach every process.
+if os.getenv('CACHE_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('CACHE_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    }
+# Cached responses and version-based ETags are only correct when every process
+# sees the same version counters: on with CACHE_URL, off with local memory
+# unless CACHE_SINGLE_PROCESS=True says only one server process runs
+VERSIONED_CACHING = bool(os.getenv('CACHE_URL')) or os.getenv('CACHE_SINGLE_PROCESS', 'False').lower() in ('true', '1', 't')
+API_CACHE_TIMEOUT = int(os.getenv('API_CACHE_TIMEOUT', 60 * 60 * 24)) # Seconds; entries are also invalidated on change
+# Seconds an authenticated user's cached row, and their cached login token
+# claims, may be reused. Saves invalidate both, but with a per-process cache only
+# in the saving process, so keep this short
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv('AUTH_USER_CACHE_TIMEOUT', 60))
+
 from datetime import timedelta
 
 SIMPLE_JWT = {
@@ -148,10 +195,49 @@ SIMPLE_JWT = {
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# --- FILE DELIVERY ---
+# Who sends the bytes of authorized downloads (view_content, view_resume, ...):
+#   django            stream from Python (default; also what tests use)
+#   x-accel-redirect  nginx, via an `internal` location aliasing MEDIA_ROOT at
+#                     FILE_DELIVERY_INTERNAL_URL (see README)
+#   x-sendfile        Apache mod_xsendfile / lighttpd, with MEDIA_ROOT allowed
+FILE_DELIVERY_BACKEND = os.getenv('FILE_DELIVERY_BACKEND', 'django').lower()
+FILE_DELIVERY_INTERNAL_URL = os.getenv('FILE_DELIVERY_INTERNAL_URL', '/protected-media/')
+# Seconds a signed file URL (the *_signed_url fields) is issued for; each URL is
+# reused for a whole period, so it stays valid for between one and two of these
+SIGNED_FILE_URL_LIFETIME = int(os.getenv('SIGNED_FILE_URL_LIFETIME', 60 * 60))
+# Largest file accepted by chunked material uploads (/api/material-uploads/), in
+# bytes; the whole size is reserved on disk when a session starts
+MATERIAL_UPLOAD_MAX_SIZE = int(os.getenv('MATERIAL_UPLOAD_MAX_SIZE', 5 * 1024 ** 3))
+
 # --- EMAIL CONFIGURATION FOR GMAIL ---
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
-EMAIL_HOST = 'smtp.gmail.com'
-EMAIL_PORT = 587
-EMAIL_USE_TLS = True
+# Host/port/TLS can be overridden to point at a local debugging SMTP server
+EMAIL_HOST = os.getenv('EMAIL_HOST', 'smtp.gmail.com')
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', 587))
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True').lower() in ('true', '1', 't')
 EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER')
-EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD')
\ No newline at end of file
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD')
+
+# Outbox delivery (manage.py send_queued_email)
+EMAIL_OUTBOX_BATCH_SIZE = 100 # Messages sent per SMTP connection
+EMAIL_OUTBOX_MAX_ATTEMPTS = 6 # After this many failures a message is marked FAILED
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = 60 # Backoff doubles per attempt, capped at one hour
+# Bodies may hold temporary passwords: they are blanked once sent, and sent or
+# failed rows are deleted after this many days
+EMAIL_OUTBOX_RETENTION_DAYS = int(os.getenv('EMAIL_OUTBOX_RETENTION_DAYS', 7))
+
+# --- ROSTER IMPORTS ---
+# When True, batch roster uploads are queued as ImportJobs (processed by
+# `manage.py process_import_jobs`) and answered with 202. Clients can also
+# opt in per request with ?async=1.
+ROSTER_IMPORT_IN_BACKGROUND = os.getenv('ROSTER_IMPORT_IN_BACKGROUND', 'False').lower() in ('true', '1', 't')
+
+# --- STUDENT ONBOARDING ---
+# 'PASSWORD' emails new students a temporary password (hashed in a process pool
+# during imports). 'LINK' creates them with an unusable password and emails a
+# signed set-password link instead, so no hashing happens at import time.
+STUDENT_ONBOARDING_MODE = os.getenv('STUDENT_ONBOARDING_MODE', 'PASSWORD').upper()
+FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:5173')
+PASSWORD_RESET_TIMEOUT = int(os.getenv('SET_PASSWORD_LINK_TIMEOUT', 60 * 60 * 24 * 3)) # Seconds a set-password link stays valid
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 0)) # 0 = one per CPU
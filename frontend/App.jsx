@@ -13,6 +13,7 @@ import AuthPage from './components/auth/AuthPage';
 import TrainerOnboardingForm from './components/auth/TrainerOnboardingForm';
 import EmployeeOnboardingForm from './components/auth/EmployeeOnboardingForm';
 import ChangePasswordForm from './components/auth/ChangePasswordForm';
+import SetPasswordLinkForm from './components/auth/SetPasswordLinkForm';
 import Spinner from './components/shared/Spinner'; // Assuming Spinner.jsx exists
 
 const AppRoutes = () => {
@@ -44,6 +45,8 @@ const AppRoutes = () => {
         {/* The links from the manager components */}
         <Route path="/onboarding" element={<TrainerOnboardingForm />} />
         <Route path="/employee-onboarding" element={<EmployeeOnboardingForm />} /> 
+        {/* Link from the onboarding email (STUDENT_ONBOARDING_MODE=LINK) */}
+        <Route path="/set-password" element={<SetPasswordLinkForm />} />
         {/* Redirect all other pages to login */}
         <Route path="*" element={<Navigate to="/login" replace />} />
       </Routes>
@@ -62,6 +65,7 @@ const AppRoutes = () => {
         */}
         <Route path="/onboarding" element={<TrainerOnboardingForm />} />
         <Route path="/employee-onboarding" element={<EmployeeOnboardingForm />} />
+        <Route path="/set-password" element={<SetPasswordLinkForm />} />
 
         {/* Main dashboard catch-all */}
         <Route 
@@ -0,0 +1,112 @@
+// frontend/components/auth/SetPasswordLinkForm.jsx
+
+import React, { useState } from 'react';
+import { Link, useNavigate, useSearchParams } from 'react-router-dom';
+import axios from 'axios'; // Using axios directly: the signed link is the credential, not a stored token
+import { PygenicArcTextLogo, LockIcon } from '../icons/Icons';
+import Spinner from '../shared/Spinner';
+
+// Landing page for the onboarding email sent in LINK mode:
+// /set-password?uid=<uid>&token=<token>
+const SetPasswordLinkForm = () => {
+  const [searchParams] = useSearchParams();
+  const uid = searchParams.get('uid') || '';
+  const token = searchParams.get('token') || '';
+  const [password, setPassword] = useState('');
+  const [confirmPassword, setConfirmPassword] = useState('');
+  const [error, setError] = useState(uid && token ? '' : 'This link is incomplete. Please open the link from your email again.');
+  const [success, setSuccess] = useState('');
+  const [loading, setLoading] = useState(false);
+  const navigate = useNavigate();
+
+  // Get base API URL from environment variable
+  const API_URL = import.meta.env.VITE_API_BASE_URL || 'http://127.0.0.1:8000/api';
+
+  const handleSubmit = async (e) => {
+    e.preventDefault();
+    if (password.length < 8) {
+        setError('Password must be at least 8 characters long.');
+        return;
+    }
+    if (password !== confirmPassword) {
+      setError('Passwords do not match.');
+      return;
+    }
+    setError('');
+    setLoading(true);
+    try {
+      await axios.post(`${API_URL.replace(/\/$/, '')}/auth/set-password/`, { uid, token, password });
+      setSuccess('Password set successfully! Redirecting to login...');
+      setTimeout(() => navigate('/login'), 2000);
+    } catch (err) {
+      setError(err?.response?.data?.error || 'Failed to set your password.');
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  return (
+    <div className="flex items-center justify-center min-h-screen w-full main-bg">
+      <div className="w-full max-w-md p-8 md:p-12 bg-white dark:bg-slate-900 rounded-2xl shadow-2xl border border-slate-800">
+          <div className="text-left mb-8">
+            <PygenicArcTextLogo className="h-10 w-auto text-violet-500" />
+            <h2 className="mt-6 text-3xl font-bold text-slate-900 dark:text-white">
+              Set Your Password
+            </h2>
+            <p className="text-slate-500 dark:text-slate-400 mt-2">
+              Choose a password for your new account. You will use it with your email address to log in.
+            </p>
+          </div>
+          <form className="space-y-6" onSubmit={handleSubmit}>
+            {error && <p className="text-sm text-center text-red-500 bg-red-100 dark:bg-red-900/30 p-3 rounded-md">{error}</p>}
+            {success && <p className="text-sm text-center text-green-600 bg-green-100 dark:bg-green-900/30 p-3 rounded-md">{success}</p>}
+
+            <div className="relative">
+              <div className="absolute inset-y-0 left-0 flex items-center pl-3 pointer-events-none">
+                <LockIcon className="w-5 h-5 text-slate-400" />
+              </div>
+              <input
+                id="password"
+                name="password"
+                type="password"
+                required
+                className="w-full py-3 pl-10 pr-4 text-slate-900 bg-slate-50 border border-slate-300 rounded-md placeholder:text-slate-400 focus:ring-2 focus:ring-inset focus:ring-violet-600 sm:text-sm dark:bg-slate-800 dark:border-slate-700 dark:text-white dark:placeholder-slate-400 focus:border-violet-500"
+                placeholder="New Password (min. 8 characters)"
+                value={password}
+                onChange={(e) => setPassword(e.target.value)}
+              />
+            </div>
+            <div className="relative">
+              <div className="absolute inset-y-0 left-0 flex items-center pl-3 pointer-events-none">
+                <LockIcon className="w-5 h-5 text-slate-400" />
+              </div>
+              <input
+                id="confirmPassword"
+                name="confirmPassword"
+                type="password"
+                required
+                className="w-full py-3 pl-10 pr-4 text-slate-900 bg-slate-50 border border-slate-300 rounded-md placeholder:text-slate-400 focus:ring-2 focus:ring-inset focus:ring-violet-600 sm:text-sm dark:bg-slate-800 dark:border-slate-700 dark:text-white dark:placeholder-slate-400 focus:border-violet-500"
+                placeholder="Confirm New Password"
+                value={confirmPassword}
+                onChange={(e) => setConfirmPassword(e.target.value)}
+              />
+            </div>
+            <div>
+              <button
+                type="submit"
+                disabled={loading || success || !uid || !token}
+                className="flex items-center justify-center w-full px-4 py-3 text-sm font-semibold text-white bg-violet-600 rounded-md shadow-sm hover:bg-violet-500 focus-visible:outline focus-visible:outline-2 focus-visible:outline-offset-2 focus-visible:outline-violet-600 disabled:bg-violet-400"
+              >
+                {loading ? <Spinner size="sm" color="text-white"/> : 'Set Password'}
+              </button>
+            </div>
+            <p className="text-sm text-center text-slate-500 dark:text-slate-400">
+              Already set up? <Link to="/login" className="font-semibold text-violet-600 hover:text-violet-500">Log in</Link>
+            </p>
+          </form>
+      </div>
+    </div>
+  );
+};
+
+export default SetPasswordLinkForm;
@@ -832,7 +832,8 @@ export const DataProvider = ({ children }) => {
     const addStudentsToBatch = async (batchId, studentIds) => {
         try {
             const response = await apiClient.post(`/batches/${batchId}/add_students/`, { student_ids: studentIds });
-            setBatches(prev => prev.map(b => b.id === batchId ? response.data : b));
+            // The endpoint returns counts, not the batch; only the size changes
+            setBatches(prev => prev.map(b => b.id === batchId ? { ...b, student_count: response.data.student_count } : b));
             const usersResponse = await apiClient.get('/users/'); // Refresh users
             setUsers(usersResponse.data);
         } catch (error) {
@@ -843,7 +844,8 @@ export const DataProvider = ({ children }) => {
     const removeStudentsFromBatch = async (batchId, studentIds) => {
         try {
             const response = await apiClient.post(`/batches/${batchId}/remove_students/`, { student_ids: studentIds });
-            setBatches(prev => prev.map(b => b.id === batchId ? response.data : b));
+            // The endpoint returns counts, not the batch; only the size changes
+            setBatches(prev => prev.map(b => b.id === batchId ? { ...b, student_count: response.data.student_count } : b));
             const usersResponse = await apiClient.get('/users/'); // Refresh users
             setUsers(usersResponse.data);
         } catch (error) {
@@ -854,7 +856,7 @@ export const DataProvider = ({ children }) => {
     const assignMaterialsToBatch = async (batchId, materialIds) => {
         try {
             await apiClient.post(`/batches/${batchId}/assign_materials/`, { material_ids: materialIds });
-            // No direct state update needed here, assignment happens on backend users
+            // No direct state update needed here, the assignment is stored on the batch
             alert('Materials assigned successfully to all students in the batch!');
         } catch (error) {
             console.error("Failed to assign materials to batch:", error);